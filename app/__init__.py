@@ -1,9 +1,18 @@
 from flask import Flask
 
+from app.cli import register_cli
 from app.config import Config
-from app.extensions import db, login_manager, migrate
+from app.extensions import db, init_migrate, login_manager
 from app.models import User
 from app.routes import register_routes
+from app.services.assets import init_assets
+from app.services.ballot_wal import init_ballot_wal
+from app.services.db_pool import init_db_pool
+from app.services.http_cache import init_http_cache
+from app.services.mail import init_mail
+from app.services.metrics import init_metrics
+from app.services.query_stats import init_query_stats
+from app.services.template_cache import init_template_cache
 
 
 def create_app(config_override=None):
@@ -17,7 +26,8 @@ def create_app(config_override=None):
         app.config.update(config_override)
 
     db.init_app(app)
-    migrate.init_app(app, db)
+    if app.config["MIGRATIONS_ENABLED"]:
+        init_migrate(app)
     login_manager.init_app(app)
     login_manager.login_view = "login"
 
@@ -25,10 +35,17 @@ def create_app(config_override=None):
     def load_user(user_id):
         return User.query.get(int(user_id))
 
+    init_db_pool(app)
+    init_query_stats(app)
+    init_metrics(app)
+    init_ballot_wal(app)
+    init_mail(app)
+    init_http_cache(app)
     register_routes(app)
+    init_assets(app)
+    init_template_cache(app)
+    register_cli(app)
     return app
 
 
-app = create_app()
-
-__all__ = ["app", "db", "migrate", "create_app"]
+__all__ = ["db", "create_app"]
@@ -0,0 +1,236 @@
+import contextlib
+import random
+import time
+
+import click
+from flask import current_app
+from flask.cli import AppGroup
+
+from app.extensions import db
+from app.models import Meeting, Motion
+from app.services.assets import build_assets
+from app.services.ballot_wal import replay_logs
+from app.services.mail import deliver_pending
+from app.services.profiling import TallyProfiler, profile_tally
+from app.services.template_cache import precompile_templates
+from app.services.voting.blt import read_blt, write_blt
+from app.services.voting.meek import DEFAULT_TOLERANCE, TRANSFER_MEEK, count_meek_stv
+from app.services.voting.preference import (
+    QUOTA_DROOP,
+    QUOTA_RULES,
+    TRANSFER_RULES,
+    TRANSFER_WIG,
+    count_stv,
+    format_tally,
+    parse_ballots_for_motion,
+)
+
+votora_cli = AppGroup("votora", help="Votora maintenance and audit commands.")
+
+
+def _echo_count(title, num_ballots, result, elapsed, show_log):
+    click.echo(f"== {title}")
+    click.echo(f"Valid ballots: {num_ballots}")
+    click.echo(f"Quota: {format_tally(result['quota'])}")
+    click.echo(f"Rounds: {len(result['rounds'])}")
+    winners = ", ".join(winner.text for winner in result["winners"]) or "(none)"
+    click.echo(f"Elected: {winners}")
+    if show_log:
+        for line in result["round_logs"]:
+            click.echo(f"  {line}")
+    click.echo(f"Counted in {elapsed:.3f}s")
+
+
+def _preference_motions(meeting_id, motion_id):
+    if motion_id is not None:
+        motion = db.session.get(Motion, motion_id)
+        if motion is None:
+            raise click.ClickException(f"Motion {motion_id} not found.")
+        if motion.type != "PREFERENCE":
+            raise click.ClickException(f"Motion {motion_id} is not a PREFERENCE motion.")
+        return [motion]
+
+    meeting = db.session.get(Meeting, meeting_id)
+    if meeting is None:
+        raise click.ClickException(f"Meeting {meeting_id} not found.")
+    return [motion for motion in meeting.motions if motion.type == "PREFERENCE"]
+
+
+@votora_cli.command("recount")
+@click.option("--meeting", "meeting_id", type=int, help="Recount every preference motion in a meeting.")
+@click.option("--motion", "motion_id", type=int, help="Recount a single preference motion.")
+@click.option(
+    "--ballot-file",
+    type=click.File("r"),
+    help="Recount an exported BLT ballot file instead of the database.",
+)
+@click.option("--seats", type=int, help="Override the number of seats to fill.")
+@click.option("--quota", "quota_rule", type=click.Choice(QUOTA_RULES), default=QUOTA_DROOP, show_default=True)
+@click.option(
+    "--transfer",
+    "transfer_rule",
+    type=click.Choice((*TRANSFER_RULES, TRANSFER_MEEK)),
+    default=TRANSFER_WIG,
+    show_default=True,
+    help="Surplus transfer rule: weighted inclusive Gregory, last-parcel Gregory or Meek.",
+)
+@click.option(
+    "--tolerance",
+    type=float,
+    default=DEFAULT_TOLERANCE,
+    show_default=True,
+    help="Meek keep-value convergence tolerance, in votes.",
+)
+@click.option(
+    "--bulk-exclusion",
+    is_flag=True,
+    help="Eliminate all mathematically hopeless candidates in one round.",
+)
+@click.option(
+    "--seed",
+    help="Seed for ties resolved by lot. Defaults to the motion's stored tie-break seed.",
+)
+@click.option("--show-log", is_flag=True, help="Print the full count log.")
+@click.option(
+    "--profile",
+    "profile_output",
+    type=click.File("w"),
+    help="Write per-phase timings as collapsed stacks for flamegraph tools.",
+)
+def recount(
+    meeting_id,
+    motion_id,
+    ballot_file,
+    seats,
+    quota_rule,
+    transfer_rule,
+    tolerance,
+    bulk_exclusion,
+    seed,
+    show_log,
+    profile_output,
+):
+    sources = [value for value in (meeting_id, motion_id, ballot_file) if value is not None]
+    if len(sources) != 1:
+        raise click.UsageError("Pass exactly one of --meeting, --motion or --ballot-file.")
+
+    counts = []
+    if ballot_file is not None:
+        try:
+            data = read_blt(ballot_file)
+        except ValueError as exc:
+            raise click.ClickException(str(exc))
+        counts.append(
+            (
+                data["title"] or ballot_file.name,
+                data["ballots"],
+                data["num_seats"],
+                data["options_by_id"],
+                seed,
+            )
+        )
+    else:
+        for motion in _preference_motions(meeting_id, motion_id):
+            valid_ballots, _informal_ballots = parse_ballots_for_motion(motion)
+            counts.append(
+                (
+                    motion.title,
+                    [ballot["preferences"] for ballot in valid_ballots],
+                    motion.num_winners or 1,
+                    {option.id: option for option in motion.options},
+                    seed if seed is not None else motion.tally_seed,
+                )
+            )
+
+    if not counts:
+        click.echo("No preference motions to recount.")
+        return
+
+    profiler = TallyProfiler() if profile_output else None
+    for title, ballots, num_seats, options_by_id, count_seed in counts:
+        started = time.perf_counter()
+        with profile_tally(profiler) if profiler else contextlib.nullcontext():
+            if transfer_rule == TRANSFER_MEEK:
+                result = count_meek_stv(
+                    ballots,
+                    seats or num_seats,
+                    options_by_id,
+                    rng=random.Random(count_seed),
+                    quota_rule=quota_rule,
+                    tolerance=tolerance,
+                    bulk_exclusion=bulk_exclusion,
+                )
+            else:
+                result = count_stv(
+                    ballots,
+                    seats or num_seats,
+                    options_by_id,
+                    rng=random.Random(count_seed),
+                    quota_rule=quota_rule,
+                    transfer_rule=transfer_rule,
+                    bulk_exclusion=bulk_exclusion,
+                )
+        _echo_count(title, len(ballots), result, time.perf_counter() - started, show_log)
+        if result["lot_draws"]:
+            click.echo(f"Ties resolved by lot: {len(result['lot_draws'])} (seed {count_seed})")
+
+    if profiler:
+        profile_output.write(profiler.to_folded())
+        click.echo(f"Profile written to {profile_output.name}")
+
+
+@votora_cli.command("export-ballots")
+@click.argument("motion_id", type=int)
+@click.argument("output", type=click.File("w"))
+def export_ballots(motion_id, output):
+    motion = db.session.get(Motion, motion_id)
+    if motion is None or motion.type != "PREFERENCE":
+        raise click.ClickException(f"Preference motion {motion_id} not found.")
+    num_ballots = write_blt(motion, output)
+    click.echo(f"Exported {num_ballots} ballots for '{motion.title}'.")
+    if motion.tally_seed:
+        click.echo(f"Tie-break seed: {motion.tally_seed}")
+
+
+@votora_cli.command("send-mail")
+@click.option("--loop", is_flag=True, help="Keep polling the outbox instead of exiting after one pass.")
+@click.option("--interval", type=float, default=5.0, show_default=True, help="Seconds between passes with --loop.")
+@click.option("--limit", type=int, default=50, show_default=True, help="Emails to attempt per pass.")
+def send_mail(loop, interval, limit):
+    while True:
+        sent, failed = deliver_pending(limit=limit)
+        if sent or failed or not loop:
+            click.echo(f"Sent {sent} emails, {failed} failed permanently.")
+        if not loop:
+            return
+        db.session.remove()
+        time.sleep(interval)
+
+
+@votora_cli.command("replay-ballots")
+@click.option("--dir", "directory", help="Ballot log directory (default: BALLOT_WAL_DIR).")
+def replay_ballots(directory):
+    directory = directory or current_app.config["BALLOT_WAL_DIR"]
+    slots, applied, rejected = replay_logs(directory)
+    click.echo(f"Replayed {slots} ballot logs: {applied} ballots applied, {rejected} rejected.")
+
+
+@votora_cli.command("build-assets")
+@click.option("--no-minify", is_flag=True, help="Copy CSS and JS without minifying them.")
+def build_assets_command(no_minify):
+    manifest = build_assets(current_app.static_folder, minify=not no_minify)
+    click.echo(
+        f"Built {len(manifest['assets'])} assets "
+        f"({len(manifest['encoded'])} precompressed) under static/dist."
+    )
+
+
+@votora_cli.command("compile-templates")
+def compile_templates_command():
+    names = precompile_templates(current_app)
+    directory = current_app.config["TEMPLATE_CACHE_DIR"] or "(bytecode cache disabled)"
+    click.echo(f"Compiled {len(names)} templates into {directory}.")
+
+
+def register_cli(app):
+    app.cli.add_command(votora_cli)
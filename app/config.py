@@ -8,6 +8,47 @@ except Exception:
     pass
 
 
+def _env_int(name, default):
+    value = os.getenv(name)
+    if value is None or not value.strip():
+        return default
+    return int(value)
+
+
+def _env_bool(name, default):
+    value = os.getenv(name)
+    if value is None or not value.strip():
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+
+def build_engine_options(database_url):
+    options = {"pool_pre_ping": Config.DB_POOL_PRE_PING}
+    if database_url.startswith("sqlite"):
+        return options
+
+    options["connect_args"] = {
+        "ssl": {"ca": os.getenv("MYSQL_SSL_CA", "")}
+        if os.getenv("MYSQL_SSL_CA")
+        else {}
+    }
+
+    # Each gunicorn worker holds its own pool, so one connection per request
+    # thread plus a little overflow; workers * (size + overflow) must stay
+    # under MySQL's max_connections.
+    options.update(
+        {
+            "pool_size": Config.DB_POOL_SIZE,
+            "max_overflow": Config.DB_MAX_OVERFLOW,
+            "pool_timeout": Config.DB_POOL_TIMEOUT,
+            # Recycle before MySQL's wait_timeout closes idle connections.
+            "pool_recycle": Config.DB_POOL_RECYCLE,
+            "pool_use_lifo": True,
+        }
+    )
+    return options
+
+
 class Config:
     SQLALCHEMY_TRACK_MODIFICATIONS = False
     _database_url = os.getenv(
@@ -20,12 +61,85 @@ class Config:
     SECRET_KEY = os.getenv("SECRET_KEY", "dev-only-change-me")
 
     RESEND_API_KEY = os.getenv("RESEND_API_KEY", "")
+    MAIL_TRANSPORT = os.getenv("MAIL_TRANSPORT", "")
+    MAIL_FROM = os.getenv("MAIL_FROM", "Votora <noreply@votora.me>")
+    MAIL_FILE_DIR = os.getenv("MAIL_FILE_DIR", "")
+    MAIL_BACKGROUND_SENDER = _env_bool("MAIL_BACKGROUND_SENDER", True)
+    MAIL_MAX_ATTEMPTS = _env_int("MAIL_MAX_ATTEMPTS", 5)
+    MAIL_RETRY_SECONDS = _env_int("MAIL_RETRY_SECONDS", 30)
+    MAIL_LEASE_SECONDS = _env_int("MAIL_LEASE_SECONDS", 120)
+    MAIL_POLL_SECONDS = _env_int("MAIL_POLL_SECONDS", 15)
+    MIGRATIONS_ENABLED = _env_bool("MIGRATIONS_ENABLED", True)
 
-    SQLALCHEMY_ENGINE_OPTIONS = {
-        "pool_pre_ping": True,
-        "connect_args": {
-            "ssl": {"ca": os.getenv("MYSQL_SSL_CA", "")}
-            if os.getenv("MYSQL_SSL_CA")
-            else {}
-        }
-    }
+    # Each worker caches voter code lookups. Renamed or deleted voters reach
+    # other workers after the TTL; meeting and motion edits bump the version
+    # in the metadata cache below.
+    VOTER_CACHE_ENABLED = _env_bool("VOTER_CACHE_ENABLED", True)
+    VOTER_CACHE_SIZE = _env_int("VOTER_CACHE_SIZE", 4096)
+    VOTER_CACHE_TTL = _env_int("VOTER_CACHE_TTL", 30)
+    # Motion metadata is versioned per meeting. Set METADATA_CACHE_PATH to a
+    # SQLite file on local disk to share versions and entries between
+    # workers; without it each worker relies on the TTL.
+    METADATA_CACHE_ENABLED = _env_bool("METADATA_CACHE_ENABLED", True)
+    METADATA_CACHE_TTL = _env_int("METADATA_CACHE_TTL", 300)
+    METADATA_CACHE_STATUS_TTL = _env_int("METADATA_CACHE_STATUS_TTL", 2)
+    METADATA_CACHE_PATH = os.getenv("METADATA_CACHE_PATH", "")
+
+    # Write-behind ballot ingest: ballots are acknowledged once appended to a
+    # local log and flushed to the vote tables in batches.
+    BALLOT_WAL_ENABLED = _env_bool("BALLOT_WAL_ENABLED", False)
+    BALLOT_WAL_DIR = os.getenv("BALLOT_WAL_DIR", "instance/ballot-wal")
+    BALLOT_WAL_BATCH_SIZE = _env_int("BALLOT_WAL_BATCH_SIZE", 200)
+    BALLOT_WAL_FLUSH_MS = _env_int("BALLOT_WAL_FLUSH_MS", 20)
+    BALLOT_WAL_SEGMENT_BYTES = _env_int("BALLOT_WAL_SEGMENT_BYTES", 16 * 1024 * 1024)
+    BALLOT_WAL_DRAIN_SECONDS = _env_int("BALLOT_WAL_DRAIN_SECONDS", 10)
+
+    # `flask --app app votora build-assets` writes hashed, minified and
+    # precompressed copies of static/ under static/dist. When that build is
+    # present, url_for("static") points at the copies and they are served
+    # with a long-lived immutable Cache-Control.
+    ASSET_MANIFEST_ENABLED = _env_bool("ASSET_MANIFEST_ENABLED", True)
+    ASSET_MAX_AGE = _env_int("ASSET_MAX_AGE", 365 * 24 * 60 * 60)
+
+    # HTML, JSON and text responses above COMPRESSION_MIN_BYTES are gzipped
+    # for clients that accept it. Anonymous public pages (home, voting
+    # systems, robots.txt, sitemap.xml) are rendered once per worker and
+    # served with an ETag and a public max-age.
+    COMPRESSION_ENABLED = _env_bool("COMPRESSION_ENABLED", True)
+    COMPRESSION_MIN_BYTES = _env_int("COMPRESSION_MIN_BYTES", 1024)
+    COMPRESSION_LEVEL = _env_int("COMPRESSION_LEVEL", 5)
+    PUBLIC_PAGE_CACHE_ENABLED = _env_bool("PUBLIC_PAGE_CACHE_ENABLED", True)
+    PUBLIC_PAGE_MAX_AGE = _env_int("PUBLIC_PAGE_MAX_AGE", 300)
+
+    # Compiled templates are cached as bytecode on local disk, which
+    # `votora compile-templates` fills at deploy. With TEMPLATE_PRECOMPILE,
+    # gunicorn also loads every template before serving (in the master when
+    # preloading, so forked workers inherit them).
+    TEMPLATE_CACHE_DIR = os.getenv("TEMPLATE_CACHE_DIR", "instance/jinja-cache")
+    TEMPLATE_PRECOMPILE = _env_bool("TEMPLATE_PRECOMPILE", True)
+
+    # /metrics needs a bearer METRICS_TOKEN; without one it answers 404
+    # unless METRICS_PUBLIC opts in (say, behind a private network).
+    METRICS_ENABLED = _env_bool("METRICS_ENABLED", True)
+    METRICS_TOKEN = os.getenv("METRICS_TOKEN", "")
+    METRICS_PUBLIC = _env_bool("METRICS_PUBLIC", False)
+    # Each gunicorn worker counts in its own memory. With METRICS_DIR set,
+    # workers write snapshots there every METRICS_FLUSH_SECONDS and a scrape
+    # of any worker sums them all.
+    METRICS_DIR = os.getenv("METRICS_DIR", "")
+    METRICS_FLUSH_SECONDS = _env_int("METRICS_FLUSH_SECONDS", 5)
+    # Per-endpoint query counts are process-wide, so only these usernames
+    # (comma separated) may view or reset them under /admin/metrics.
+    QUERY_METRICS_ADMINS = [
+        name.strip() for name in os.getenv("QUERY_METRICS_ADMINS", "").split(",") if name.strip()
+    ]
+
+    WEB_THREADS = _env_int("GUNICORN_THREADS", 4)
+    DB_POOL_SIZE = _env_int("DB_POOL_SIZE", WEB_THREADS)
+    DB_MAX_OVERFLOW = _env_int("DB_MAX_OVERFLOW", 2)
+    DB_POOL_TIMEOUT = _env_int("DB_POOL_TIMEOUT", 10)
+    DB_POOL_RECYCLE = _env_int("DB_POOL_RECYCLE", 280)
+    DB_POOL_PRE_PING = _env_bool("DB_POOL_PRE_PING", True)
+
+
+Config.SQLALCHEMY_ENGINE_OPTIONS = build_engine_options(Config.SQLALCHEMY_DATABASE_URI)
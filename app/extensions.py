@@ -1,7 +1,13 @@
-from flask_migrate import Migrate
 from flask_login import LoginManager
 from flask_sqlalchemy import SQLAlchemy
 
 db = SQLAlchemy()
 login_manager = LoginManager()
-migrate = Migrate()
+
+
+def init_migrate(app):
+    # Flask-Migrate imports all of Alembic; web workers never run migrations,
+    # so only apps that serve the `flask db` commands pay for it.
+    from flask_migrate import Migrate
+
+    Migrate(app, db)
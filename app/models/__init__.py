@@ -1,8 +1,10 @@
+from app.models.ballot_receipt import BallotReceipt
 from app.models.candidate_vote import CandidateVote
 from app.models.cumulative_vote import CumulativeVote
 from app.models.meeting import Meeting
 from app.models.motion import Motion
 from app.models.option import Option
+from app.models.outbound_email import OutboundEmail
 from app.models.preference_vote import PreferenceVote
 from app.models.user import User
 from app.models.voter import Voter
@@ -20,4 +22,6 @@ __all__ = [
     "CumulativeVote",
     "PreferenceVote",
     "ScoreVote",
+    "OutboundEmail",
+    "BallotReceipt",
 ]
@@ -0,0 +1,18 @@
+from app.extensions import db
+from app.models.base import utcnow
+
+
+class BallotReceipt(db.Model):
+    __tablename__ = "ballot_receipts"
+    __table_args__ = (
+        db.UniqueConstraint(
+            "voter_id", "motion_id", name="uq_ballot_receipts_voter_id_motion_id"
+        ),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    voter_id = db.Column(db.Integer, db.ForeignKey("voters.id"), nullable=False)
+    motion_id = db.Column(db.Integer, db.ForeignKey("motions.id"), nullable=False)
+    token = db.Column(db.String(64), nullable=False)
+    version = db.Column(db.Integer, nullable=False, default=1)
+    updated_at = db.Column(db.DateTime, nullable=False, default=utcnow)
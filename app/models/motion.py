@@ -12,6 +12,8 @@ class Motion(db.Model):
     approved_threshold_pct = db.Column(db.Float, nullable=True)
     score_max = db.Column(db.Integer, nullable=True)
     budget_points = db.Column(db.Integer, nullable=True)
+    preference_method = db.Column(db.String(20), nullable=True)
+    tally_seed = db.Column(db.String(32), nullable=True)
     status = db.Column(db.String(20), nullable=False, default="DRAFT")
 
     options = db.relationship("Option", backref="motion", lazy=True)
@@ -1,9 +1,13 @@
 from app.routes.admin import register_admin_routes
 from app.routes.auth import register_auth_routes
+from app.routes.metrics import register_metrics_routes
 from app.routes.public import register_public_routes
+from app.routes.voter_api import register_voter_api_routes
 
 
 def register_routes(app):
     register_auth_routes(app)
     register_public_routes(app)
+    register_voter_api_routes(app)
     register_admin_routes(app)
+    register_metrics_routes(app)
@@ -1,4 +1,5 @@
 from app.routes.admin_meetings import register_admin_meeting_routes
+from app.routes.admin_metrics import register_admin_metric_routes
 from app.routes.admin_motions import register_admin_motion_routes
 from app.routes.admin_results import register_admin_result_routes
 from app.routes.admin_voters import register_admin_voter_routes
@@ -9,3 +10,4 @@ def register_admin_routes(app):
     register_admin_motion_routes(app)
     register_admin_voter_routes(app)
     register_admin_result_routes(app)
+    register_admin_metric_routes(app)
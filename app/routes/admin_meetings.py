@@ -5,6 +5,7 @@ from flask_login import current_user, login_required
 
 from app.extensions import db
 from app.models import (
+    BallotReceipt,
     CandidateVote,
     CumulativeVote,
     Meeting,
@@ -16,6 +17,7 @@ from app.models import (
     YesNoVote,
 )
 from app.routes.admin_common import ensure_meeting_owner, validate_meeting_schedule
+from app.services.metadata_cache import invalidate_meeting
 from app.services.security import generate_join_token
 
 
@@ -174,6 +176,9 @@ def register_admin_meeting_routes(app):
             ScoreVote.query.filter(ScoreVote.motion_id.in_(motion_ids)).delete(
                 synchronize_session=False
             )
+            BallotReceipt.query.filter(BallotReceipt.motion_id.in_(motion_ids)).delete(
+                synchronize_session=False
+            )
             Option.query.filter(Option.motion_id.in_(motion_ids)).delete(
                 synchronize_session=False
             )
@@ -197,10 +202,14 @@ def register_admin_meeting_routes(app):
             ScoreVote.query.filter(ScoreVote.voter_id.in_(voter_ids)).delete(
                 synchronize_session=False
             )
+            BallotReceipt.query.filter(BallotReceipt.voter_id.in_(voter_ids)).delete(
+                synchronize_session=False
+            )
             Voter.query.filter(Voter.id.in_(voter_ids)).delete(synchronize_session=False)
 
         db.session.delete(meeting)
         db.session.commit()
+        invalidate_meeting(meeting_id)
 
         if request.headers.get("X-Requested-With") == "XMLHttpRequest":
             return {"ok": True}
@@ -245,6 +254,7 @@ def register_admin_meeting_routes(app):
         meeting.end_time = end_time
 
         db.session.commit()
+        invalidate_meeting(meeting.id)
         flash("Meeting updated successfully.", "success")
         if request.headers.get("X-Requested-With") == "XMLHttpRequest":
             return jsonify(
@@ -0,0 +1,51 @@
+from flask import abort, current_app, flash, redirect, render_template, url_for
+from flask_login import current_user, login_required
+
+from app.extensions import db
+from app.services.db_pool import pool_statistics
+from app.services.query_stats import (
+    DB_TIME_BUCKETS_MS,
+    STATEMENT_BUCKETS,
+    get_query_stats_registry,
+)
+
+
+def _bucket_labels(buckets, unit=""):
+    labels = [f"≤{upper}{unit}" for upper in buckets]
+    labels.append(f">{buckets[-1]}{unit}")
+    return labels
+
+
+def _require_metrics_admin():
+    if current_user.username not in current_app.config.get("QUERY_METRICS_ADMINS", ()):
+        abort(403)
+
+
+def register_admin_metric_routes(app):
+    @app.route("/admin/metrics/queries")
+    @login_required
+    def query_metrics():
+        _require_metrics_admin()
+        registry = get_query_stats_registry()
+        if registry is None:
+            abort(404)
+
+        return render_template(
+            "admin/query_metrics.html",
+            rows=registry.snapshot(),
+            pool=pool_statistics(db.engine),
+            statement_labels=_bucket_labels(STATEMENT_BUCKETS),
+            db_time_labels=_bucket_labels(DB_TIME_BUCKETS_MS, " ms"),
+        )
+
+    @app.route("/admin/metrics/queries/reset", methods=["POST"])
+    @login_required
+    def reset_query_metrics():
+        _require_metrics_admin()
+        registry = get_query_stats_registry()
+        if registry is None:
+            abort(404)
+
+        registry.reset()
+        flash("Query metrics cleared.", "success")
+        return redirect(url_for("query_metrics"))
@@ -3,6 +3,7 @@ from flask_login import login_required
 
 from app.extensions import db
 from app.models import (
+    BallotReceipt,
     CandidateVote,
     CumulativeVote,
     Meeting,
@@ -13,6 +14,9 @@ from app.models import (
     YesNoVote,
 )
 from app.routes.admin_common import ensure_meeting_owner
+from app.services.metadata_cache import invalidate_meeting
+from app.services.security import generate_tally_seed
+from app.services.voting.condorcet import METHOD_STV, PREFERENCE_METHODS
 
 
 def register_admin_motion_routes(app):
@@ -46,12 +50,16 @@ def register_admin_motion_routes(app):
                 return redirect(url_for("meeting_detail", meeting_id=meeting.id))
 
             num_winners = None
+            preference_method = None
             if motion_type == "PREFERENCE":
                 try:
                     parsed = int(num_winners_raw) if num_winners_raw else 1
                     num_winners = parsed if parsed >= 1 else 1
                 except ValueError:
                     num_winners = 1
+                preference_method = (request.form.get("preference_method") or "").upper()
+                if preference_method not in PREFERENCE_METHODS:
+                    preference_method = METHOD_STV
 
             approved_threshold_pct = None
             if motion_type == "YES_NO":
@@ -92,6 +100,8 @@ def register_admin_motion_routes(app):
                 approved_threshold_pct=approved_threshold_pct,
                 score_max=score_max,
                 budget_points=budget_points,
+                preference_method=preference_method,
+                tally_seed=generate_tally_seed(),
             )
             db.session.add(motion)
             db.session.flush()
@@ -105,6 +115,7 @@ def register_admin_motion_routes(app):
                     db.session.add(Option(motion_id=motion.id, text=name))
 
             db.session.commit()
+            invalidate_meeting(motion.meeting_id)
 
             if request.headers.get("X-Requested-With") == "XMLHttpRequest":
                 return {
@@ -117,6 +128,7 @@ def register_admin_motion_routes(app):
                         "approved_threshold_pct": motion.approved_threshold_pct,
                         "score_max": motion.score_max,
                         "budget_points": motion.budget_points,
+                        "preference_method": motion.preference_method,
                     },
                 }
 
@@ -138,6 +150,13 @@ def register_admin_motion_routes(app):
             if motion.type == "PREFERENCE"
             else None
         )
+        if motion.type == "PREFERENCE":
+            preference_method = (request.form.get("preference_method") or "").upper()
+            motion.preference_method = (
+                preference_method if preference_method in PREFERENCE_METHODS else METHOD_STV
+            )
+        else:
+            motion.preference_method = None
         threshold_raw = (request.form.get("approved_threshold_pct") or "").strip()
         if motion.type == "YES_NO":
             try:
@@ -209,6 +228,7 @@ def register_admin_motion_routes(app):
 
         try:
             db.session.commit()
+            invalidate_meeting(motion.meeting_id)
             flash("Motion updated successfully.", "success")
             return jsonify({"success": True}), 200
         except Exception:
@@ -237,9 +257,14 @@ def register_admin_motion_routes(app):
             ScoreVote.query.filter_by(motion_id=motion.id).delete(
                 synchronize_session=False
             )
+            BallotReceipt.query.filter_by(motion_id=motion.id).delete(
+                synchronize_session=False
+            )
             Option.query.filter_by(motion_id=motion.id).delete(synchronize_session=False)
+            meeting_id = motion.meeting_id
             db.session.delete(motion)
             db.session.commit()
+            invalidate_meeting(meeting_id)
             flash("Motion deleted successfully.", "success")
             return jsonify({"success": True}), 200
         except Exception:
@@ -256,7 +281,12 @@ def register_admin_motion_routes(app):
 
         if new_status in allowed_statuses:
             motion.status = new_status
+            if not motion.tally_seed:
+                # Rows added outside the app have no seed; fix one before the
+                # count so ties by lot replay identically on every view.
+                motion.tally_seed = generate_tally_seed()
             db.session.commit()
+            invalidate_meeting(motion.meeting_id)
             flash(f"Status updated to {new_status}", "success")
         else:
             flash("Invalid status selection.", "danger")
@@ -1,83 +1,127 @@
-from flask import render_template
+import time
+
+from flask import Response, render_template, request
 from flask_login import login_required
 
 from app.models import Meeting
 from app.routes.admin_common import ensure_meeting_owner
+from app.services.metrics import RESULTS_PAGE_SECONDS
+from app.services.profiling import profile_tally
 from app.services.voting import (
     tally_candidate_election,
     tally_cumulative_votes,
+    tally_preference_condorcet,
     tally_preference_stv,
     tally_score_votes,
     tally_yes_no_abstain,
 )
+from app.services.voting.condorcet import CONDORCET_METHODS
 
 
-def register_admin_result_routes(app):
-    @app.route("/admin/meetings/<int:meeting_id>/results")
-    @login_required
-    def meeting_results(meeting_id):
-        meeting = Meeting.query.get_or_404(meeting_id)
-        ensure_meeting_owner(meeting)
-        results = []
+def _tally_meeting(meeting):
+    results = []
+    for motion in meeting.motions:
+        if motion.type == "PREFERENCE" and motion.preference_method in CONDORCET_METHODS:
+            results.append(
+                {
+                    "motion": motion,
+                    "result_type": motion.type,
+                    "condorcet": tally_preference_condorcet(
+                        motion, method=motion.preference_method
+                    ),
+                }
+            )
+            continue
 
-        for motion in meeting.motions:
-            if motion.type == "PREFERENCE":
-                pref_result = tally_preference_stv(motion)
-                results.append(
-                    {
-                        "motion": motion,
-                        "result_type": motion.type,
-                        "pref": pref_result,
-                    }
-                )
-                continue
-
-            if motion.type == "FPTP":
-                candidate_result = tally_candidate_election(motion)
-                results.append(
-                    {
-                        "motion": motion,
-                        "result_type": motion.type,
-                        "fptp": candidate_result,
-                    }
-                )
-                continue
-
-            if motion.type == "SCORE":
-                score_result = tally_score_votes(motion)
-                results.append(
-                    {
-                        "motion": motion,
-                        "result_type": motion.type,
-                        "score": score_result,
-                    }
-                )
-                continue
-
-            if motion.type == "CUMULATIVE":
-                cumulative_result = tally_cumulative_votes(motion)
-                results.append(
-                    {
-                        "motion": motion,
-                        "result_type": motion.type,
-                        "cumulative": cumulative_result,
-                    }
-                )
-                continue
+        if motion.type == "PREFERENCE":
+            pref_result = tally_preference_stv(motion)
+            results.append(
+                {
+                    "motion": motion,
+                    "result_type": motion.type,
+                    "pref": pref_result,
+                }
+            )
+            continue
 
+        if motion.type == "FPTP":
+            candidate_result = tally_candidate_election(motion)
             results.append(
                 {
                     "motion": motion,
                     "result_type": motion.type,
-                    "yes_no": tally_yes_no_abstain(motion),
+                    "fptp": candidate_result,
                 }
             )
+            continue
 
-        return render_template(
+        if motion.type == "SCORE":
+            score_result = tally_score_votes(motion)
+            results.append(
+                {
+                    "motion": motion,
+                    "result_type": motion.type,
+                    "score": score_result,
+                }
+            )
+            continue
+
+        if motion.type == "CUMULATIVE":
+            cumulative_result = tally_cumulative_votes(motion)
+            results.append(
+                {
+                    "motion": motion,
+                    "result_type": motion.type,
+                    "cumulative": cumulative_result,
+                }
+            )
+            continue
+
+        results.append(
+            {
+                "motion": motion,
+                "result_type": motion.type,
+                "yes_no": tally_yes_no_abstain(motion),
+            }
+        )
+    return results
+
+
+def register_admin_result_routes(app):
+    @app.route("/admin/meetings/<int:meeting_id>/results")
+    @login_required
+    def meeting_results(meeting_id):
+        meeting = Meeting.query.get_or_404(meeting_id)
+        ensure_meeting_owner(meeting)
+        started = time.perf_counter()
+
+        profile_mode = request.args.get("profile")
+        profile = None
+        if profile_mode:
+            with profile_tally() as profiler:
+                results = _tally_meeting(meeting)
+            if profile_mode == "folded":
+                return Response(
+                    profiler.to_folded(),
+                    mimetype="text/plain",
+                    headers={
+                        "Content-Disposition": (
+                            f"attachment; filename=meeting-{meeting.id}-tally.folded"
+                        )
+                    },
+                )
+            profile = profiler.summary()
+        else:
+            results = _tally_meeting(meeting)
+
+        response = render_template(
             "admin/meeting_results.html",
             meeting=meeting,
             results=results,
+            profile=profile,
         )
+        RESULTS_PAGE_SECONDS.observe(time.perf_counter() - started)
+        return response
 
     @app.route("/admin/meetings/<int:meeting_id>/votes")
     @login_required
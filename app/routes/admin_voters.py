@@ -3,6 +3,7 @@ from flask_login import login_required
 
 from app.extensions import db
 from app.models import (
+    BallotReceipt,
     CandidateVote,
     CumulativeVote,
     Meeting,
@@ -13,6 +14,7 @@ from app.models import (
 )
 from app.routes.admin_common import ensure_meeting_owner
 from app.services.security import generate_voter_code
+from app.services.voter_cache import invalidate_voter
 
 
 def register_admin_voter_routes(app):
@@ -104,6 +106,7 @@ def register_admin_voter_routes(app):
             voter.student_id = new_student_id
             voter.name = new_name
             db.session.commit()
+            invalidate_voter(voter.code)
             flash("Voter updated successfully.", "success")
             return jsonify({"success": True}), 200
         except Exception:
@@ -130,8 +133,13 @@ def register_admin_voter_routes(app):
             CumulativeVote.query.filter_by(voter_id=voter.id).delete(
                 synchronize_session=False
             )
+            BallotReceipt.query.filter_by(voter_id=voter.id).delete(
+                synchronize_session=False
+            )
+            voter_code = voter.code
             db.session.delete(voter)
             db.session.commit()
+            invalidate_voter(voter_code)
             flash("Voter deleted successfully.", "success")
             return jsonify({"success": True}), 200
         except Exception:
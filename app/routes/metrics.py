@@ -0,0 +1,24 @@
+import hmac
+
+from flask import Response, abort, current_app, request
+
+from app.services.metrics import render_metrics
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def register_metrics_routes(app):
+    @app.route("/metrics")
+    def metrics():
+        if not current_app.config.get("METRICS_ENABLED", True):
+            abort(404)
+
+        token = current_app.config.get("METRICS_TOKEN")
+        if token:
+            supplied = request.headers.get("Authorization", "")
+            if not hmac.compare_digest(supplied, f"Bearer {token}"):
+                abort(401)
+        elif not current_app.config.get("METRICS_PUBLIC", False):
+            abort(404)
+
+        return Response(render_metrics(current_app), content_type=PROMETHEUS_CONTENT_TYPE)
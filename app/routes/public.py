@@ -1,17 +1,29 @@
-from flask import Response, flash, redirect, render_template, request, send_from_directory, session, url_for
+from flask import Response, abort, current_app, flash, redirect, render_template, request, send_from_directory, session, url_for
 
 from app.extensions import db
 from app.models import (
     CandidateVote,
     CumulativeVote,
     Meeting,
-    Motion,
     PreferenceVote,
     ScoreVote,
     Voter,
     YesNoVote,
 )
+from app.services.ballot_wal import ballot_writer, record_ballot, record_ballots
+from app.services.ballots import (
+    MotionNotOpen,
+    current_choices_for,
+    motion_form_fields,
+    new_ballot_token,
+    parse_ballot_form,
+    receipt_versions,
+)
+from app.services.http_cache import public_page
+from app.services.metadata_cache import get_motion_detail
+from app.services.metrics import JOIN_ATTEMPTS
 from app.services.security import generate_voter_code
+from app.services.voter_cache import current_motions, lookup_voter, voted_motion_ids
 
 PUBLIC_SITEMAP_ENDPOINTS = (
     "index",
@@ -32,7 +44,20 @@ def register_public_routes(app):
             mimetype="image/png",
         )
 
+    @app.route("/voter-sw.js")
+    def voter_service_worker():
+        # Served from the root so the worker may control the /vote/ pages.
+        response = send_from_directory(
+            app.static_folder,
+            "js/voter-sw.js",
+            mimetype="text/javascript",
+            max_age=0,
+        )
+        response.headers["Cache-Control"] = "no-cache"
+        return response
+
     @app.route("/robots.txt")
+    @public_page
     def robots_txt():
         sitemap_url = url_for("sitemap_xml", _external=True)
         lines = [
@@ -44,12 +69,15 @@ def register_public_routes(app):
             "Disallow: /check-username",
             "Disallow: /reset-password/",
             "Disallow: /update_motion_status/",
+            "Disallow: /metrics",
+            "Disallow: /api/",
             "",
             f"Sitemap: {sitemap_url}",
         ]
         return Response("\n".join(lines) + "\n", mimetype="text/plain")
 
     @app.route("/sitemap.xml")
+    @public_page
     def sitemap_xml():
         url_entries = []
         for endpoint in PUBLIC_SITEMAP_ENDPOINTS:
@@ -65,6 +93,7 @@ def register_public_routes(app):
         return Response(xml, mimetype="application/xml")
 
     @app.route("/")
+    @public_page
     def index():
         return render_template("index.html")
 
@@ -75,16 +104,20 @@ def register_public_routes(app):
             code = raw_code.strip().upper()
 
             if not code:
+                JOIN_ATTEMPTS.inc(route="code", outcome="empty")
                 flash("Please enter a private key.", "join_error")
                 return redirect(url_for("join_meeting"))
 
-            voter = Voter.query.filter_by(code=code).first()
-            if voter:
+            voter_session = lookup_voter(code)
+            if voter_session:
+                voter = voter_session.voter
+                JOIN_ATTEMPTS.inc(route="code", outcome="success")
                 session["voter_id"] = voter.id
                 session["voter_name"] = voter.name
                 session["voter_code"] = voter.code
                 return redirect(url_for("voter_dashboard", code=voter.code))
 
+            JOIN_ATTEMPTS.inc(route="code", outcome="invalid")
             flash("Invalid private key. Please try again.", "join_error")
             return redirect(url_for("join_meeting"))
 
@@ -123,12 +156,16 @@ def register_public_routes(app):
                     )
                     db.session.add(voter)
                     db.session.commit()
+                    JOIN_ATTEMPTS.inc(route="token", outcome="success")
 
                     session["voter_id"] = voter.id
                     session["voter_name"] = voter.name
                     session["voter_code"] = voter.code
                     return redirect(url_for("voter_dashboard", code=voter.code))
 
+        if form_error:
+            JOIN_ATTEMPTS.inc(route="token", outcome="rejected")
+
         return render_template(
             "voter/join_qr.html",
             meeting=meeting,
@@ -146,14 +183,15 @@ def register_public_routes(app):
         return redirect(url_for("join_meeting"))
 
     @app.route("/voting-systems")
+    @public_page
     def voting_systems():
         return render_template("voting_systems.html")
 
     @app.route("/vote/<code>")
     def voter_dashboard(code):
-        voter = Voter.query.filter_by(code=code).first()
+        voter_session = lookup_voter(code)
 
-        if not voter:
+        if not voter_session:
             return render_template(
                 "voter/motion_list.html",
                 invalid=True,
@@ -163,30 +201,101 @@ def register_public_routes(app):
                 voted_motion_ids=set(),
             )
 
-        meeting = voter.meeting
-        motions = meeting.motions
-        voted_motion_ids = {
-            *{vote.motion_id for vote in voter.yes_no_votes},
-            *{vote.motion_id for vote in voter.candidate_votes},
-            *{vote.motion_id for vote in voter.preference_votes},
-            *{vote.motion_id for vote in voter.score_votes},
-            *{vote.motion_id for vote in voter.cumulative_votes},
-        }
+        voter = voter_session.voter
+        voted_ids = voted_motion_ids(voter.id)
+        if current_app.config["BALLOT_WAL_ENABLED"]:
+            voted_ids |= ballot_writer().pending_motion_ids(voter.id)
 
         return render_template(
             "voter/motion_list.html",
             invalid=False,
             voter=voter,
+            meeting=voter_session.meeting,
+            motions=current_motions(voter_session),
+            voted_motion_ids=voted_ids,
+        )
+
+    @app.route("/vote/<code>/sheet", methods=["GET", "POST"])
+    def vote_sheet(code):
+        voter_session = lookup_voter(code)
+        if not voter_session:
+            return redirect(url_for("voter_dashboard", code=code))
+
+        voter = voter_session.voter
+        meeting = voter_session.meeting
+        motions = [motion for motion in current_motions(voter_session) if motion.status == "OPEN"]
+        values = {
+            motion_id: dict(choices)
+            for motion_id, choices in current_choices_for(voter.id, motions).items()
+        }
+        errors = {}
+
+        if request.method == "POST":
+            # Every motion is checked before anything is written, then the
+            # whole sheet is recorded in one transaction.
+            token = (request.form.get("ballot_token") or "")[:64]
+            open_ids = {motion.id for motion in motions}
+            closed = [
+                motion_id
+                for motion_id in request.form.getlist("motion_id", type=int)
+                if motion_id not in open_ids
+            ]
+            entries = []
+            for motion in motions:
+                fields = motion_form_fields(request.form, motion.id)
+                if not any(value.strip() for value in fields.values()):
+                    # Left blank: the voter's current ballot stays as it is.
+                    continue
+                choices, error = parse_ballot_form(motion, fields)
+                if choices:
+                    values[motion.id] = dict(choices)
+                if error:
+                    errors[motion.id] = error
+                elif choices is not None:
+                    seen = request.form.get(f"ballot_version_{motion.id}", type=int)
+                    entries.append((motion, choices, token, seen))
+
+            if not closed and not errors and entries:
+                try:
+                    record_ballots(voter.id, entries)
+                except MotionNotOpen as exc:
+                    closed = exc.motion_ids
+                else:
+                    flash(
+                        "Your vote has been recorded."
+                        if len(entries) == 1
+                        else f"Your votes on {len(entries)} motions have been recorded.",
+                        "success",
+                    )
+                    return redirect(url_for("voter_dashboard", code=voter.code))
+
+            if closed:
+                flash(
+                    "Voting closed on some motions while you were filling in the sheet. "
+                    "No votes were recorded; please review and submit again.",
+                    "danger",
+                )
+            elif errors:
+                flash("Please correct the highlighted motions. No votes were recorded.", "danger")
+            elif not entries:
+                flash("Choose an option for at least one motion.", "warning")
+
+        return render_template(
+            "voter/ballot_sheet.html",
+            voter=voter,
             meeting=meeting,
             motions=motions,
-            voted_motion_ids=voted_motion_ids,
+            values=values,
+            errors=errors,
+            ballot_token=new_ballot_token(),
+            ballot_versions=receipt_versions(voter.id, [motion.id for motion in motions]),
         )
 
     @app.route("/vote/<code>/motion/<int:motion_id>", methods=["GET", "POST"])
     def vote_motion(code, motion_id):
-        voter = Voter.query.filter_by(code=code).first()
+        voter_session = lookup_voter(code)
 
-        if not voter:
+        if not voter_session:
             return render_template(
                 "voter/vote_motion.html",
                 invalid=True,
@@ -198,204 +307,67 @@ def register_public_routes(app):
                 score_values=None,
             )
 
-        meeting = voter.meeting
-        motion = Motion.query.filter_by(id=motion_id, meeting_id=meeting.id).first_or_404()
+        voter = voter_session.voter
+        meeting = voter_session.meeting
+        motion = get_motion_detail(motion_id, meeting.id)
+        if motion is None:
+            abort(404)
+        if motion.status != "OPEN":
+            # Checked against the cached motion before any vote table is read
+            # or written, so DRAFT and CLOSED motions never change.
+            flash("This motion is not open for voting.", "danger")
+            return redirect(url_for("voter_dashboard", code=voter.code))
 
         simple_vote = None
         preference_ranks = {}
         score_values = {}
         cumulative_values = {}
         if motion.type == "PREFERENCE":
-            votes_for_motion = [
-                vote for vote in voter.preference_votes if vote.motion_id == motion.id
-            ]
-            for vote in votes_for_motion:
+            for vote in PreferenceVote.query.filter_by(voter_id=voter.id, motion_id=motion.id):
                 preference_ranks[vote.option_id] = vote.preference_rank
         elif motion.type == "FPTP":
-            simple_vote = next(
-                (vote for vote in voter.candidate_votes if vote.motion_id == motion.id),
-                None,
-            )
+            simple_vote = CandidateVote.query.filter_by(
+                voter_id=voter.id, motion_id=motion.id
+            ).first()
         elif motion.type == "SCORE":
-            votes_for_motion = [
-                vote for vote in voter.score_votes if vote.motion_id == motion.id
-            ]
-            for vote in votes_for_motion:
+            for vote in ScoreVote.query.filter_by(voter_id=voter.id, motion_id=motion.id):
                 score_values[vote.option_id] = vote.score
         elif motion.type == "CUMULATIVE":
-            votes_for_motion = [
-                vote for vote in voter.cumulative_votes if vote.motion_id == motion.id
-            ]
-            for vote in votes_for_motion:
+            for vote in CumulativeVote.query.filter_by(voter_id=voter.id, motion_id=motion.id):
                 cumulative_values[vote.option_id] = vote.points
         else:
-            simple_vote = next(
-                (vote for vote in voter.yes_no_votes if vote.motion_id == motion.id),
-                None,
-            )
+            simple_vote = YesNoVote.query.filter_by(
+                voter_id=voter.id, motion_id=motion.id
+            ).first()
 
         if request.method == "POST":
-            if motion.type == "PREFERENCE":
-                existing_pref_votes = PreferenceVote.query.filter_by(
-                    voter_id=voter.id, motion_id=motion.id
-                ).all()
-                for existing in existing_pref_votes:
-                    db.session.delete(existing)
-
-                ranks = []
-                for option in motion.options:
-                    value = request.form.get(f"opt_{option.id}_rank")
-                    if not value:
-                        continue
-                    try:
-                        rank = int(value)
-                    except ValueError:
-                        continue
-                    if rank <= 0:
-                        continue
-                    ranks.append((rank, option.id))
-
-                for rank, option_id in ranks:
-                    db.session.add(
-                        PreferenceVote(
-                            voter_id=voter.id,
-                            motion_id=motion.id,
-                            option_id=option_id,
-                            preference_rank=rank,
-                        )
-                    )
-            elif motion.type == "SCORE":
-                existing_score_votes = ScoreVote.query.filter_by(
-                    voter_id=voter.id, motion_id=motion.id
-                ).all()
-                for existing in existing_score_votes:
-                    db.session.delete(existing)
-
-                for option in motion.options:
-                    value = request.form.get(f"opt_{option.id}_score")
-                    if value is None or value == "":
-                        continue
-                    try:
-                        score_value = round(float(value), 1)
-                    except ValueError:
-                        continue
-                    if score_value < 0:
-                        continue
-                    if motion.score_max is not None and score_value > motion.score_max:
-                        score_value = float(motion.score_max)
-
-                    db.session.add(
-                        ScoreVote(
-                            voter_id=voter.id,
-                            motion_id=motion.id,
-                            option_id=option.id,
-                            score=score_value,
-                        )
-                    )
-            elif motion.type == "CUMULATIVE":
-                existing_votes = CumulativeVote.query.filter_by(
-                    voter_id=voter.id, motion_id=motion.id
-                ).all()
-                for existing in existing_votes:
-                    db.session.delete(existing)
-
-                budget = motion.budget_points
-                if budget is None:
-                    flash("Budget is not set for this motion.", "danger")
-                    return render_template(
-                        "voter/vote_motion.html",
-                        invalid=False,
-                        voter=voter,
-                        meeting=meeting,
-                        motion=motion,
-                        simple_vote=simple_vote,
-                        preference_ranks=preference_ranks,
-                        score_values=score_values,
-                        cumulative_values=cumulative_values,
-                    )
-
-                total_points = 0.0
-                cumulative_values = {}
-                for option in motion.options:
-                    raw_value = request.form.get(f"opt_{option.id}_points")
-                    if raw_value is None or raw_value == "":
-                        points_value = 0.0
-                    else:
-                        try:
-                            points_value = float(raw_value)
-                        except ValueError:
-                            points_value = 0.0
-                    if points_value < 0:
-                        flash("Points cannot be negative.", "danger")
-                        cumulative_values[option.id] = points_value
-                        return render_template(
-                            "voter/vote_motion.html",
-                            invalid=False,
-                            voter=voter,
-                            meeting=meeting,
-                            motion=motion,
-                            simple_vote=simple_vote,
-                            preference_ranks=preference_ranks,
-                            score_values=score_values,
-                            cumulative_values=cumulative_values,
-                        )
-
-                    total_points += points_value
-                    cumulative_values[option.id] = points_value
-
-                if abs(total_points - float(budget)) > 1e-6:
-                    flash(
-                        f"You must allocate exactly {budget} points.\nCurrent total: {total_points}.",
-                        "danger",
-                    )
-                    return render_template(
-                        "voter/vote_motion.html",
-                        invalid=False,
-                        voter=voter,
-                        meeting=meeting,
-                        motion=motion,
-                        simple_vote=simple_vote,
-                        preference_ranks=preference_ranks,
-                        score_values=score_values,
-                        cumulative_values=cumulative_values,
-                    )
-
-                for option in motion.options:
-                    points_value = cumulative_values.get(option.id, 0.0)
-                    db.session.add(
-                        CumulativeVote(
-                            voter_id=voter.id,
-                            motion_id=motion.id,
-                            option_id=option.id,
-                            points=points_value,
-                        )
-                    )
-            else:
-                selected_option_id = request.form.get("option")
-                if selected_option_id:
-                    try:
-                        option_id_int = int(selected_option_id)
-                    except ValueError:
-                        option_id_int = None
-
-                    if option_id_int is not None:
-                        vote_model = CandidateVote if motion.type == "FPTP" else YesNoVote
-                        if simple_vote is None:
-                            simple_vote = vote_model.query.filter_by(
-                                voter_id=voter.id, motion_id=motion.id
-                            ).first()
-                        if simple_vote:
-                            simple_vote.option_id = option_id_int
-                        else:
-                            db.session.add(
-                                vote_model(
-                                    voter_id=voter.id,
-                                    motion_id=motion.id,
-                                    option_id=option_id_int,
-                                )
-                            )
-
-            db.session.commit()
+            choices, error = parse_ballot_form(motion, request.form)
+            token = (request.form.get("ballot_token") or "")[:64]
+            if error:
+                if choices:
+                    cumulative_values = dict(choices)
+                flash(error, "danger")
+                return render_template(
+                    "voter/vote_motion.html",
+                    invalid=False,
+                    voter=voter,
+                    meeting=meeting,
+                    motion=motion,
+                    simple_vote=simple_vote,
+                    preference_ranks=preference_ranks,
+                    score_values=score_values,
+                    cumulative_values=cumulative_values,
+                    ballot_token=new_ballot_token(),
+                    ballot_version=receipt_versions(voter.id, [motion.id])[motion.id],
+                )
+
+            if choices is not None:
+                seen = request.form.get("ballot_version", type=int)
+                try:
+                    record_ballot(voter.id, motion, choices, token, seen)
+                except MotionNotOpen:
+                    flash("This motion is not open for voting.", "danger")
+                    return redirect(url_for("voter_dashboard", code=voter.code))
             flash("Your vote for this motion has been recorded.", "success")
             return redirect(url_for("voter_dashboard", code=voter.code))
 
@@ -409,4 +381,6 @@ def register_public_routes(app):
             preference_ranks=preference_ranks,
             score_values=score_values,
             cumulative_values=cumulative_values,
+            ballot_token=new_ballot_token(),
+            ballot_version=receipt_versions(voter.id, [motion.id])[motion.id],
         )
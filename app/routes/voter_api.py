@@ -0,0 +1,184 @@
+from flask import jsonify, request
+
+from app.services.ballot_wal import record_ballot, record_ballots
+from app.services.ballots import (
+    MotionNotOpen,
+    ballot_fields_from_json,
+    current_choices,
+    current_choices_for,
+    new_ballot_token,
+    parse_ballot_form,
+    receipt_versions,
+)
+from app.services.metadata_cache import get_motion_detail
+from app.services.voter_cache import current_motions, lookup_voter, voted_motion_ids
+
+
+MAX_BATCH_BALLOTS = 100
+
+
+def _error(message, status, **extra):
+    return jsonify({"ok": False, "error": message, **extra}), status
+
+
+def _motion_payload(motion):
+    return {
+        "id": motion.id,
+        "title": motion.title,
+        "type": motion.type,
+        "status": motion.status,
+        "num_winners": motion.num_winners,
+        "score_max": motion.score_max,
+        "budget_points": motion.budget_points,
+        "options": [[option.id, option.text] for option in motion.options],
+    }
+
+
+def _seen_version(payload):
+    version = payload.get("version")
+    return version if isinstance(version, int) and not isinstance(version, bool) else None
+
+
+def register_voter_api_routes(app):
+    @app.route("/api/vote/<code>/motions")
+    def voter_api_motions(code):
+        voter_session = lookup_voter(code)
+        if not voter_session:
+            return _error("Invalid voting link.", 404)
+
+        voted_ids = voted_motion_ids(voter_session.voter.id)
+        return jsonify(
+            {
+                "ok": True,
+                "meeting": voter_session.meeting.title,
+                "voter": voter_session.voter.name,
+                "motions": [
+                    {
+                        "id": motion.id,
+                        "title": motion.title,
+                        "type": motion.type,
+                        "status": motion.status,
+                        "voted": motion.id in voted_ids,
+                    }
+                    for motion in current_motions(voter_session)
+                ],
+            }
+        )
+
+    @app.route("/api/vote/<code>/motions/<int:motion_id>/ballot", methods=["GET", "PUT"])
+    def voter_api_ballot(code, motion_id):
+        voter_session = lookup_voter(code)
+        if not voter_session:
+            return _error("Invalid voting link.", 404)
+
+        voter = voter_session.voter
+        motion = get_motion_detail(motion_id, voter.meeting_id)
+        if motion is None:
+            return _error("Motion not found.", 404)
+        if motion.status != "OPEN":
+            return _error("This motion is not open for voting.", 409)
+
+        if request.method == "GET":
+            return jsonify(
+                {
+                    "ok": True,
+                    "motion": _motion_payload(motion),
+                    "choices": current_choices(voter.id, motion),
+                    "token": new_ballot_token(),
+                    "version": receipt_versions(voter.id, [motion.id])[motion.id],
+                }
+            )
+
+        payload = request.get_json(silent=True)
+        fields, error = ballot_fields_from_json(motion, payload)
+        if error is None:
+            choices, error = parse_ballot_form(motion, fields)
+        if error:
+            return _error(error, 400)
+
+        if choices is not None:
+            token = str(payload.get("token") or "")[:64]
+            try:
+                record_ballot(voter.id, motion, choices, token, _seen_version(payload))
+            except MotionNotOpen:
+                return _error("This motion is not open for voting.", 409)
+        return jsonify({"ok": True, "motion_id": motion.id, "recorded": choices is not None})
+
+    @app.route("/api/vote/<code>/ballots", methods=["GET", "POST"])
+    def voter_api_ballots(code):
+        voter_session = lookup_voter(code)
+        if not voter_session:
+            return _error("Invalid voting link.", 404)
+        voter = voter_session.voter
+
+        if request.method == "GET":
+            # Every OPEN ballot in one response, for clients that keep working
+            # through a dropped connection.
+            motions = [
+                motion for motion in current_motions(voter_session) if motion.status == "OPEN"
+            ]
+            choices = current_choices_for(voter.id, motions)
+            versions = receipt_versions(voter.id, [motion.id for motion in motions])
+            return jsonify(
+                {
+                    "ok": True,
+                    "meeting": voter_session.meeting.title,
+                    "voter": voter.name,
+                    "motions": [
+                        {
+                            **_motion_payload(motion),
+                            "choices": choices[motion.id],
+                            "version": versions[motion.id],
+                        }
+                        for motion in motions
+                    ],
+                }
+            )
+
+        payload = request.get_json(silent=True)
+        ballots = payload.get("ballots") if isinstance(payload, dict) else None
+        if not isinstance(ballots, list) or not all(isinstance(ballot, dict) for ballot in ballots):
+            return _error("ballots must be a list of objects.", 400)
+        if len(ballots) > MAX_BATCH_BALLOTS:
+            return _error(f"Send at most {MAX_BATCH_BALLOTS} ballots at once.", 400)
+
+        # Everything is validated before anything is written, so the batch is
+        # accepted or rejected as a whole.
+        entries = []
+        errors = []
+        for ballot in ballots:
+            motion_id = ballot.get("motion_id")
+            motion = (
+                get_motion_detail(motion_id, voter.meeting_id)
+                if isinstance(motion_id, int)
+                else None
+            )
+            if motion is None:
+                errors.append({"motion_id": motion_id, "error": "Motion not found."})
+                continue
+            if motion.status != "OPEN":
+                errors.append({"motion_id": motion_id, "error": "This motion is not open for voting."})
+                continue
+            fields, error = ballot_fields_from_json(motion, ballot)
+            if error is None:
+                choices, error = parse_ballot_form(motion, fields)
+            if error:
+                errors.append({"motion_id": motion_id, "error": error})
+            elif choices is not None:
+                token = str(ballot.get("token") or "")[:64]
+                entries.append((motion, choices, token, _seen_version(ballot)))
+
+        if errors:
+            return _error("Some ballots were not accepted.", 400, errors=errors)
+        if entries:
+            try:
+                record_ballots(voter.id, entries)
+            except MotionNotOpen as exc:
+                errors = [
+                    {"motion_id": motion_id, "error": "This motion is not open for voting."}
+                    for motion_id in sorted(exc.motion_ids)
+                ]
+                return _error("Some ballots were not accepted.", 400, errors=errors)
+        return jsonify(
+            {"ok": True, "recorded": [entry[0].id for entry in entries]}
+        )
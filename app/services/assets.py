@@ -0,0 +1,172 @@
+import gzip
+import hashlib
+import json
+import mimetypes
+import re
+import shutil
+from pathlib import Path
+
+from flask import request, send_from_directory
+
+DIST_DIR = "dist"
+MANIFEST_NAME = "manifest.json"
+# Files that must keep a stable URL, such as a service worker script.
+UNVERSIONED = {"js/voter-sw.js"}
+COMPRESSIBLE = {".css", ".js", ".json", ".svg", ".txt", ".map"}
+ENCODINGS = (("br", ".br"), ("gzip", ".gz"))
+
+
+def _optional(module_name):
+    # rjsmin, rcssmin and brotli are optional: without them assets are only
+    # lightly minified and served with gzip alone.
+    try:
+        return __import__(module_name)
+    except ImportError:
+        return None
+
+
+_CSS_COMMENT = re.compile(r"/\*.*?\*/", re.S)
+_CSS_SPACE = re.compile(r"\s+")
+_CSS_PUNCTUATION = re.compile(r"\s*([{};,>])\s*")
+
+
+def minify_css(source):
+    rcssmin = _optional("rcssmin")
+    if rcssmin is not None:
+        return rcssmin.cssmin(source)
+    source = _CSS_COMMENT.sub("", source)
+    source = _CSS_SPACE.sub(" ", source)
+    return _CSS_PUNCTUATION.sub(r"\1", source).replace(";}", "}").strip() + "\n"
+
+
+def minify_js(source):
+    rjsmin = _optional("rjsmin")
+    if rjsmin is not None:
+        return rjsmin.jsmin(source)
+    # Whitespace only: indentation, blank lines and whole-line comments go,
+    # but nothing inside a multi-line template literal is touched.
+    lines = []
+    in_template = False
+    for line in source.splitlines():
+        stripped = line if in_template else line.strip()
+        if in_template or (stripped and not stripped.startswith("//")):
+            lines.append(stripped)
+        if line.replace("\\`", "").count("`") % 2:
+            in_template = not in_template
+    return "\n".join(lines) + "\n"
+
+
+MINIFIERS = {".css": minify_css, ".js": minify_js}
+
+
+def _write_encoded(path, data):
+    encoded = []
+    brotli = _optional("brotli")
+    if brotli is not None:
+        compressed = brotli.compress(data, quality=11)
+        if len(compressed) < len(data):
+            path.with_name(path.name + ".br").write_bytes(compressed)
+            encoded.append("br")
+    compressed = gzip.compress(data, compresslevel=9, mtime=0)
+    if len(compressed) < len(data):
+        path.with_name(path.name + ".gz").write_bytes(compressed)
+        encoded.append("gzip")
+    return encoded
+
+
+def build_assets(static_folder, minify=True):
+    # Writes a content-hashed copy of every static file under static/dist,
+    # minified and precompressed where that helps, plus a manifest mapping
+    # each original name to its copy. Returns the manifest.
+    static_folder = Path(static_folder)
+    dist = static_folder / DIST_DIR
+    if dist.exists():
+        shutil.rmtree(dist)
+
+    assets = {}
+    encoded = {}
+    for source in sorted(static_folder.rglob("*")):
+        name = source.relative_to(static_folder).as_posix()
+        if not source.is_file() or name.startswith(DIST_DIR + "/") or name in UNVERSIONED:
+            continue
+
+        data = source.read_bytes()
+        minifier = MINIFIERS.get(source.suffix) if minify else None
+        if minifier is not None:
+            data = minifier(data.decode("utf-8")).encode("utf-8")
+
+        digest = hashlib.sha256(data).hexdigest()[:12]
+        target = dist / Path(name).with_name(f"{source.stem}.{digest}{source.suffix}")
+        target.parent.mkdir(parents=True, exist_ok=True)
+        target.write_bytes(data)
+
+        hashed_name = target.relative_to(static_folder).as_posix()
+        assets[name] = hashed_name
+        if source.suffix in COMPRESSIBLE:
+            encodings = _write_encoded(target, data)
+            if encodings:
+                encoded[hashed_name] = encodings
+
+    manifest = {"assets": assets, "encoded": encoded}
+    (dist / MANIFEST_NAME).write_text(json.dumps(manifest, indent=2, sort_keys=True) + "\n")
+    return manifest
+
+
+def load_manifest(static_folder):
+    path = Path(static_folder) / DIST_DIR / MANIFEST_NAME
+    try:
+        return json.loads(path.read_text())
+    except (OSError, ValueError):
+        return None
+
+
+def init_assets(app):
+    # Debug servers keep serving the files as edited; a stale build would
+    # otherwise shadow them.
+    if not app.config["ASSET_MANIFEST_ENABLED"] or app.debug:
+        return
+    manifest = load_manifest(app.static_folder)
+    if not manifest:
+        return
+
+    assets = manifest["assets"]
+    encoded = manifest.get("encoded", {})
+    hashed_names = set(assets.values())
+    max_age = app.config["ASSET_MAX_AGE"]
+    app.extensions["asset_manifest"] = manifest
+
+    @app.url_defaults
+    def fingerprint_static_urls(endpoint, values):
+        # Existing url_for("static", filename=...) calls pick up the hashed
+        # copy without changing any template.
+        if endpoint == "static":
+            hashed = assets.get(values.get("filename"))
+            if hashed is not None:
+                values["filename"] = hashed
+
+    serve_plain = app.view_functions["static"]
+
+    def static(filename):
+        if filename not in hashed_names:
+            return serve_plain(filename=filename)
+
+        response = None
+        for encoding, suffix in ENCODINGS:
+            if encoding in encoded.get(filename, ()) and request.accept_encodings[encoding]:
+                mimetype = mimetypes.guess_type(filename)[0] or "application/octet-stream"
+                response = send_from_directory(
+                    app.static_folder, filename + suffix, mimetype=mimetype, max_age=max_age
+                )
+                response.headers["Content-Encoding"] = encoding
+                break
+        if response is None:
+            response = send_from_directory(app.static_folder, filename, max_age=max_age)
+        if filename in encoded:
+            response.vary.add("Accept-Encoding")
+        # The name changes whenever the content does, so browsers never need
+        # to revalidate.
+        response.cache_control.public = True
+        response.cache_control.immutable = True
+        return response
+
+    app.view_functions["static"] = static
@@ -0,0 +1,418 @@
+import atexit
+import json
+import os
+import threading
+import time
+import zlib
+from collections import deque
+from pathlib import Path
+
+from flask import current_app
+from sqlalchemy.exc import DataError, IntegrityError
+
+from app.extensions import db
+from app.services.ballots import (
+    MotionNotOpen,
+    check_motions_open,
+    new_ballot_token,
+    write_ballots,
+)
+from app.services.metrics import BALLOT_SUBMISSIONS, VOTE_WRITE_SECONDS
+
+SEGMENT_SUFFIX = ".wal"
+
+
+def _encode(record):
+    payload = json.dumps(record, separators=(",", ":"))
+    return f"{zlib.crc32(payload.encode()):08x} {payload}\n".encode()
+
+
+def _decode(line):
+    try:
+        checksum, payload = line.decode().rstrip("\n").split(" ", 1)
+        if int(checksum, 16) != zlib.crc32(payload.encode()):
+            return None
+        return json.loads(payload)
+    except ValueError:
+        return None
+
+
+def _fsync_directory(path):
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def _lock_slot(slot):
+    import fcntl
+
+    slot.mkdir(parents=True, exist_ok=True)
+    handle = open(slot / "lock", "a")
+    try:
+        fcntl.flock(handle, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except BlockingIOError:
+        handle.close()
+        return None
+    return handle
+
+
+def claim_slot(directory):
+    # One log per live worker. The flock dies with the process, so a worker
+    # booted after a crash claims the orphaned slot and replays it.
+    index = 0
+    while True:
+        slot = Path(directory) / f"slot-{index}"
+        handle = _lock_slot(slot)
+        if handle is not None:
+            return slot, handle
+        index += 1
+
+
+class BallotLog:
+    def __init__(self, directory, segment_bytes=16 * 1024 * 1024):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.segment_bytes = segment_bytes
+        self._write_lock = threading.Lock()
+        self._sync_lock = threading.Lock()
+        self.applied_seq = self._read_checkpoint()
+        self._seq = self._recover()
+        self._synced_seq = self._seq
+        self._open_segment(self._seq + 1)
+
+    def _segments(self):
+        return sorted(self.directory.glob(f"*{SEGMENT_SUFFIX}"), key=lambda path: int(path.stem))
+
+    def _read_segment(self, path):
+        # Yields (record, end offset) up to the first torn line: a crash
+        # mid-append leaves a partial record that was never acknowledged.
+        offset = 0
+        with open(path, "rb") as handle:
+            for line in handle:
+                record = _decode(line) if line.endswith(b"\n") else None
+                if record is None:
+                    return
+                offset += len(line)
+                yield record, offset
+
+    def _scan(self):
+        for path in self._segments():
+            for record, _offset in self._read_segment(path):
+                yield record
+
+    def _recover(self):
+        # Finds the last sequence number and cuts a torn tail off the newest
+        # segment. Otherwise the next append could reopen that segment and
+        # land behind the bad line, where a later scan would never reach it.
+        seq = self.applied_seq
+        segments = self._segments()
+        for path in segments:
+            valid_bytes = 0
+            for record, valid_bytes in self._read_segment(path):
+                seq = max(seq, record["seq"])
+            if path == segments[-1] and valid_bytes < path.stat().st_size:
+                with open(path, "r+b") as handle:
+                    handle.truncate(valid_bytes)
+                    os.fsync(handle.fileno())
+        return seq
+
+    def _read_checkpoint(self):
+        try:
+            return int((self.directory / "checkpoint").read_text())
+        except (FileNotFoundError, ValueError):
+            return 0
+
+    def _open_segment(self, first_seq):
+        self._segment_path = self.directory / f"{first_seq:012d}{SEGMENT_SUFFIX}"
+        self._file = open(self._segment_path, "ab")
+        _fsync_directory(self.directory)
+
+    def unapplied(self):
+        return [record for record in self._scan() if record["seq"] > self.applied_seq]
+
+    def append(self, record):
+        with self._write_lock:
+            self._seq += 1
+            seq = self._seq
+            self._file.write(_encode({**record, "seq": seq}))
+        self._sync(seq)
+        return seq
+
+    def _sync(self, seq):
+        # Group commit: whichever thread gets the sync lock first flushes and
+        # fsyncs everything written so far, and later threads find their
+        # record already durable.
+        with self._sync_lock:
+            if self._synced_seq >= seq:
+                return
+            with self._write_lock:
+                self._file.flush()
+                target = self._seq
+            os.fsync(self._file.fileno())
+            self._synced_seq = target
+
+    def checkpoint(self, seq):
+        path = self.directory / "checkpoint"
+        temp_path = path.with_suffix(".tmp")
+        with open(temp_path, "w") as handle:
+            handle.write(str(seq))
+            handle.flush()
+            os.fsync(handle.fileno())
+        os.replace(temp_path, path)
+        _fsync_directory(self.directory)
+        self.applied_seq = seq
+        self._maybe_rotate()
+
+    def _maybe_rotate(self):
+        with self._sync_lock, self._write_lock:
+            if self._file.tell() >= self.segment_bytes:
+                self._file.flush()
+                os.fsync(self._file.fileno())
+                self._file.close()
+                self._open_segment(self._seq + 1)
+            segments = self._segments()
+            for path, next_path in zip(segments, segments[1:]):
+                if int(next_path.stem) - 1 <= self.applied_seq:
+                    path.unlink()
+
+    def close(self):
+        with self._sync_lock, self._write_lock:
+            self._file.close()
+
+
+def _record_ballots(record):
+    # A record holds every ballot from one request, so a multi-motion sync
+    # is applied all or nothing. Older records hold a single ballot inline.
+    entries = record["ballots"] if "ballots" in record else [record]
+    return [
+        (
+            record["voter_id"],
+            entry["motion_id"],
+            entry["motion_type"],
+            [tuple(choice) for choice in entry["choices"]],
+            entry.get("token"),
+            entry.get("version"),
+        )
+        for entry in entries
+    ]
+
+
+def apply_records(records, app=None):
+    # Connection errors propagate so the caller retries the batch later;
+    # only rows the database refuses outright are dropped. Every record was
+    # confirmed to a voter while its motions were OPEN, so it is applied
+    # even if a motion has closed since.
+    app = app or current_app
+    try:
+        write_ballots(
+            (ballot for record in records for ballot in _record_ballots(record)), check_open=False
+        )
+        db.session.commit()
+        return len(records), 0
+    except (IntegrityError, DataError):
+        db.session.rollback()
+    except Exception:
+        db.session.rollback()
+        raise
+
+    # Retry one by one so a single bad ballot (say, for a motion deleted in
+    # the meantime) cannot wedge the whole log.
+    applied = rejected = 0
+    for record in records:
+        try:
+            write_ballots(_record_ballots(record), check_open=False)
+            db.session.commit()
+            applied += 1
+        except (IntegrityError, DataError):
+            db.session.rollback()
+            rejected += 1
+            app.logger.exception("Dropping ballot log record %s", json.dumps(record))
+        except Exception:
+            db.session.rollback()
+            raise
+    return applied, rejected
+
+
+def replay_logs(directory, batch_size=200):
+    # Flushes every slot no live worker holds; used when the write-behind
+    # mode is switched off with ballots still in the logs.
+    slots = applied = rejected = 0
+    for slot in sorted(Path(directory).glob("slot-*")):
+        handle = _lock_slot(slot)
+        if handle is None:
+            continue
+        try:
+            log = BallotLog(slot)
+            records = log.unapplied()
+            for start in range(0, len(records), batch_size):
+                batch = records[start : start + batch_size]
+                batch_applied, batch_rejected = apply_records(batch)
+                applied += batch_applied
+                rejected += batch_rejected
+                log.checkpoint(batch[-1]["seq"])
+            log.close()
+            slots += 1
+        finally:
+            handle.close()
+    return slots, applied, rejected
+
+
+class BallotWriter:
+    def __init__(self, app, log):
+        self.app = app
+        self.log = log
+        self.pid = os.getpid()
+        self.batch_size = app.config["BALLOT_WAL_BATCH_SIZE"]
+        self.flush_seconds = app.config["BALLOT_WAL_FLUSH_MS"] / 1000
+        self._condition = threading.Condition()
+        self._pending = deque(self.log.unapplied())
+        self._idle = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="votora-ballot-writer", daemon=True)
+        self._thread.start()
+
+    def is_alive(self):
+        return self.pid == os.getpid() and self._thread.is_alive()
+
+    def submit(self, voter_id, ballots):
+        # ballots is a list of (motion_id, motion_type, choices, token, seen).
+        record = {
+            "voter_id": voter_id,
+            "ballots": [
+                {
+                    "motion_id": motion_id,
+                    "motion_type": motion_type,
+                    "choices": choices,
+                    "token": token or new_ballot_token(),
+                    "version": seen,
+                }
+                for motion_id, motion_type, choices, token, seen in ballots
+            ],
+        }
+        seq = self.log.append(record)
+        with self._condition:
+            self._pending.append({**record, "seq": seq})
+            self._idle.clear()
+            self._condition.notify()
+        return seq
+
+    def pending_motion_ids(self, voter_id):
+        with self._condition:
+            return {
+                ballot[1]
+                for record in self._pending
+                if record["voter_id"] == voter_id
+                for ballot in _record_ballots(record)
+            }
+
+    def drain(self, timeout=None):
+        with self._condition:
+            if not self._pending:
+                return True
+            self._condition.notify()
+        return self._idle.wait(timeout)
+
+    def _take_batch(self):
+        with self._condition:
+            while not self._pending:
+                self._idle.set()
+                self._condition.wait()
+            # Let a burst fill the batch before paying for a commit.
+            deadline = time.monotonic() + self.flush_seconds
+            while len(self._pending) < self.batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                self._condition.wait(remaining)
+            return [self._pending[index] for index in range(min(self.batch_size, len(self._pending)))]
+
+    def _run(self):
+        while True:
+            batch = self._take_batch()
+            with self.app.app_context():
+                try:
+                    apply_records(batch, self.app)
+                except Exception:
+                    self.app.logger.exception("Ballot flush failed, retrying")
+                    time.sleep(1)
+                    continue
+                finally:
+                    db.session.remove()
+            self.log.checkpoint(batch[-1]["seq"])
+            with self._condition:
+                for _record in batch:
+                    self._pending.popleft()
+
+
+_writer_lock = threading.Lock()
+
+
+def ballot_writer():
+    app = current_app._get_current_object()
+    writer = app.extensions.get("ballot_writer")
+    if writer is not None and writer.is_alive():
+        return writer
+
+    # Started on first use so each forked gunicorn worker owns its slot,
+    # replaying whatever a crashed predecessor left there.
+    with _writer_lock:
+        writer = app.extensions.get("ballot_writer")
+        if writer is None or not writer.is_alive():
+            slot, lock_handle = claim_slot(app.config["BALLOT_WAL_DIR"])
+            writer = BallotWriter(app, BallotLog(slot, app.config["BALLOT_WAL_SEGMENT_BYTES"]))
+            writer.lock_handle = lock_handle
+            app.extensions["ballot_writer"] = writer
+            atexit.register(writer.drain, app.config["BALLOT_WAL_DRAIN_SECONDS"])
+    return writer
+
+
+def record_ballots(voter_id, entries):
+    # entries is a list of (motion, choices, token, seen), written in one
+    # transaction (or one log record) so a batch lands all or nothing.
+    write_started = time.perf_counter()
+    if current_app.config["BALLOT_WAL_ENABLED"]:
+        # Acknowledged once the log append is on disk; the writer thread
+        # group-commits it to the vote tables. The status check holds its
+        # share lock until the append is durable, so a close either waits for
+        # this ballot or is seen by it.
+        try:
+            check_motions_open({motion.id for motion, _choices, _token, _seen in entries})
+            ballot_writer().submit(
+                voter_id,
+                [
+                    (motion.id, motion.type, choices, token, seen)
+                    for motion, choices, token, seen in entries
+                ],
+            )
+        finally:
+            db.session.rollback()
+    else:
+        try:
+            write_ballots(
+                [
+                    (voter_id, motion.id, motion.type, choices, token, seen)
+                    for motion, choices, token, seen in entries
+                ]
+            )
+        except MotionNotOpen:
+            db.session.rollback()
+            raise
+        db.session.commit()
+    elapsed = time.perf_counter() - write_started
+    for motion, _choices, _token, _seen in entries:
+        VOTE_WRITE_SECONDS.observe(elapsed / len(entries), motion_type=motion.type)
+        BALLOT_SUBMISSIONS.inc(motion_type=motion.type)
+
+
+def record_ballot(voter_id, motion, choices, token, seen=None):
+    record_ballots(voter_id, [(motion, choices, token, seen)])
+
+
+def init_ballot_wal(app):
+    if not app.config["BALLOT_WAL_ENABLED"]:
+        return
+
+    @app.before_request
+    def start_ballot_writer():
+        ballot_writer()
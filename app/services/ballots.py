@@ -0,0 +1,372 @@
+import hashlib
+import json
+import uuid
+
+from sqlalchemy import and_, insert, or_, select, update
+from sqlalchemy.dialects import mysql, sqlite
+
+from app.extensions import db
+from app.models import (
+    BallotReceipt,
+    CandidateVote,
+    CumulativeVote,
+    Motion,
+    PreferenceVote,
+    ScoreVote,
+    YesNoVote,
+)
+from app.models.base import utcnow
+
+VOTE_MODELS = {
+    "YES_NO": YesNoVote,
+    "FPTP": CandidateVote,
+    "PREFERENCE": PreferenceVote,
+    "SCORE": ScoreVote,
+    "CUMULATIVE": CumulativeVote,
+}
+VALUE_COLUMNS = {
+    "PREFERENCE": "preference_rank",
+    "SCORE": "score",
+    "CUMULATIVE": "points",
+}
+
+
+def _parse_float(raw_value):
+    try:
+        return float(raw_value)
+    except (TypeError, ValueError):
+        return None
+
+
+def parse_ballot_form(motion, form):
+    # Returns (choices, error). choices is a list of (option_id, value)
+    # pairs that replaces the voter's ballot, or None to leave it as is.
+    if motion.type == "PREFERENCE":
+        choices = []
+        for option in motion.options:
+            value = form.get(f"opt_{option.id}_rank")
+            if not value:
+                continue
+            try:
+                rank = int(value)
+            except ValueError:
+                continue
+            if rank > 0:
+                choices.append((option.id, rank))
+        return choices, None
+
+    if motion.type == "SCORE":
+        choices = []
+        for option in motion.options:
+            value = form.get(f"opt_{option.id}_score")
+            if value is None or value == "":
+                continue
+            score_value = _parse_float(value)
+            if score_value is None:
+                continue
+            score_value = round(score_value, 1)
+            if score_value < 0:
+                continue
+            if motion.score_max is not None and score_value > motion.score_max:
+                score_value = float(motion.score_max)
+            choices.append((option.id, score_value))
+        return choices, None
+
+    if motion.type == "CUMULATIVE":
+        budget = motion.budget_points
+        if budget is None:
+            return [], "Budget is not set for this motion."
+
+        choices = []
+        total_points = 0.0
+        for option in motion.options:
+            raw_value = form.get(f"opt_{option.id}_points")
+            points_value = 0.0
+            if raw_value is not None and raw_value != "":
+                points_value = _parse_float(raw_value) or 0.0
+            choices.append((option.id, points_value))
+            if points_value < 0:
+                return choices, "Points cannot be negative."
+            total_points += points_value
+
+        if abs(total_points - float(budget)) > 1e-6:
+            return choices, (
+                f"You must allocate exactly {budget} points.\nCurrent total: {total_points}."
+            )
+        return choices, None
+
+    selected_option_id = form.get("option")
+    if not selected_option_id:
+        return None, None
+    try:
+        option_id = int(selected_option_id)
+    except ValueError:
+        return None, None
+    if option_id not in {option.id for option in motion.options}:
+        return None, None
+    return [(option_id, None)], None
+
+
+def motion_form_fields(form, motion_id):
+    # The ballot sheet prefixes each field with its motion ("m12-option",
+    # "m12-opt_3_rank") so one form carries every motion's ballot.
+    prefix = f"m{motion_id}-"
+    return {key[len(prefix):]: value for key, value in form.items() if key.startswith(prefix)}
+
+
+FORM_FIELDS = {
+    "PREFERENCE": "opt_{}_rank",
+    "SCORE": "opt_{}_score",
+    "CUMULATIVE": "opt_{}_points",
+}
+
+
+def ballot_fields_from_json(motion, payload):
+    # Maps a JSON ballot, {"choices": [[option_id, value], ...]}, onto the
+    # form fields so both paths go through parse_ballot_form. Returns
+    # (fields, error).
+    choices = payload.get("choices") if isinstance(payload, dict) else None
+    if not isinstance(choices, list) or not all(
+        isinstance(choice, list) and len(choice) == 2 for choice in choices
+    ):
+        return None, "choices must be a list of [option_id, value] pairs."
+
+    field = FORM_FIELDS.get(motion.type)
+    if field is None:
+        if len(choices) > 1:
+            return None, "Choose a single option."
+        return {"option": str(choices[0][0])} if choices else {}, None
+    return {
+        field.format(option_id): "" if value is None else str(value)
+        for option_id, value in choices
+    }, None
+
+
+def current_choices_for(voter_id, motions):
+    # One query per motion type rather than one per motion.
+    choices = {motion.id: [] for motion in motions}
+    motion_ids_by_type = {}
+    for motion in motions:
+        motion_ids_by_type.setdefault(motion.type, []).append(motion.id)
+
+    for motion_type, motion_ids in motion_ids_by_type.items():
+        model = VOTE_MODELS[motion_type]
+        value_column = VALUE_COLUMNS.get(motion_type)
+        columns = [model.motion_id, model.option_id]
+        if value_column:
+            columns.append(getattr(model, value_column))
+        rows = db.session.execute(
+            select(*columns)
+            .where(model.voter_id == voter_id, model.motion_id.in_(motion_ids))
+            .order_by(model.motion_id, model.option_id)
+        )
+        for row in rows:
+            choices[row[0]].append([row[1], row[2] if value_column else None])
+    return choices
+
+
+def current_choices(voter_id, motion):
+    return current_choices_for(voter_id, [motion])[motion.id]
+
+
+def new_ballot_token():
+    return uuid.uuid4().hex
+
+
+def _receipt_token(token, choices):
+    # The receipt keeps a digest of the client token followed by one of the
+    # token and the choices. A retry of the same ballot matches in full and
+    # is a no-op; an edited ballot sent again under its page's token (say,
+    # after a lost response) matches the first half and is still written.
+    if not token:
+        return new_ballot_token()
+    token_digest = hashlib.sha256(token.encode()).hexdigest()[:32]
+    content = json.dumps([token, [list(choice) for choice in choices]])
+    return token_digest + hashlib.sha256(content.encode()).hexdigest()[:32]
+
+
+def receipt_versions(voter_id, motion_ids):
+    # The receipt version each ballot form is based on; 0 before a first
+    # vote. Sent back with the ballot so a stale one can be refused.
+    versions = dict.fromkeys(motion_ids, 0)
+    versions.update(
+        db.session.execute(
+            select(BallotReceipt.motion_id, BallotReceipt.version).where(
+                BallotReceipt.voter_id == voter_id, BallotReceipt.motion_id.in_(motion_ids)
+            )
+        ).all()
+    )
+    return versions
+
+
+def _insert_receipts(voter_id, tokens):
+    # tokens maps motion_id to receipt token; rows that already exist are
+    # left alone. New rows get version 0 until claimed, because the insert's
+    # rowcount cannot tell them apart: MySQL counts a duplicate as a found
+    # row.
+    now = utcnow()
+    rows = [
+        {
+            "voter_id": voter_id,
+            "motion_id": motion_id,
+            "token": token,
+            "version": 0,
+            "updated_at": now,
+        }
+        for motion_id, token in tokens.items()
+    ]
+    if db.session.get_bind().dialect.name in ("mysql", "mariadb"):
+        # A no-op update rather than INSERT IGNORE, which would also swallow
+        # foreign key and truncation errors.
+        statement = (
+            mysql.insert(BallotReceipt).values(rows).on_duplicate_key_update(id=BallotReceipt.id)
+        )
+    else:
+        statement = sqlite.insert(BallotReceipt).values(rows).on_conflict_do_nothing()
+    db.session.execute(statement)
+
+
+def _update_receipt(voter_id, motion_id, token, seen=None):
+    # Claims the receipt for a new token. A ballot from another page must
+    # also have seen the current version, so a late retry of an older
+    # submission cannot overwrite a newer ballot.
+    claimable = BallotReceipt.token != token
+    if seen is not None:
+        claimable = and_(
+            claimable,
+            or_(BallotReceipt.token.startswith(token[:32]), BallotReceipt.version == seen),
+        )
+    return db.session.execute(
+        update(BallotReceipt)
+        .where(
+            BallotReceipt.voter_id == voter_id,
+            BallotReceipt.motion_id == motion_id,
+            or_(BallotReceipt.version == 0, claimable),
+        )
+        .values(token=token, version=BallotReceipt.version + 1, updated_at=utcnow())
+    ).rowcount
+
+
+def claim_ballot(voter_id, motion_id, token, seen=None):
+    # Points the voter's receipt at this token. The insert or update also
+    # row-locks the receipt, so concurrent submissions for one voter and
+    # motion run one after another. Returns False when the token already
+    # wrote the current ballot, so a double click or a retried POST changes
+    # nothing, or when the ballot was based on a version since replaced.
+    _insert_receipts(voter_id, {motion_id: token})
+    return bool(_update_receipt(voter_id, motion_id, token, seen))
+
+
+def claim_ballots(voter_id, tokens, seen=None):
+    # claim_ballot for several of one voter's motions at once (a ballot
+    # sheet): one multi-row insert, one locking read and one update for the
+    # new receipts rather than a round trip or two per motion. seen maps
+    # motion ids to the receipt version each ballot was based on. Returns
+    # the motion ids whose ballots to write.
+    seen = seen or {}
+    _insert_receipts(voter_id, tokens)
+
+    # Insert first so the locking read only touches rows that exist; a
+    # FOR UPDATE over missing keys takes gap locks that deadlock against a
+    # concurrent insert on the same voter.
+    stored = db.session.execute(
+        select(BallotReceipt.motion_id, BallotReceipt.token, BallotReceipt.version)
+        .where(BallotReceipt.voter_id == voter_id, BallotReceipt.motion_id.in_(tokens))
+        .with_for_update()
+    ).all()
+    inserted = [motion_id for motion_id, _token, version in stored if version == 0]
+    if inserted:
+        db.session.execute(
+            update(BallotReceipt)
+            .where(BallotReceipt.voter_id == voter_id, BallotReceipt.motion_id.in_(inserted))
+            .values(version=1)
+        )
+    claimed = list(inserted)
+    for motion_id, token, version in stored:
+        if version == 0 or token == tokens[motion_id]:
+            continue
+        if _update_receipt(voter_id, motion_id, tokens[motion_id], seen.get(motion_id)):
+            claimed.append(motion_id)
+    return claimed
+
+
+class MotionNotOpen(Exception):
+    def __init__(self, motion_ids):
+        super().__init__(f"Motions not open for voting: {sorted(motion_ids)}")
+        self.motion_ids = motion_ids
+
+
+def check_motions_open(motion_ids):
+    # The cached status the routes check can lag a close by a few seconds.
+    # This read is the authoritative gate: it shares a lock on the motion
+    # rows until commit, so closing a motion waits for ballots already past
+    # it, and anything later sees the new status.
+    open_ids = set(
+        db.session.execute(
+            select(Motion.id)
+            .where(Motion.id.in_(motion_ids), Motion.status == "OPEN")
+            .with_for_update(read=True)
+        ).scalars()
+    )
+    closed = set(motion_ids) - open_ids
+    if closed:
+        raise MotionNotOpen(closed)
+
+
+def write_ballots(ballots, check_open=True):
+    # Each ballot is (voter_id, motion_id, motion_type, choices, token, seen)
+    # and replaces whatever that voter had on the motion, unless seen (the
+    # receipt version the ballot was based on, None if unknown) is stale; a
+    # later ballot in the same batch wins. Returns how many were written
+    # (repeated tokens and stale ballots are skipped). Unless check_open is off (for ballots already confirmed),
+    # raises MotionNotOpen, writing nothing, if any motion is not OPEN.
+    # Nothing is committed here.
+    latest = {}
+    for voter_id, motion_id, motion_type, choices, token, seen in ballots:
+        latest[(voter_id, motion_id)] = (motion_type, choices, _receipt_token(token, choices), seen)
+    if not latest:
+        return 0
+    if check_open:
+        check_motions_open({motion_id for _voter_id, motion_id in latest})
+
+    tokens_by_voter = {}
+    for (voter_id, motion_id), (_motion_type, _choices, token, _seen) in latest.items():
+        tokens_by_voter.setdefault(voter_id, {})[motion_id] = token
+
+    by_type = {}
+    for voter_id, tokens in tokens_by_voter.items():
+        seen = {motion_id: latest[(voter_id, motion_id)][3] for motion_id in tokens}
+        if len(tokens) == 1:
+            ((motion_id, token),) = tokens.items()
+            claimed = (
+                [motion_id] if claim_ballot(voter_id, motion_id, token, seen[motion_id]) else []
+            )
+        else:
+            claimed = claim_ballots(voter_id, tokens, seen)
+        for motion_id in claimed:
+            motion_type, choices, _token, _seen = latest[(voter_id, motion_id)]
+            by_type.setdefault(motion_type, []).append((voter_id, motion_id, choices))
+
+    for motion_type, entries in by_type.items():
+        model = VOTE_MODELS[motion_type]
+        value_column = VALUE_COLUMNS.get(motion_type)
+        db.session.execute(
+            model.__table__.delete().where(
+                or_(
+                    *(
+                        and_(model.voter_id == voter_id, model.motion_id == motion_id)
+                        for voter_id, motion_id, _choices in entries
+                    )
+                )
+            )
+        )
+        rows = []
+        for voter_id, motion_id, choices in entries:
+            for option_id, value in choices:
+                row = {"voter_id": voter_id, "motion_id": motion_id, "option_id": option_id}
+                if value_column:
+                    row[value_column] = value
+                rows.append(row)
+        if rows:
+            db.session.execute(insert(model), rows)
+    return sum(len(entries) for entries in by_type.values())
@@ -0,0 +1,36 @@
+from flask import redirect, request
+from sqlalchemy.exc import DBAPIError
+
+from app.extensions import db
+
+
+def pool_statistics(engine):
+    pool = engine.pool
+    stats = {"pool": type(pool).__name__}
+    for name in ("size", "checkedin", "checkedout", "overflow"):
+        method = getattr(pool, name, None)
+        if callable(method):
+            stats[name] = method()
+    if "overflow" in stats:
+        # QueuePool counts overflow from -pool_size until the pool is full.
+        stats["overflow"] = max(stats["overflow"], 0)
+    return stats
+
+
+def init_db_pool(app):
+    if app.config["SQLALCHEMY_ENGINE_OPTIONS"].get("pool_pre_ping", False):
+        return
+
+    # Without a pre-ping a connection the server has dropped only fails on
+    # first use. SQLAlchemy then invalidates the pool, so a single retry is
+    # served from a fresh connection.
+    @app.errorhandler(DBAPIError)
+    def retry_after_disconnect(error):
+        if not error.connection_invalidated:
+            raise error
+
+        db.session.rollback()
+        app.logger.warning("Database connection lost during %s %s", request.method, request.path)
+        if request.method in ("GET", "HEAD"):
+            return redirect(request.full_path.rstrip("?"), code=307)
+        return "The database connection was reset. Please try again.", 503, {"Retry-After": "1"}
@@ -0,0 +1,125 @@
+import functools
+import gzip
+import hashlib
+import threading
+
+from flask import current_app, make_response, request, session
+from flask_login import current_user
+
+COMPRESSIBLE_MIMETYPES = {
+    "text/html",
+    "text/plain",
+    "text/xml",
+    "application/json",
+    "application/xml",
+}
+
+
+def _accepts_gzip():
+    return bool(request.accept_encodings["gzip"])
+
+
+def _gzip(data):
+    return gzip.compress(data, compresslevel=current_app.config["COMPRESSION_LEVEL"], mtime=0)
+
+
+class PageCache:
+    # Rendered bodies of anonymous public pages, kept for the life of the
+    # worker: they only change with a deploy. The gzip copy is made once so
+    # a cached hit costs no rendering and no compression.
+    def __init__(self):
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        return self._entries.get(key)
+
+    def store(self, key, response):
+        body = response.get_data()
+        small = len(body) < current_app.config["COMPRESSION_MIN_BYTES"]
+        entry = {
+            "body": body,
+            "gzip": None if small else _gzip(body),
+            "mimetype": response.mimetype,
+            "etag": hashlib.sha256(body).hexdigest()[:20],
+        }
+        with self._lock:
+            return self._entries.setdefault(key, entry)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+def _has_visitor_state():
+    # Admins, voters and anyone with a flash message see a personalised
+    # navbar, so only cookie-less visitors share the cached copy.
+    return bool(session) or current_user.is_authenticated
+
+
+def public_page(view):
+    @functools.wraps(view)
+    def wrapper(*args, **kwargs):
+        app = current_app
+        if not app.config["PUBLIC_PAGE_CACHE_ENABLED"] or _has_visitor_state():
+            response = make_response(view(*args, **kwargs))
+            response.cache_control.private = True
+            response.cache_control.no_cache = True
+            return response
+
+        cache = app.extensions["page_cache"]
+        key = (request.endpoint, request.host_url)
+        entry = cache.get(key)
+        if entry is None:
+            response = make_response(view(*args, **kwargs))
+            if response.status_code != 200:
+                return response
+            entry = cache.store(key, response)
+
+        use_gzip = (
+            app.config["COMPRESSION_ENABLED"] and entry["gzip"] is not None and _accepts_gzip()
+        )
+        response = app.response_class(
+            entry["gzip"] if use_gzip else entry["body"], mimetype=entry["mimetype"]
+        )
+        if use_gzip:
+            response.headers["Content-Encoding"] = "gzip"
+        response.vary.update(("Cookie", "Accept-Encoding"))
+        response.set_etag(entry["etag"], weak=True)
+        response.cache_control.public = True
+        response.cache_control.max_age = app.config["PUBLIC_PAGE_MAX_AGE"]
+        return response.make_conditional(request)
+
+    return wrapper
+
+
+def init_http_cache(app):
+    app.extensions["page_cache"] = PageCache()
+    if not app.config["COMPRESSION_ENABLED"]:
+        return
+
+    @app.after_request
+    def compress_response(response):
+        if (
+            response.direct_passthrough
+            or response.is_streamed
+            or response.status_code < 200
+            or response.status_code in (204, 206, 304)
+            or "Content-Encoding" in response.headers
+            or response.mimetype not in COMPRESSIBLE_MIMETYPES
+        ):
+            return response
+        response.vary.add("Accept-Encoding")
+        if not _accepts_gzip():
+            return response
+        body = response.get_data()
+        if len(body) < app.config["COMPRESSION_MIN_BYTES"]:
+            return response
+
+        response.set_data(_gzip(body))
+        response.headers["Content-Encoding"] = "gzip"
+        # The bytes changed, so a strong validator no longer holds.
+        etag, weak = response.get_etag()
+        if etag and not weak:
+            response.set_etag(etag, weak=True)
+        return response
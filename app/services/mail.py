@@ -0,0 +1,220 @@
+import os
+import threading
+import uuid
+from datetime import timedelta
+from email.message import EmailMessage
+from pathlib import Path
+
+from flask import current_app
+from sqlalchemy import update
+
+from app.extensions import db
+from app.models import OutboundEmail
+from app.models.base import utcnow
+
+STATUS_PENDING = "PENDING"
+STATUS_SENT = "SENT"
+STATUS_FAILED = "FAILED"
+
+DEFAULT_FROM = "Votora <noreply@votora.me>"
+
+
+class ResendTransport:
+    def __init__(self, config):
+        self.api_key = config.get("RESEND_API_KEY")
+        self.sender = config.get("MAIL_FROM", DEFAULT_FROM)
+
+    def send(self, email):
+        if not self.api_key:
+            raise RuntimeError("RESEND_API_KEY is missing.")
+
+        import resend
+
+        resend.api_key = self.api_key
+        resend.Emails.send(
+            {
+                "from": self.sender,
+                "to": [email.to_email],
+                "subject": email.subject,
+                "text": email.body,
+            }
+        )
+
+
+class ConsoleTransport:
+    def __init__(self, config):
+        self.sender = config.get("MAIL_FROM", DEFAULT_FROM)
+
+    def send(self, email):
+        current_app.logger.info(
+            "Email to %s from %s: %s\n%s", email.to_email, self.sender, email.subject, email.body
+        )
+
+
+class FileTransport:
+    def __init__(self, config):
+        self.sender = config.get("MAIL_FROM", DEFAULT_FROM)
+        self.directory = Path(config.get("MAIL_FILE_DIR") or "instance/mail")
+
+    def send(self, email):
+        message = EmailMessage()
+        message["From"] = self.sender
+        message["To"] = email.to_email
+        message["Subject"] = email.subject
+        message.set_content(email.body)
+
+        self.directory.mkdir(parents=True, exist_ok=True)
+        path = self.directory / f"{email.id:08d}-{uuid.uuid4().hex[:8]}.eml"
+        path.write_bytes(bytes(message))
+
+
+TRANSPORTS = {
+    "resend": ResendTransport,
+    "console": ConsoleTransport,
+    "file": FileTransport,
+}
+
+
+def get_transport(app=None):
+    app = app or current_app
+    name = app.config.get("MAIL_TRANSPORT") or (
+        "resend" if app.config.get("RESEND_API_KEY") else "console"
+    )
+    try:
+        factory = TRANSPORTS[name]
+    except KeyError:
+        raise RuntimeError(f"Unknown MAIL_TRANSPORT: {name}")
+    return factory(app.config)
+
+
+def queue_email(to_email, subject, body):
+    email = OutboundEmail(to_email=to_email, subject=subject, body=body)
+    db.session.add(email)
+    db.session.commit()
+    _wake_sender()
+    return email
+
+
+def _retry_delay(attempts, base_seconds):
+    return timedelta(seconds=min(base_seconds * 2 ** (attempts - 1), 3600))
+
+
+def deliver_pending(limit=50, transport=None):
+    app = current_app
+    transport = transport or get_transport()
+    max_attempts = app.config["MAIL_MAX_ATTEMPTS"]
+    lease = timedelta(seconds=app.config["MAIL_LEASE_SECONDS"])
+    now = utcnow()
+
+    due_ids = [
+        row.id
+        for row in db.session.query(OutboundEmail.id)
+        .filter(OutboundEmail.status == STATUS_PENDING, OutboundEmail.next_attempt_at <= now)
+        .order_by(OutboundEmail.next_attempt_at, OutboundEmail.id)
+        .limit(limit)
+    ]
+
+    sent = failed = 0
+    for email_id in due_ids:
+        # Claim the row by pushing its next attempt past a lease, so other
+        # workers skip it and a crash mid-send only delays the retry.
+        claimed = db.session.execute(
+            update(OutboundEmail)
+            .where(
+                OutboundEmail.id == email_id,
+                OutboundEmail.status == STATUS_PENDING,
+                OutboundEmail.next_attempt_at <= now,
+            )
+            .values(
+                next_attempt_at=now + lease,
+                attempts=OutboundEmail.attempts + 1,
+            )
+        ).rowcount
+        db.session.commit()
+        if not claimed:
+            continue
+
+        email = db.session.get(OutboundEmail, email_id)
+        try:
+            transport.send(email)
+        except Exception as exc:
+            email.last_error = str(exc)[:2000]
+            if email.attempts >= max_attempts:
+                email.status = STATUS_FAILED
+                failed += 1
+                app.logger.error("Giving up on email %s to %s: %s", email.id, email.to_email, exc)
+            else:
+                email.next_attempt_at = utcnow() + _retry_delay(
+                    email.attempts, app.config["MAIL_RETRY_SECONDS"]
+                )
+                app.logger.warning("Email %s to %s failed, will retry: %s", email.id, email.to_email, exc)
+        else:
+            email.status = STATUS_SENT
+            email.sent_at = utcnow()
+            email.last_error = None
+            sent += 1
+        db.session.commit()
+
+    return sent, failed
+
+
+class MailSender:
+    def __init__(self, app):
+        self.app = app
+        self.pid = os.getpid()
+        self._wake = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="votora-mail-sender", daemon=True)
+        self._thread.start()
+
+    def is_alive(self):
+        return self.pid == os.getpid() and self._thread.is_alive()
+
+    def wake(self):
+        self._wake.set()
+
+    def _run(self):
+        interval = self.app.config["MAIL_POLL_SECONDS"]
+        while True:
+            self._wake.wait(interval)
+            self._wake.clear()
+            with self.app.app_context():
+                try:
+                    deliver_pending()
+                except Exception:
+                    db.session.rollback()
+                    self.app.logger.exception("Mail sender pass failed")
+                finally:
+                    db.session.remove()
+
+
+_sender_lock = threading.Lock()
+
+
+def mail_sender(app):
+    # One thread per worker process; a sender inherited across fork() is
+    # dead in the child and is replaced.
+    with _sender_lock:
+        sender = app.extensions.get("mail_sender")
+        if sender is None or not sender.is_alive():
+            sender = app.extensions["mail_sender"] = MailSender(app)
+    return sender
+
+
+def _wake_sender():
+    app = current_app._get_current_object()
+    if not app.config["MAIL_BACKGROUND_SENDER"]:
+        return
+    mail_sender(app).wake()
+
+
+def init_mail(app):
+    if not app.config["MAIL_BACKGROUND_SENDER"]:
+        return
+
+    @app.before_request
+    def start_mail_sender():
+        # Pending mail and retries waiting out a backoff left by a restarted
+        # worker go out without waiting for someone to queue a new email.
+        sender = app.extensions.get("mail_sender")
+        if sender is None or not sender.is_alive():
+            mail_sender(app).wake()
@@ -0,0 +1,203 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import namedtuple
+
+from flask import current_app
+from sqlalchemy import select
+
+from app.extensions import db
+from app.models import Motion, Option
+
+CachedOption = namedtuple("CachedOption", "id text")
+CachedMotionDetail = namedtuple(
+    "CachedMotionDetail",
+    "id meeting_id title type status num_winners score_max budget_points options",
+)
+
+
+class SQLiteSharedTier:
+    def __init__(self, path):
+        self.path = path
+        self._local = threading.local()
+
+    def _connection(self):
+        # Connections are per thread and per process so a preloaded master
+        # never hands its handle to forked workers.
+        pid = os.getpid()
+        if getattr(self._local, "pid", None) != pid:
+            connection = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS meeting_versions "
+                "(meeting_id INTEGER PRIMARY KEY, version INTEGER NOT NULL)"
+            )
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS motion_metadata "
+                "(motion_id INTEGER PRIMARY KEY, meeting_id INTEGER NOT NULL, "
+                "version INTEGER NOT NULL, payload TEXT NOT NULL)"
+            )
+            self._local.connection = connection
+            self._local.pid = pid
+        return self._local.connection
+
+    def version(self, meeting_id):
+        row = self._connection().execute(
+            "SELECT version FROM meeting_versions WHERE meeting_id = ?", (meeting_id,)
+        ).fetchone()
+        return row[0] if row else 0
+
+    def bump(self, meeting_id):
+        connection = self._connection()
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            connection.execute(
+                "INSERT INTO meeting_versions (meeting_id, version) VALUES (?, 1) "
+                "ON CONFLICT(meeting_id) DO UPDATE SET version = version + 1",
+                (meeting_id,),
+            )
+            connection.execute("DELETE FROM motion_metadata WHERE meeting_id = ?", (meeting_id,))
+            connection.execute("COMMIT")
+        except Exception:
+            connection.execute("ROLLBACK")
+            raise
+
+    def load(self, motion_id, version):
+        row = self._connection().execute(
+            "SELECT payload FROM motion_metadata WHERE motion_id = ? AND version = ?",
+            (motion_id, version),
+        ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def store(self, motion_id, meeting_id, version, payload):
+        self._connection().execute(
+            "INSERT OR REPLACE INTO motion_metadata (motion_id, meeting_id, version, payload) "
+            "VALUES (?, ?, ?, ?)",
+            (motion_id, meeting_id, version, json.dumps(payload)),
+        )
+
+
+class MetadataCache:
+    def __init__(self, ttl, shared=None, status_ttl=2):
+        self.ttl = ttl
+        self.status_ttl = status_ttl
+        self.shared = shared
+        self._lock = threading.Lock()
+        self._versions = {}
+        self._motions = {}
+
+    def version(self, meeting_id):
+        if self.shared is not None:
+            return self.shared.version(meeting_id)
+        return self._versions.get(meeting_id, 0)
+
+    def bump(self, meeting_id):
+        if self.shared is not None:
+            self.shared.bump(meeting_id)
+        with self._lock:
+            self._versions[meeting_id] = self._versions.get(meeting_id, 0) + 1
+            for motion_id, entry in list(self._motions.items()):
+                if entry[2].meeting_id == meeting_id:
+                    del self._motions[motion_id]
+
+    def get_motion(self, motion_id, meeting_id):
+        version = self.version(meeting_id)
+        now = time.monotonic()
+        entry = self._motions.get(motion_id)
+        if entry is not None and entry[0] == version and entry[3] <= now:
+            # Without the shared tier this worker never hears about status
+            # changes made by others, so the status gate re-reads that one
+            # column every status_ttl seconds and drops the meeting if it moved.
+            status = db.session.execute(
+                select(Motion.status).where(Motion.id == motion_id)
+            ).scalar()
+            if status == entry[2].status:
+                entry = (entry[0], entry[1], entry[2], now + self.status_ttl)
+                with self._lock:
+                    self._motions[motion_id] = entry
+            else:
+                self.bump(entry[2].meeting_id)
+                version = self.version(meeting_id)
+                entry = None
+        if entry is not None and entry[0] == version and entry[1] > now:
+            detail = entry[2]
+        else:
+            detail = None
+            if self.shared is not None:
+                payload = self.shared.load(motion_id, version)
+                if payload is not None:
+                    detail = _detail_from_payload(payload)
+            if detail is None:
+                detail = _load_motion_detail(motion_id)
+                if detail is None or detail.meeting_id != meeting_id:
+                    return None
+                if self.shared is not None:
+                    self.shared.store(motion_id, detail.meeting_id, version, detail._asdict())
+            # With the shared tier every bump is seen on the next request, so
+            # the status never needs re-reading.
+            status_fresh_until = float("inf") if self.shared is not None else now + self.status_ttl
+            with self._lock:
+                self._motions[motion_id] = (version, now + self.ttl, detail, status_fresh_until)
+
+        if detail.meeting_id != meeting_id:
+            return None
+        return detail
+
+
+def _detail_from_payload(payload):
+    payload["options"] = tuple(CachedOption(*option) for option in payload["options"])
+    return CachedMotionDetail(**payload)
+
+
+def _load_motion_detail(motion_id):
+    motion = db.session.execute(
+        select(
+            Motion.id,
+            Motion.meeting_id,
+            Motion.title,
+            Motion.type,
+            Motion.status,
+            Motion.num_winners,
+            Motion.score_max,
+            Motion.budget_points,
+        ).where(Motion.id == motion_id)
+    ).first()
+    if motion is None:
+        return None
+    options = tuple(
+        CachedOption(*row)
+        for row in db.session.execute(
+            select(Option.id, Option.text).where(Option.motion_id == motion_id).order_by(Option.id)
+        )
+    )
+    return CachedMotionDetail(*motion, options=options)
+
+
+def _cache():
+    cache = current_app.extensions.get("metadata_cache")
+    if cache is None:
+        path = current_app.config["METADATA_CACHE_PATH"]
+        cache = current_app.extensions["metadata_cache"] = MetadataCache(
+            current_app.config["METADATA_CACHE_TTL"],
+            shared=SQLiteSharedTier(path) if path else None,
+            status_ttl=current_app.config["METADATA_CACHE_STATUS_TTL"],
+        )
+    return cache
+
+
+def meeting_version(meeting_id):
+    return _cache().version(meeting_id)
+
+
+def get_motion_detail(motion_id, meeting_id):
+    if not current_app.config["METADATA_CACHE_ENABLED"]:
+        detail = _load_motion_detail(motion_id)
+        return detail if detail is not None and detail.meeting_id == meeting_id else None
+    return _cache().get_motion(motion_id, meeting_id)
+
+
+def invalidate_meeting(meeting_id):
+    _cache().bump(meeting_id)
@@ -0,0 +1,439 @@
+import atexit
+import functools
+import json
+import math
+import os
+import threading
+import time
+from pathlib import Path
+
+from sqlalchemy import event
+
+from app.services.profiling import active_profiler
+
+DEFAULT_LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+TALLY_BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1, 5, 10, 30, 60)
+POOL_WAIT_BUCKETS = (0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1, 5, 30)
+BALLOT_COUNT_BUCKETS = (100, 1_000, 10_000, 100_000)
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names, values, extra=None):
+    pairs = list(zip(names, values))
+    if extra:
+        pairs.append(extra)
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in pairs) + "}"
+
+
+def _format_value(value):
+    if value == math.inf:
+        return "+Inf"
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return repr(value) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    kind = "counter"
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        self._values = {}
+
+    def inc(self, amount=1, **labels):
+        key = tuple(str(labels[name]) for name in self.labelnames)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels):
+        key = tuple(str(labels[name]) for name in self.labelnames)
+        return self._values.get(key, 0)
+
+    def collect(self):
+        with self._lock:
+            return dict(self._values)
+
+    def merge(self, states):
+        merged = {}
+        for _worker, values, _fresh in states:
+            for key, value in values.items():
+                merged[key] = merged.get(key, 0) + value
+        return self.labelnames, merged
+
+    def samples(self, values):
+        for key, value in sorted(values.items()):
+            yield self.name, key, None, value
+
+    def reset(self):
+        with self._lock:
+            self._values.clear()
+
+
+class Histogram:
+    kind = "histogram"
+
+    def __init__(self, name, documentation, labelnames=(), buckets=DEFAULT_LATENCY_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(buckets) + (math.inf,)
+        self._lock = threading.Lock()
+        self._values = {}
+
+    def observe(self, value, **labels):
+        key = tuple(str(labels[name]) for name in self.labelnames)
+        with self._lock:
+            entry = self._values.get(key)
+            if entry is None:
+                entry = self._values[key] = [[0] * len(self.buckets), 0.0, 0]
+            for index, upper in enumerate(self.buckets):
+                if value <= upper:
+                    entry[0][index] += 1
+                    break
+            entry[1] += value
+            entry[2] += 1
+
+    def count(self, **labels):
+        key = tuple(str(labels[name]) for name in self.labelnames)
+        entry = self._values.get(key)
+        return entry[2] if entry else 0
+
+    def collect(self):
+        with self._lock:
+            return {key: [list(entry[0]), entry[1], entry[2]] for key, entry in self._values.items()}
+
+    def merge(self, states):
+        merged = {}
+        for _worker, values, _fresh in states:
+            for key, (bucket_counts, total, count) in values.items():
+                entry = merged.setdefault(key, [[0] * len(self.buckets), 0.0, 0])
+                entry[0] = [a + b for a, b in zip(entry[0], bucket_counts)]
+                entry[1] += total
+                entry[2] += count
+        return self.labelnames, merged
+
+    def samples(self, values):
+        for key, (bucket_counts, total, count) in sorted(values.items()):
+            cumulative = 0
+            for upper, bucket_count in zip(self.buckets, bucket_counts):
+                cumulative += bucket_count
+                yield self.name + "_bucket", key, ("le", _format_value(float(upper))), cumulative
+            yield self.name + "_sum", key, None, total
+            yield self.name + "_count", key, None, count
+
+    def reset(self):
+        with self._lock:
+            self._values.clear()
+
+
+class Gauge:
+    kind = "gauge"
+
+    def __init__(self, name, documentation, labelnames=(), callback=None):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.callback = callback
+
+    def collect(self):
+        if self.callback is None:
+            return {}
+        return {
+            key if isinstance(key, tuple) else (key,): value for key, value in self.callback().items()
+        }
+
+    def merge(self, states):
+        # A gauge is a reading of one process, so workers are kept apart, and
+        # a worker that stopped writing snapshots no longer reports one.
+        merged = {
+            (str(worker),) + key: value
+            for worker, values, fresh in states
+            if fresh
+            for key, value in values.items()
+        }
+        return ("worker",) + self.labelnames, merged
+
+    def samples(self, values):
+        for key, value in sorted(values.items()):
+            yield self.name, key, None, value
+
+    def reset(self):
+        pass
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._metrics = []
+
+    def register(self, metric):
+        self._metrics.append(metric)
+        return metric
+
+    def counter(self, name, documentation, labelnames=()):
+        return self.register(Counter(name, documentation, labelnames))
+
+    def histogram(self, name, documentation, labelnames=(), buckets=DEFAULT_LATENCY_BUCKETS):
+        return self.register(Histogram(name, documentation, labelnames, buckets))
+
+    def gauge(self, name, documentation, labelnames=(), callback=None):
+        return self.register(Gauge(name, documentation, labelnames, callback))
+
+    def snapshot(self):
+        return {
+            "written_at": time.time(),
+            "metrics": {
+                metric.name: [[list(key), value] for key, value in metric.collect().items()]
+                for metric in self._metrics
+            },
+        }
+
+    def render(self, snapshots=None, max_age=math.inf):
+        # snapshots maps a worker id to its snapshot(); with them the output
+        # covers every worker, otherwise only this process.
+        if snapshots is not None:
+            now = time.time()
+            snapshots = [
+                (worker, snapshot["metrics"], now - snapshot["written_at"] <= max_age)
+                for worker, snapshot in sorted(snapshots.items())
+            ]
+        lines = []
+        for metric in self._metrics:
+            if snapshots is None:
+                labelnames, values = metric.labelnames, metric.collect()
+            else:
+                labelnames, values = metric.merge(
+                    [
+                        (worker, {tuple(key): value for key, value in metrics.get(metric.name, [])}, fresh)
+                        for worker, metrics, fresh in snapshots
+                    ]
+                )
+            lines.append(f"# HELP {metric.name} {metric.documentation}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            for sample_name, key, extra, value in metric.samples(values):
+                labels = _format_labels(labelnames, key, extra)
+                lines.append(f"{sample_name}{labels} {_format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+    def reset(self):
+        for metric in self._metrics:
+            metric.reset()
+
+
+REGISTRY = MetricsRegistry()
+
+BALLOT_SUBMISSIONS = REGISTRY.counter(
+    "votora_ballot_submissions_total",
+    "Ballots recorded, by motion type.",
+    ("motion_type",),
+)
+VOTE_WRITE_SECONDS = REGISTRY.histogram(
+    "votora_vote_write_seconds",
+    "Time spent validating and writing a ballot, by motion type.",
+    ("motion_type",),
+)
+TALLY_SECONDS = REGISTRY.histogram(
+    "votora_tally_seconds",
+    "Time spent counting a motion, by tally engine and ballot count bucket.",
+    ("engine", "ballots"),
+    buckets=TALLY_BUCKETS,
+)
+RESULTS_PAGE_SECONDS = REGISTRY.histogram(
+    "votora_results_page_seconds",
+    "Time spent building the meeting results page, including every tally.",
+)
+JOIN_ATTEMPTS = REGISTRY.counter(
+    "votora_join_attempts_total",
+    "Voter join attempts, by join route and outcome.",
+    ("route", "outcome"),
+)
+DB_POOL_CHECKOUT_SECONDS = REGISTRY.histogram(
+    "votora_db_pool_checkout_seconds",
+    "Time spent waiting for a database connection from the pool.",
+    buckets=POOL_WAIT_BUCKETS,
+)
+
+
+def _pool_connections():
+    from app.extensions import db
+    from app.services.db_pool import pool_statistics
+
+    stats = pool_statistics(db.engine)
+    return {
+        state: stats[key]
+        for state, key in (
+            ("idle", "checkedin"),
+            ("in_use", "checkedout"),
+            ("overflow", "overflow"),
+        )
+        if key in stats
+    }
+
+
+DB_POOL_CONNECTIONS = REGISTRY.gauge(
+    "votora_db_pool_connections",
+    "Connections in this worker's pool, by state.",
+    ("state",),
+    callback=_pool_connections,
+)
+
+
+def ballot_count_bucket(count):
+    for upper in BALLOT_COUNT_BUCKETS:
+        if count < upper:
+            return f"<{upper}"
+    return f">={BALLOT_COUNT_BUCKETS[-1]}"
+
+
+def _result_ballot_count(result):
+    for key in ("total_ballots", "ballot_count", "total_votes"):
+        if key in result:
+            return result[key]
+    return 0
+
+
+def timed_tally(engine):
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            frame = engine
+            motion_id = getattr(args[0], "id", None) if args else None
+            if motion_id is not None:
+                frame = f"{engine}[motion={motion_id}]"
+            started = time.perf_counter()
+            with active_profiler().phase(frame):
+                result = func(*args, **kwargs)
+            TALLY_SECONDS.observe(
+                time.perf_counter() - started,
+                engine=engine,
+                ballots=ballot_count_bucket(_result_ballot_count(result)),
+            )
+            return result
+
+        return wrapper
+
+    return decorator
+
+
+def _instrument_pool(pool):
+    # Pool events only fire once a connection is handed out, so the wait is
+    # measured around Pool.connect itself.
+    if getattr(pool, "_votora_instrumented", False):
+        return
+    connect = pool.connect
+
+    def timed_connect():
+        started = time.perf_counter()
+        try:
+            return connect()
+        finally:
+            DB_POOL_CHECKOUT_SECONDS.observe(time.perf_counter() - started)
+
+    pool.connect = timed_connect
+    pool._votora_instrumented = True
+
+
+def instrument_engine(engine):
+    # engine.dispose() swaps in a fresh pool (gunicorn's post_fork does so in
+    # every worker), so the new pool is wrapped again each time.
+    _instrument_pool(engine.pool)
+    if not event.contains(engine, "engine_disposed", _reinstrument_pool):
+        event.listen(engine, "engine_disposed", _reinstrument_pool)
+
+
+def _reinstrument_pool(engine):
+    _instrument_pool(engine.pool)
+
+
+def write_snapshot(directory, registry=None):
+    # One file per worker process; a worker's file outlives it so its
+    # counters keep adding to the totals after a restart.
+    registry = registry or REGISTRY
+    path = Path(directory) / f"{os.getpid()}.json"
+    temp_path = path.with_name(f"{path.stem}.{threading.get_ident()}.tmp")
+    temp_path.write_text(json.dumps(registry.snapshot()))
+    os.replace(temp_path, path)
+
+
+def read_snapshots(directory):
+    snapshots = {}
+    for path in Path(directory).glob("*.json"):
+        try:
+            snapshots[path.stem] = json.loads(path.read_text())
+        except (FileNotFoundError, ValueError):
+            continue
+    return snapshots
+
+
+def render_metrics(app):
+    directory = app.config["METRICS_DIR"]
+    if not directory:
+        return REGISTRY.render()
+    write_snapshot(directory)
+    return REGISTRY.render(read_snapshots(directory), max_age=3 * app.config["METRICS_FLUSH_SECONDS"])
+
+
+class SnapshotWriter:
+    def __init__(self, app):
+        self.app = app
+        self.pid = os.getpid()
+        self._thread = threading.Thread(target=self._run, name="votora-metrics-snapshot", daemon=True)
+        self._thread.start()
+
+    def is_alive(self):
+        return self.pid == os.getpid() and self._thread.is_alive()
+
+    def write(self):
+        with self.app.app_context():
+            write_snapshot(self.app.config["METRICS_DIR"])
+
+    def _run(self):
+        while True:
+            time.sleep(self.app.config["METRICS_FLUSH_SECONDS"])
+            try:
+                self.write()
+            except Exception:
+                self.app.logger.exception("Writing the metrics snapshot failed")
+
+
+_snapshot_lock = threading.Lock()
+
+
+def init_metrics(app):
+    app.config.setdefault("METRICS_ENABLED", True)
+    app.config.setdefault("METRICS_TOKEN", None)
+    app.config.setdefault("METRICS_PUBLIC", False)
+    app.config.setdefault("METRICS_DIR", "")
+    app.config.setdefault("METRICS_FLUSH_SECONDS", 5)
+    if not app.config["METRICS_ENABLED"]:
+        return
+
+    from app.extensions import db
+
+    with app.app_context():
+        for engine in db.engines.values():
+            instrument_engine(engine)
+
+    if not app.config["METRICS_DIR"]:
+        return
+    os.makedirs(app.config["METRICS_DIR"], exist_ok=True)
+
+    @app.before_request
+    def start_snapshot_writer():
+        # Each gunicorn worker writes its own snapshot, so the thread starts
+        # after the fork, on the worker's first request.
+        writer = app.extensions.get("metrics_snapshot")
+        if writer is not None and writer.is_alive():
+            return
+        with _snapshot_lock:
+            writer = app.extensions.get("metrics_snapshot")
+            if writer is None or not writer.is_alive():
+                writer = app.extensions["metrics_snapshot"] = SnapshotWriter(app)
+                atexit.register(writer.write)
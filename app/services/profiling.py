@@ -0,0 +1,139 @@
+import contextlib
+import contextvars
+import time
+from fractions import Fraction
+
+_active_profiler = contextvars.ContextVar("tally_profiler", default=None)
+_NULL_CONTEXT = contextlib.nullcontext()
+
+
+class _NullProfiler:
+    enabled = False
+
+    def phase(self, name):
+        return _NULL_CONTEXT
+
+    def enter_round(self, round_number):
+        pass
+
+    def close_round(self):
+        pass
+
+    def count(self, name, amount=1):
+        pass
+
+    def observe_fraction(self, value):
+        pass
+
+
+NULL_PROFILER = _NullProfiler()
+
+
+class TallyProfiler:
+    enabled = True
+
+    def __init__(self):
+        self._stack = []
+        self._round = None
+        self.frames = {}
+        self.counters = {}
+        self.rounds = []
+
+    @contextlib.contextmanager
+    def phase(self, name):
+        self._stack.append(name)
+        path = tuple(self._stack)
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - started
+            frame = self.frames.setdefault(path, [0.0, 0])
+            frame[0] += elapsed
+            frame[1] += 1
+            self._stack.pop()
+
+    def enter_round(self, round_number):
+        self.close_round()
+        self._round = {
+            "scope": self._stack[0] if self._stack else "",
+            "round_number": round_number,
+            "started": time.perf_counter(),
+            "seconds": 0.0,
+            "ballot_moves": 0,
+            "ballot_papers_moved": 0,
+            "max_fraction_bits": 0,
+        }
+        self.rounds.append(self._round)
+
+    def close_round(self):
+        if self._round is not None:
+            self._round["seconds"] = time.perf_counter() - self._round.pop("started")
+            self._round = None
+
+    def count(self, name, amount=1):
+        self.counters[name] = self.counters.get(name, 0) + amount
+        if self._round is not None and name in self._round:
+            self._round[name] += amount
+
+    def observe_fraction(self, value):
+        if not isinstance(value, Fraction):
+            return
+        bits = value.numerator.bit_length() + value.denominator.bit_length()
+        if bits > self.counters.get("max_fraction_bits", 0):
+            self.counters["max_fraction_bits"] = bits
+        if self._round is not None and bits > self._round["max_fraction_bits"]:
+            self._round["max_fraction_bits"] = bits
+
+    def self_times(self):
+        child_totals = {}
+        for path, (total, _calls) in self.frames.items():
+            if len(path) > 1:
+                parent = path[:-1]
+                child_totals[parent] = child_totals.get(parent, 0.0) + total
+        return {
+            path: max(total - child_totals.get(path, 0.0), 0.0)
+            for path, (total, _calls) in self.frames.items()
+        }
+
+    def to_folded(self):
+        # Brendan Gregg's collapsed-stack format (flamegraph.pl, speedscope,
+        # inferno); sample weights are microseconds of self time.
+        lines = []
+        for path, seconds in sorted(self.self_times().items()):
+            micros = round(seconds * 1_000_000)
+            if micros:
+                lines.append(";".join(frame.replace(";", ",") for frame in path) + f" {micros}")
+        return "\n".join(lines) + "\n"
+
+    def summary(self):
+        phases = [
+            {
+                "path": " › ".join(path),
+                "depth": len(path) - 1,
+                "calls": calls,
+                "ms": total * 1000,
+            }
+            for path, (total, calls) in sorted(self.frames.items())
+        ]
+        rounds = [
+            {**entry, "ms": entry["seconds"] * 1000}
+            for entry in self.rounds
+            if "started" not in entry
+        ]
+        return {"phases": phases, "rounds": rounds, "counters": dict(self.counters)}
+
+
+def active_profiler():
+    return _active_profiler.get() or NULL_PROFILER
+
+
+@contextlib.contextmanager
+def profile_tally(profiler=None):
+    profiler = profiler or TallyProfiler()
+    token = _active_profiler.set(profiler)
+    try:
+        yield profiler
+    finally:
+        profiler.close_round()
+        _active_profiler.reset(token)
@@ -0,0 +1,177 @@
+import threading
+import time
+
+from flask import current_app, g, has_request_context, request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+STATEMENT_BUCKETS = (1, 2, 5, 10, 20, 50, 100)
+DB_TIME_BUCKETS_MS = (1, 5, 10, 25, 50, 100, 250, 1000)
+SLOW_STATEMENT_SQL_LIMIT = 300
+
+_listeners_installed = False
+_install_lock = threading.Lock()
+
+
+def _bucket_index(value, buckets):
+    for index, upper in enumerate(buckets):
+        if value <= upper:
+            return index
+    return len(buckets)
+
+
+class EndpointQueryStats:
+    __slots__ = (
+        "requests",
+        "statements",
+        "db_seconds",
+        "max_statements",
+        "slowest_seconds",
+        "slowest_sql",
+        "statement_histogram",
+        "db_time_histogram",
+    )
+
+    def __init__(self):
+        self.requests = 0
+        self.statements = 0
+        self.db_seconds = 0.0
+        self.max_statements = 0
+        self.slowest_seconds = 0.0
+        self.slowest_sql = None
+        self.statement_histogram = [0] * (len(STATEMENT_BUCKETS) + 1)
+        self.db_time_histogram = [0] * (len(DB_TIME_BUCKETS_MS) + 1)
+
+    def as_dict(self, endpoint):
+        return {
+            "endpoint": endpoint,
+            "requests": self.requests,
+            "statements": self.statements,
+            "avg_statements": self.statements / self.requests if self.requests else 0,
+            "max_statements": self.max_statements,
+            "db_ms": self.db_seconds * 1000,
+            "avg_db_ms": self.db_seconds * 1000 / self.requests if self.requests else 0,
+            "slowest_ms": self.slowest_seconds * 1000,
+            "slowest_sql": self.slowest_sql,
+            "statement_histogram": list(self.statement_histogram),
+            "db_time_histogram": list(self.db_time_histogram),
+        }
+
+
+class QueryStatsRegistry:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._endpoints = {}
+
+    def record(self, endpoint, stats):
+        with self._lock:
+            entry = self._endpoints.get(endpoint)
+            if entry is None:
+                entry = self._endpoints[endpoint] = EndpointQueryStats()
+            entry.requests += 1
+            entry.statements += stats["count"]
+            entry.db_seconds += stats["seconds"]
+            entry.max_statements = max(entry.max_statements, stats["count"])
+            if stats["slowest_seconds"] > entry.slowest_seconds:
+                entry.slowest_seconds = stats["slowest_seconds"]
+                entry.slowest_sql = stats["slowest_sql"]
+            entry.statement_histogram[_bucket_index(stats["count"], STATEMENT_BUCKETS)] += 1
+            entry.db_time_histogram[
+                _bucket_index(stats["seconds"] * 1000, DB_TIME_BUCKETS_MS)
+            ] += 1
+
+    def snapshot(self):
+        with self._lock:
+            rows = [entry.as_dict(endpoint) for endpoint, entry in self._endpoints.items()]
+        rows.sort(key=lambda row: row["db_ms"], reverse=True)
+        return rows
+
+    def reset(self):
+        with self._lock:
+            self._endpoints.clear()
+
+
+def _current_stats():
+    if not has_request_context():
+        return None
+    return g.get("query_stats")
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _current_stats() is not None:
+        conn.info.setdefault("query_stats_started", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = _current_stats()
+    started = conn.info.get("query_stats_started")
+    if stats is None or not started:
+        return
+    elapsed = time.perf_counter() - started.pop()
+    stats["count"] += 1
+    stats["seconds"] += elapsed
+    if elapsed > stats["slowest_seconds"]:
+        stats["slowest_seconds"] = elapsed
+        stats["slowest_sql"] = " ".join(statement.split())[:SLOW_STATEMENT_SQL_LIMIT]
+
+
+def _install_listeners():
+    global _listeners_installed
+    with _install_lock:
+        if _listeners_installed:
+            return
+        event.listen(Engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(Engine, "after_cursor_execute", _after_cursor_execute)
+        _listeners_installed = True
+
+
+def get_query_stats_registry(app=None):
+    app = app or current_app
+    return app.extensions.get("query_stats")
+
+
+def init_query_stats(app):
+    app.config.setdefault("QUERY_STATS_ENABLED", True)
+    app.config.setdefault("QUERY_STATS_HEADER", None)
+    if not app.config["QUERY_STATS_ENABLED"]:
+        return
+
+    _install_listeners()
+    registry = QueryStatsRegistry()
+    app.extensions["query_stats"] = registry
+
+    @app.before_request
+    def start_query_stats():
+        g.query_stats = {
+            "count": 0,
+            "seconds": 0.0,
+            "slowest_seconds": 0.0,
+            "slowest_sql": None,
+        }
+
+    @app.after_request
+    def finish_query_stats(response):
+        stats = g.pop("query_stats", None)
+        if stats is None:
+            return response
+
+        endpoint = request.endpoint or "<unmatched>"
+        if endpoint != "static":
+            registry.record(endpoint, stats)
+
+        show_header = app.config["QUERY_STATS_HEADER"]
+        if show_header is None:
+            show_header = app.debug
+        if show_header:
+            response.headers["X-DB-Statements"] = str(stats["count"])
+            response.headers["X-DB-Time-Ms"] = f"{stats['seconds'] * 1000:.2f}"
+            app.logger.debug(
+                "%s %s: %d statements, %.2f ms in DB, slowest %.2f ms: %s",
+                request.method,
+                endpoint,
+                stats["count"],
+                stats["seconds"] * 1000,
+                stats["slowest_seconds"] * 1000,
+                stats["slowest_sql"],
+            )
+        return response
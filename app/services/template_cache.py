@@ -0,0 +1,31 @@
+import os
+
+from jinja2 import FileSystemBytecodeCache
+
+TEMPLATE_SUFFIXES = (".html", ".txt", ".xml")
+
+
+def init_template_cache(app):
+    # Outside development templates never change under a running worker, so
+    # skip the per-render stat() of the source files.
+    if app.config["TEMPLATES_AUTO_RELOAD"] is None:
+        app.jinja_env.auto_reload = app.debug
+
+    directory = app.config["TEMPLATE_CACHE_DIR"]
+    if not directory:
+        return
+    os.makedirs(directory, exist_ok=True)
+    # Compiled templates are kept as bytecode keyed by a checksum of their
+    # source, so a fresh worker loads them instead of recompiling and an
+    # edited template is simply compiled again.
+    app.jinja_env.bytecode_cache = FileSystemBytecodeCache(directory)
+
+
+def precompile_templates(app):
+    # Loads every template into the environment (and the bytecode cache),
+    # so no request pays for compiling one. Returns the template names.
+    env = app.jinja_env
+    names = [name for name in env.list_templates() if name.endswith(TEMPLATE_SUFFIXES)]
+    for name in names:
+        env.get_template(name)
+    return names
@@ -0,0 +1,147 @@
+import threading
+import time
+from collections import OrderedDict, namedtuple
+
+from flask import current_app
+from sqlalchemy import select, union
+
+from app.extensions import db
+from app.models import (
+    CandidateVote,
+    CumulativeVote,
+    Meeting,
+    Motion,
+    PreferenceVote,
+    ScoreVote,
+    Voter,
+    YesNoVote,
+)
+from app.services.metadata_cache import get_motion_detail, meeting_version
+
+CachedVoter = namedtuple("CachedVoter", "id code name meeting_id")
+CachedMeeting = namedtuple("CachedMeeting", "id title")
+# No status: a voter session lives for VOTER_CACHE_TTL, far too long to
+# decide which motions are open. current_motions() reads it fresh.
+CachedMotion = namedtuple("CachedMotion", "id title type num_winners")
+VoterSession = namedtuple("VoterSession", "voter meeting motions version")
+
+VOTE_MODELS = (YesNoVote, CandidateVote, PreferenceVote, ScoreVote, CumulativeVote)
+
+
+class TTLCache:
+    def __init__(self, max_size, ttl):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] <= now:
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def set(self, key, value):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def pop(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+
+def _cache():
+    cache = current_app.extensions.get("voter_cache")
+    if cache is None:
+        cache = current_app.extensions["voter_cache"] = TTLCache(
+            current_app.config["VOTER_CACHE_SIZE"],
+            current_app.config["VOTER_CACHE_TTL"],
+        )
+    return cache
+
+
+def _load_voter_session(code):
+    row = db.session.execute(
+        select(Voter.id, Voter.code, Voter.name, Voter.meeting_id, Meeting.title)
+        .join(Meeting, Meeting.id == Voter.meeting_id)
+        .where(Voter.code == code)
+    ).first()
+    if row is None:
+        return None
+    version = meeting_version(row.meeting_id)
+
+    motions = tuple(
+        CachedMotion(*motion_row)
+        for motion_row in db.session.execute(
+            select(Motion.id, Motion.title, Motion.type, Motion.num_winners)
+            .where(Motion.meeting_id == row.meeting_id)
+            .order_by(Motion.id)
+        )
+    )
+    return VoterSession(
+        voter=CachedVoter(row.id, row.code, row.name, row.meeting_id),
+        meeting=CachedMeeting(row.meeting_id, row.title),
+        motions=motions,
+        version=version,
+    )
+
+
+def current_motions(voter_session):
+    # The meeting's motions with their status from the metadata cache, which
+    # re-reads it every METADATA_CACHE_STATUS_TTL seconds.
+    motions = [
+        get_motion_detail(motion.id, voter_session.meeting.id) for motion in voter_session.motions
+    ]
+    return [motion for motion in motions if motion is not None]
+
+
+def lookup_voter(code):
+    if not current_app.config["VOTER_CACHE_ENABLED"]:
+        return _load_voter_session(code)
+
+    cache = _cache()
+    voter_session = cache.get(code)
+    if voter_session is not None and voter_session.version != meeting_version(
+        voter_session.meeting.id
+    ):
+        voter_session = None
+    if voter_session is None:
+        # Unknown codes are not cached: a voter may register a moment later.
+        voter_session = _load_voter_session(code)
+        if voter_session is not None:
+            cache.set(code, voter_session)
+    return voter_session
+
+
+def voted_motion_ids(voter_id):
+    query = union(
+        *(
+            select(model.motion_id.label("motion_id")).where(model.voter_id == voter_id)
+            for model in VOTE_MODELS
+        )
+    )
+    return {motion_id for (motion_id,) in db.session.execute(query)}
+
+
+def invalidate_voter(code):
+    _cache().pop(code)
+
@@ -1,5 +1,7 @@
 from app.services.voting.candidate import tally_candidate_election
+from app.services.voting.condorcet import tally_preference_condorcet
 from app.services.voting.cumulative import tally_cumulative_votes
+from app.services.voting.meek import tally_preference_meek
 from app.services.voting.preference import tally_preference_sequential_irv, tally_preference_stv
 from app.services.voting.score import tally_score_votes
 from app.services.voting.yes_no import tally_yes_no_abstain
@@ -7,6 +9,8 @@ from app.services.voting.yes_no import tally_yes_no_abstain
 __all__ = [
     "tally_candidate_election",
     "tally_cumulative_votes",
+    "tally_preference_condorcet",
+    "tally_preference_meek",
     "tally_preference_sequential_irv",
     "tally_preference_stv",
     "tally_score_votes",
@@ -0,0 +1,89 @@
+from collections import namedtuple
+
+from app.services.voting.preference import group_ballots, parse_ballots_for_motion
+
+BallotFileCandidate = namedtuple("BallotFileCandidate", ["id", "text"])
+
+
+def _quote(text):
+    return '"' + (text or "").replace('"', "'") + '"'
+
+
+def write_blt(motion, stream):
+    valid_ballots, _informal_ballots = parse_ballots_for_motion(motion)
+    options = sorted(motion.options, key=lambda option: option.id)
+    index_by_option_id = {option.id: index for index, option in enumerate(options, start=1)}
+
+    stream.write(f"{len(options)} {motion.num_winners or 1}\n")
+    for preferences, weight in group_ballots(
+        [ballot["preferences"] for ballot in valid_ballots]
+    ):
+        ranking = " ".join(str(index_by_option_id[option_id]) for option_id in preferences)
+        stream.write(f"{weight} {ranking} 0\n")
+    stream.write("0\n")
+    for option in options:
+        stream.write(_quote(option.text) + "\n")
+    stream.write(_quote(motion.title) + "\n")
+    return len(valid_ballots)
+
+
+def _tokens(stream):
+    for line in stream:
+        line = line.split("#", 1)[0].strip()
+        if line:
+            yield line
+
+
+def read_blt(stream):
+    lines = _tokens(stream)
+    try:
+        header = next(lines).split()
+        num_candidates, num_seats = int(header[0]), int(header[1])
+    except (StopIteration, IndexError, ValueError):
+        raise ValueError("Ballot file must start with '<candidates> <seats>'.")
+
+    withdrawn = set()
+    ballots = []
+    for line in lines:
+        fields = line.split()
+        if fields == ["0"]:
+            break
+        if fields[0].startswith("-"):
+            withdrawn.update(-int(field) for field in fields)
+            continue
+        if "=" in line:
+            raise ValueError("Equal preferences are not supported in ballot files.")
+        try:
+            weight = int(fields[0])
+            ranking = [int(field) for field in fields[1:]]
+        except ValueError:
+            raise ValueError(f"Invalid ballot line: {line!r}")
+        if not ranking or ranking[-1] != 0:
+            raise ValueError(f"Ballot line must end with 0: {line!r}")
+        preferences = [
+            candidate
+            for candidate in ranking[:-1]
+            if candidate not in withdrawn
+        ]
+        if any(candidate < 1 or candidate > num_candidates for candidate in preferences):
+            raise ValueError(f"Ballot line names an unknown candidate: {line!r}")
+        if preferences:
+            ballots.extend([preferences] * weight)
+    else:
+        raise ValueError("Ballot file is missing the '0' end-of-ballots marker.")
+
+    names = [line.strip().strip('"') for line in lines]
+    if len(names) < num_candidates:
+        raise ValueError("Ballot file lists fewer candidate names than declared.")
+
+    options_by_id = {
+        index: BallotFileCandidate(index, names[index - 1])
+        for index in range(1, num_candidates + 1)
+        if index not in withdrawn
+    }
+    return {
+        "title": names[num_candidates] if len(names) > num_candidates else "",
+        "num_seats": num_seats,
+        "options_by_id": options_by_id,
+        "ballots": ballots,
+    }
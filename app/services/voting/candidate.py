@@ -1,3 +1,7 @@
+from app.services.metrics import timed_tally
+
+
+@timed_tally("fptp")
 def tally_candidate_election(motion):
     options_by_id = {option.id: option for option in motion.options}
     option_counts = {option_id: 0 for option_id in options_by_id}
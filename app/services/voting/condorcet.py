@@ -0,0 +1,280 @@
+from app.services.metrics import timed_tally
+from app.services.profiling import active_profiler
+from app.services.voting.preference import group_ballots, parse_ballots_for_motion
+
+_NOT_LOADED = object()
+np = _NOT_LOADED
+
+
+def _numpy():
+    # numpy is optional and slow to import, so it is loaded on the first
+    # count that needs it rather than at app start.
+    global np
+    if np is _NOT_LOADED:
+        try:
+            import numpy
+        except ImportError:
+            numpy = None
+        np = numpy
+    return np
+
+METHOD_STV = "STV"
+METHOD_SCHULZE = "SCHULZE"
+METHOD_RANKED_PAIRS = "RANKED_PAIRS"
+PREFERENCE_METHODS = (METHOD_STV, METHOD_SCHULZE, METHOD_RANKED_PAIRS)
+CONDORCET_METHODS = (METHOD_SCHULZE, METHOD_RANKED_PAIRS)
+
+
+def _pairwise_matrix_python(groups, num_candidates):
+    matrix = [[0] * num_candidates for _ in range(num_candidates)]
+    everyone = range(num_candidates)
+    for ranking, weight in groups:
+        beaten = set(everyone)
+        for index in ranking:
+            beaten.discard(index)
+            row = matrix[index]
+            for other in beaten:
+                row[other] += weight
+    return matrix
+
+
+def _pairwise_matrix_numpy(groups, num_candidates):
+    lengths = np.fromiter((len(ranking) for ranking, _ in groups), dtype=np.int64)
+    weights = np.fromiter((weight for _, weight in groups), dtype=np.float64)
+    max_length = int(lengths.max())
+    rankings = np.zeros((len(groups), max_length), dtype=np.int64)
+    for row, (ranking, _weight) in enumerate(groups):
+        rankings[row, : len(ranking)] = ranking
+
+    # A ranked candidate beats every unranked one: one matrix product.
+    ranked = np.zeros((len(groups), num_candidates))
+    for position in range(max_length):
+        rows = np.nonzero(lengths > position)[0]
+        ranked[rows, rankings[rows, position]] = 1.0
+    matrix = (ranked * weights[:, None]).T @ (1.0 - ranked)
+
+    # Ranked pairs are counted position against position with bincount.
+    for later in range(1, max_length):
+        rows = np.nonzero(lengths > later)[0]
+        later_ids = rankings[rows, later]
+        pair_ids = np.concatenate(
+            [rankings[rows, earlier] * num_candidates + later_ids for earlier in range(later)]
+        )
+        matrix += np.bincount(
+            pair_ids,
+            weights=np.tile(weights[rows], later),
+            minlength=num_candidates * num_candidates,
+        ).reshape(num_candidates, num_candidates)
+
+    return np.rint(matrix).astype(np.int64).tolist()
+
+
+def build_pairwise_matrix(valid_ballot_preferences, option_ids):
+    index_by_option_id = {option_id: index for index, option_id in enumerate(option_ids)}
+    groups = [
+        (tuple(index_by_option_id[option_id] for option_id in preferences), weight)
+        for preferences, weight in group_ballots(valid_ballot_preferences)
+    ]
+    if _numpy() is not None and groups:
+        return _pairwise_matrix_numpy(groups, len(option_ids))
+    return _pairwise_matrix_python(groups, len(option_ids))
+
+
+def _strongest_paths_numpy(matrix):
+    pairwise = np.array(matrix, dtype=np.int64)
+    paths = np.where(pairwise > pairwise.T, pairwise, 0)
+    for k in range(len(matrix)):
+        paths = np.maximum(paths, np.minimum(paths[:, k : k + 1], paths[k : k + 1, :]))
+    np.fill_diagonal(paths, 0)
+    return paths.tolist()
+
+
+def strongest_paths(matrix):
+    if _numpy() is not None and matrix:
+        return _strongest_paths_numpy(matrix)
+
+    size = len(matrix)
+    paths = [
+        [
+            matrix[i][j] if i != j and matrix[i][j] > matrix[j][i] else 0
+            for j in range(size)
+        ]
+        for i in range(size)
+    ]
+    for k in range(size):
+        path_k = paths[k]
+        for i in range(size):
+            if i == k:
+                continue
+            through_k = paths[i][k]
+            if not through_k:
+                continue
+            row = paths[i]
+            for j in range(size):
+                if j != i and j != k:
+                    candidate = through_k if through_k < path_k[j] else path_k[j]
+                    if candidate > row[j]:
+                        row[j] = candidate
+    return paths
+
+
+def _schulze_beats(matrix):
+    paths = strongest_paths(matrix)
+    size = len(matrix)
+    return [[paths[i][j] > paths[j][i] for j in range(size)] for i in range(size)]
+
+
+def _reachable(locked, start):
+    stack = [start]
+    seen = {start}
+    while stack:
+        node = stack.pop()
+        for nxt in locked[node]:
+            if nxt not in seen:
+                seen.add(nxt)
+                stack.append(nxt)
+    return seen
+
+
+def _ranked_pairs_beats(matrix):
+    size = len(matrix)
+    majorities = [
+        (matrix[i][j], matrix[j][i], i, j)
+        for i in range(size)
+        for j in range(size)
+        if matrix[i][j] > matrix[j][i]
+    ]
+    # Strongest win first; a smaller opposing vote breaks equal wins, and
+    # option order settles anything left so the lock order is deterministic.
+    majorities.sort(key=lambda pair: (-pair[0], pair[1], pair[2], pair[3]))
+
+    locked = [set() for _ in range(size)]
+    for _winning, _losing, i, j in majorities:
+        if i not in _reachable(locked, j):
+            locked[i].add(j)
+
+    beats = []
+    for i in range(size):
+        reachable = _reachable(locked, i)
+        beats.append([j != i and j in reachable for j in range(size)])
+    return beats
+
+
+def _rank_from_beats(beats):
+    size = len(beats)
+    remaining = set(range(size))
+    tiers = []
+    while remaining:
+        tier = sorted(
+            index
+            for index in remaining
+            if not any(beats[other][index] for other in remaining if other != index)
+        )
+        if not tier:
+            tier = sorted(remaining)
+        tiers.append(tier)
+        remaining.difference_update(tier)
+    return tiers
+
+
+def count_condorcet(valid_ballot_preferences, num_seats, options_by_id, method=METHOD_SCHULZE):
+    if method not in CONDORCET_METHODS:
+        raise ValueError(f"Unknown Condorcet method: {method}")
+
+    if num_seats < 1:
+        num_seats = 1
+
+    profiler = active_profiler()
+    option_ids = sorted(options_by_id)
+    with profiler.phase("pairwise_matrix"):
+        matrix = build_pairwise_matrix(valid_ballot_preferences, option_ids)
+    size = len(option_ids)
+
+    condorcet_winner = None
+    for i in range(size):
+        if all(matrix[i][j] > matrix[j][i] for j in range(size) if j != i):
+            condorcet_winner = options_by_id[option_ids[i]]
+            break
+
+    with profiler.phase("strongest_paths" if method == METHOD_SCHULZE else "lock_pairs"):
+        if method == METHOD_RANKED_PAIRS:
+            beats = _ranked_pairs_beats(matrix)
+        else:
+            beats = _schulze_beats(matrix)
+
+    tiers = _rank_from_beats(beats) if valid_ballot_preferences else []
+
+    ranking = []
+    winners = []
+    is_tie = False
+    for position, tier in enumerate(tiers, start=1):
+        for index in tier:
+            ranking.append(
+                {
+                    "position": position,
+                    "option": options_by_id[option_ids[index]],
+                    "pairwise_wins": sum(
+                        1 for j in range(size) if matrix[index][j] > matrix[j][index]
+                    ),
+                }
+            )
+        open_seats = num_seats - len(winners)
+        if open_seats <= 0:
+            continue
+        if len(tier) > open_seats:
+            is_tie = True
+        winners.extend(options_by_id[option_ids[index]] for index in tier)
+
+    matrix_rows = []
+    for i, option_id in enumerate(option_ids):
+        matrix_rows.append(
+            {
+                "option": options_by_id[option_id],
+                "cells": [
+                    {
+                        "option": options_by_id[other_id],
+                        "count": matrix[i][j],
+                        "is_self": i == j,
+                        "wins": i != j and matrix[i][j] > matrix[j][i],
+                    }
+                    for j, other_id in enumerate(option_ids)
+                ],
+            }
+        )
+
+    return {
+        "method": method,
+        "winners": winners,
+        "is_tie": is_tie,
+        "condorcet_winner": condorcet_winner,
+        "ranking": ranking,
+        "matrix": matrix,
+        "matrix_rows": matrix_rows,
+    }
+
+
+@timed_tally("condorcet")
+def tally_preference_condorcet(motion, method=METHOD_SCHULZE):
+    with active_profiler().phase("parse_ballots"):
+        valid_ballots, informal_ballots = parse_ballots_for_motion(motion)
+    options_by_id = {option.id: option for option in motion.options}
+    num_seats = motion.num_winners or 1
+
+    result = count_condorcet(
+        [ballot["preferences"] for ballot in valid_ballots],
+        num_seats,
+        options_by_id,
+        method=method,
+    )
+
+    return {
+        "method": result["method"],
+        "winners": result["winners"],
+        "is_tie": result["is_tie"],
+        "condorcet_winner": result["condorcet_winner"],
+        "num_winners": num_seats,
+        "total_ballots": len(valid_ballots),
+        "ranking": result["ranking"],
+        "matrix_rows": result["matrix_rows"],
+        "informal_ballots": informal_ballots,
+    }
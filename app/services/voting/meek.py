@@ -0,0 +1,354 @@
+import random
+
+from app.services.metrics import timed_tally
+from app.services.profiling import active_profiler
+from app.services.voting.preference import (
+    QUOTA_DROOP,
+    QUOTA_HARE,
+    QUOTA_RULES,
+    STATUS_CONTINUING,
+    STATUS_ELECTED,
+    STATUS_ELIMINATED,
+    _CandidateState,
+    _hopeless_candidates,
+    _pick_elimination_loser,
+    _snapshot_round,
+    format_tally,
+    group_ballots,
+    motion_rng,
+    parse_ballots_for_motion,
+)
+
+TRANSFER_MEEK = "meek"
+DEFAULT_TOLERANCE = 1e-6
+MAX_ITERATIONS = 1000
+# Tallies are recorded at nine decimal places, as in the New Zealand Meek
+# rules, so that float noise does not hide genuine ties. The Droop quota is
+# lifted by one unit of that precision so an exact half cannot elect two.
+TALLY_PRECISION = 9
+QUOTA_MARGIN = 10 ** -TALLY_PRECISION
+
+
+def _meek_tallies(groups, keep_values, num_candidates):
+    votes = [0.0] * num_candidates
+    exhausted = 0.0
+    for preferences, weight in groups:
+        remaining = weight
+        for index in preferences:
+            keep = keep_values[index]
+            if keep:
+                votes[index] += remaining * keep
+                remaining *= 1.0 - keep
+                if remaining <= 0.0:
+                    break
+        exhausted += remaining
+    return votes, exhausted
+
+
+def _converge(
+    groups,
+    keep_values,
+    candidates,
+    index_by_option_id,
+    num_ballots,
+    divisor,
+    margin,
+    tolerance,
+):
+    elected = [
+        index_by_option_id[candidate.option_id]
+        for candidate in candidates.values()
+        if candidate.status == STATUS_ELECTED
+    ]
+    hopeful = [
+        index_by_option_id[candidate.option_id]
+        for candidate in candidates.values()
+        if candidate.status == STATUS_CONTINUING
+    ]
+
+    iterations = 0
+    while True:
+        iterations += 1
+        votes, exhausted = _meek_tallies(groups, keep_values, len(keep_values))
+        quota = (num_ballots - exhausted) / divisor + margin
+        surplus = sum(max(votes[index] - quota, 0.0) for index in elected)
+        if surplus <= tolerance or any(votes[index] >= quota for index in hopeful):
+            return votes, quota, iterations, True
+        if iterations >= MAX_ITERATIONS:
+            return votes, quota, iterations, False
+        for index in elected:
+            if votes[index] > 0:
+                keep_values[index] = min(keep_values[index] * quota / votes[index], 1.0)
+
+
+def count_meek_stv(
+    valid_ballot_preferences,
+    num_seats,
+    options_by_id,
+    rng=None,
+    quota_rule=QUOTA_DROOP,
+    tolerance=DEFAULT_TOLERANCE,
+    bulk_exclusion=False,
+):
+    profiler = active_profiler()
+    try:
+        return _count_meek_stv(
+            valid_ballot_preferences,
+            num_seats,
+            options_by_id,
+            rng,
+            quota_rule,
+            tolerance,
+            bulk_exclusion,
+            profiler,
+        )
+    finally:
+        profiler.close_round()
+
+
+def _count_meek_stv(
+    valid_ballot_preferences,
+    num_seats,
+    options_by_id,
+    rng,
+    quota_rule,
+    tolerance,
+    bulk_exclusion,
+    profiler,
+):
+    rng = rng or random.Random()
+    round_logs = []
+    rounds = []
+    lot_draws = []
+
+    if quota_rule not in QUOTA_RULES:
+        raise ValueError(f"Unknown quota rule: {quota_rule}")
+
+    if num_seats < 1:
+        num_seats = 1
+
+    num_ballots = len(valid_ballot_preferences)
+    if num_ballots == 0:
+        return {
+            "winners": [],
+            "quota": 0,
+            "rounds": rounds,
+            "round_logs": round_logs,
+            "seats_filled": 0,
+            "iterations": 0,
+            "converged": True,
+            "lot_draws": lot_draws,
+        }
+
+    option_ids = sorted(options_by_id)
+    index_by_option_id = {option_id: index for index, option_id in enumerate(option_ids)}
+    candidates = {option_id: _CandidateState(option_id) for option_id in option_ids}
+    groups = [
+        (tuple(index_by_option_id[option_id] for option_id in preferences), float(weight))
+        for preferences, weight in group_ballots(valid_ballot_preferences)
+    ]
+    keep_values = [1.0] * len(option_ids)
+    if quota_rule == QUOTA_HARE:
+        divisor, margin = num_seats, 0.0
+        quota_formula = f"(N - exhausted) / {divisor}"
+    else:
+        divisor, margin = num_seats + 1, QUOTA_MARGIN
+        quota_formula = f"(N - exhausted) / {divisor} + {QUOTA_MARGIN:g}"
+
+    round_logs.append(
+        f"Valid ballots (N) = {num_ballots}. Seats to fill (n) = {num_seats}. "
+        f"Meek quota = {quota_formula}, recomputed each iteration "
+        f"to a tolerance of {tolerance:g}."
+    )
+
+    round_number = 0
+    seats_filled = 0
+    total_iterations = 0
+    converged = True
+
+    while True:
+        round_number += 1
+        profiler.enter_round(round_number)
+        with profiler.phase("converge"):
+            votes, quota, iterations, round_converged = _converge(
+                groups,
+                keep_values,
+                candidates,
+                index_by_option_id,
+                num_ballots,
+                divisor,
+                margin,
+                tolerance,
+            )
+        total_iterations += iterations
+        profiler.count("meek_iterations", iterations)
+        quota = round(quota, TALLY_PRECISION)
+
+        tallies = {}
+        for option_id, candidate in candidates.items():
+            tally = round(votes[index_by_option_id[option_id]], TALLY_PRECISION)
+            tallies[option_id] = tally
+            candidate.tally_history.append(tally)
+        rounds.append(_snapshot_round(candidates, options_by_id, round_number, quota))
+
+        if not round_converged:
+            # The count carries on with the last keep values, but the result
+            # is flagged so it is not mistaken for a converged one.
+            converged = False
+            profiler.count("meek_unconverged_rounds", 1)
+            round_logs.append(
+                f"Keep values did not converge to a tolerance of {tolerance:g} "
+                f"within {MAX_ITERATIONS} iterations."
+            )
+        elif iterations > 1:
+            round_logs.append(f"Keep values converged after {iterations} iterations.")
+
+        if seats_filled == num_seats:
+            round_logs.append("All seats filled. Count complete.")
+            break
+
+        continuing = [
+            candidate
+            for candidate in candidates.values()
+            if candidate.status == STATUS_CONTINUING
+        ]
+        unfilled_seats = num_seats - seats_filled
+
+        if len(continuing) <= unfilled_seats:
+            for candidate in continuing:
+                candidate.status = STATUS_ELECTED
+                candidate.elected_round = round_number
+                seats_filled += 1
+                round_logs.append(
+                    f"{options_by_id[candidate.option_id].text} is elected "
+                    f"(remaining continuing candidates equal unfilled seats)."
+                )
+            rounds.append(_snapshot_round(candidates, options_by_id, round_number, quota))
+            round_logs.append("All seats filled. Count complete.")
+            break
+
+        newly_elected = [
+            candidate
+            for candidate in continuing
+            if tallies[candidate.option_id] >= quota
+        ]
+        newly_elected.sort(
+            key=lambda candidate: tallies[candidate.option_id],
+            reverse=True,
+        )
+
+        if newly_elected:
+            for candidate in newly_elected[:unfilled_seats]:
+                candidate.status = STATUS_ELECTED
+                candidate.elected_round = round_number
+                seats_filled += 1
+                round_logs.append(
+                    f"{options_by_id[candidate.option_id].text} is elected with "
+                    f"tally {format_tally(tallies[candidate.option_id])} "
+                    f"(quota {format_tally(quota)})."
+                )
+            continue
+
+        if bulk_exclusion:
+            hopeless = _hopeless_candidates(continuing, tallies, unfilled_seats)
+            if len(hopeless) > 1:
+                for candidate in hopeless:
+                    candidate.status = STATUS_ELIMINATED
+                    candidate.eliminated_round = round_number
+                    keep_values[index_by_option_id[candidate.option_id]] = 0.0
+                next_lowest = min(
+                    (
+                        candidate
+                        for candidate in continuing
+                        if candidate.status == STATUS_CONTINUING
+                    ),
+                    key=lambda candidate: (tallies[candidate.option_id], candidate.option_id),
+                )
+                names = ", ".join(
+                    options_by_id[candidate.option_id].text for candidate in hopeless
+                )
+                combined = sum(tallies[candidate.option_id] for candidate in hopeless)
+                round_logs.append(
+                    f"{names} are eliminated together: their combined tally "
+                    f"({format_tally(combined)}) cannot overtake "
+                    f"{options_by_id[next_lowest.option_id].text} "
+                    f"({format_tally(tallies[next_lowest.option_id])})."
+                )
+                continue
+
+        min_tally = min(tallies[candidate.option_id] for candidate in continuing)
+        lowest = [
+            candidate.option_id
+            for candidate in continuing
+            if tallies[candidate.option_id] == min_tally
+        ]
+        loser_id = _pick_elimination_loser(
+            lowest,
+            candidates,
+            options_by_id,
+            round_logs,
+            rng,
+            lot_draws,
+            round_number,
+        )
+        loser = candidates[loser_id]
+        loser.status = STATUS_ELIMINATED
+        loser.eliminated_round = round_number
+        keep_values[index_by_option_id[loser_id]] = 0.0
+        round_logs.append(
+            f"{options_by_id[loser_id].text} is eliminated with the lowest tally "
+            f"({format_tally(min_tally)})."
+        )
+
+    winner_ids = [
+        candidate.option_id
+        for candidate in candidates.values()
+        if candidate.status == STATUS_ELECTED
+    ]
+    winner_ids.sort(
+        key=lambda option_id: (
+            candidates[option_id].elected_round or 0,
+            option_id,
+        )
+    )
+
+    return {
+        "winners": [options_by_id[option_id] for option_id in winner_ids],
+        "quota": quota,
+        "rounds": rounds,
+        "round_logs": round_logs,
+        "seats_filled": seats_filled,
+        "iterations": total_iterations,
+        "converged": converged,
+        "lot_draws": lot_draws,
+    }
+
+
+@timed_tally("meek")
+def tally_preference_meek(motion, rng=None, tolerance=DEFAULT_TOLERANCE):
+    with active_profiler().phase("parse_ballots"):
+        valid_ballots, informal_ballots = parse_ballots_for_motion(motion)
+    options_by_id = {option.id: option for option in motion.options}
+    num_seats = motion.num_winners or 1
+
+    meek_result = count_meek_stv(
+        [ballot["preferences"] for ballot in valid_ballots],
+        num_seats,
+        options_by_id,
+        rng=rng or motion_rng(motion),
+        tolerance=tolerance,
+    )
+
+    return {
+        "winners": meek_result["winners"],
+        "num_winners": num_seats,
+        "total_ballots": len(valid_ballots),
+        "quota": meek_result["quota"],
+        "rounds": meek_result["rounds"],
+        "round_logs": meek_result["round_logs"],
+        "informal_ballots": informal_ballots,
+        "seats_filled": meek_result["seats_filled"],
+        "tie_break_seed": motion.tally_seed,
+        "converged": meek_result["converged"],
+        "lot_draws": meek_result["lot_draws"],
+    }
@@ -1,15 +1,26 @@
 import random
 from fractions import Fraction
 
+from app.services.metrics import timed_tally
+from app.services.profiling import active_profiler
+
 STATUS_CONTINUING = "continuing"
 STATUS_ELECTED = "elected"
 STATUS_ELIMINATED = "eliminated"
 
+QUOTA_DROOP = "droop"
+QUOTA_HARE = "hare"
+QUOTA_RULES = (QUOTA_DROOP, QUOTA_HARE)
+
+TRANSFER_WIG = "wig"
+TRANSFER_GREGORY = "gregory"
+TRANSFER_RULES = (TRANSFER_WIG, TRANSFER_GREGORY)
+
 
 def format_tally(value):
-    if isinstance(value, Fraction):
-        if value.denominator == 1:
-            return str(value.numerator)
+    if isinstance(value, Fraction) and value.denominator == 1:
+        return str(value.numerator)
+    if isinstance(value, (Fraction, float)):
         return f"{float(value):.6f}".rstrip("0").rstrip(".")
     return str(value)
 
@@ -101,10 +112,17 @@ def build_ballots_for_motion(motion):
 
 
 class _STVBallot:
-    __slots__ = ("preferences", "transfer_value", "active_preference", "exhausted")
+    __slots__ = (
+        "preferences",
+        "weight",
+        "transfer_value",
+        "active_preference",
+        "exhausted",
+    )
 
-    def __init__(self, preferences):
+    def __init__(self, preferences, weight=1):
         self.preferences = preferences
+        self.weight = weight
         self.transfer_value = Fraction(1, 1)
         self.active_preference = 0
         self.exhausted = False
@@ -115,6 +133,8 @@ class _CandidateState:
         "option_id",
         "status",
         "pile",
+        "last_parcel",
+        "tally",
         "tally_history",
         "elected_round",
         "eliminated_round",
@@ -124,6 +144,8 @@ class _CandidateState:
         self.option_id = option_id
         self.status = STATUS_CONTINUING
         self.pile = []
+        self.last_parcel = []
+        self.tally = Fraction(0, 1)
         self.tally_history = []
         self.elected_round = None
         self.eliminated_round = None
@@ -133,17 +155,82 @@ def _dropp_quota(num_ballots, num_seats):
     return num_ballots // (num_seats + 1) + 1
 
 
-def _compute_tallies(candidates):
+def _hare_quota(num_ballots, num_seats):
+    quota = Fraction(num_ballots, num_seats)
+    return quota.numerator if quota.denominator == 1 else quota
+
+
+def _quota_log(quota_rule, num_ballots, num_seats, quota):
+    if quota_rule == QUOTA_HARE:
+        return f"Hare quota = {num_ballots} / {num_seats} = {format_tally(quota)}."
+    return f"Droop quota = floor({num_ballots} / {num_seats + 1}) + 1 = {quota}."
+
+
+def group_ballots(valid_ballot_preferences):
+    weights = {}
+    for preferences in valid_ballot_preferences:
+        key = tuple(preferences)
+        weights[key] = weights.get(key, 0) + 1
+    return list(weights.items())
+
+
+def _pile_value(ballots):
+    # Identical transfer values are summed as integers first so a pile of
+    # 100k ballots costs a handful of Fraction operations, not 100k of them.
+    weights_by_value = {}
+    for ballot in ballots:
+        value = ballot.transfer_value
+        weights_by_value[value] = weights_by_value.get(value, 0) + ballot.weight
+    return sum(
+        (value * weight for value, weight in weights_by_value.items()),
+        Fraction(0, 1),
+    )
+
+
+def _compute_tallies(candidates, profiler):
     tallies = {}
     for candidate in candidates.values():
-        tally = Fraction(0, 1)
-        for ballot in candidate.pile:
-            tally += ballot.transfer_value
-        tallies[candidate.option_id] = tally
-        candidate.tally_history.append(tally)
+        tallies[candidate.option_id] = candidate.tally
+        candidate.tally_history.append(candidate.tally)
+        profiler.observe_fraction(candidate.tally)
     return tallies
 
 
+def _distribute(ballots, candidates):
+    profiler = active_profiler()
+    if profiler.enabled:
+        with profiler.phase("distribute"):
+            _distribute_ballots(ballots, candidates)
+        profiler.count("ballot_moves", len(ballots))
+        profiler.count("ballot_papers_moved", sum(ballot.weight for ballot in ballots))
+        return
+    _distribute_ballots(ballots, candidates)
+
+
+def _distribute_ballots(ballots, candidates):
+    parcels = {}
+    for ballot in ballots:
+        next_candidate = _next_continuing(ballot, candidates)
+        if next_candidate is None:
+            ballot.exhausted = True
+        else:
+            next_candidate.pile.append(ballot)
+            parcels.setdefault(next_candidate.option_id, []).append(ballot)
+
+    for option_id, parcel in parcels.items():
+        candidate = candidates[option_id]
+        candidate.tally += _pile_value(parcel)
+        candidate.last_parcel = parcel
+
+
+def _clear_pile(candidate):
+    pile = candidate.pile
+    candidate.pile = []
+    candidate.last_parcel = []
+    candidate.tally = Fraction(0, 1)
+    return pile
+
+
 def _next_continuing(ballot, candidates):
     while ballot.active_preference < len(ballot.preferences):
         option_id = ballot.preferences[ballot.active_preference]
@@ -178,7 +265,34 @@ def _snapshot_round(candidates, options_by_id, round_number, quota):
     }
 
 
-def _pick_elimination_loser(tied_ids, candidates, options_by_id, round_logs, rng):
+def _hopeless_candidates(continuing, tallies, unfilled_seats):
+    ordered = sorted(
+        continuing,
+        key=lambda candidate: (tallies[candidate.option_id], candidate.option_id),
+    )
+    max_excluded = len(ordered) - unfilled_seats
+    hopeless = []
+    running_total = Fraction(0, 1)
+    for index in range(max_excluded):
+        running_total += tallies[ordered[index].option_id]
+        if running_total < tallies[ordered[index + 1].option_id]:
+            hopeless = ordered[: index + 1]
+    return hopeless
+
+
+def motion_rng(motion):
+    return random.Random(motion.tally_seed) if motion.tally_seed else random.Random()
+
+
+def _pick_elimination_loser(
+    tied_ids,
+    candidates,
+    options_by_id,
+    round_logs,
+    rng,
+    lot_draws=None,
+    round_number=None,
+):
     if len(tied_ids) == 1:
         return tied_ids[0]
 
@@ -198,6 +312,15 @@ def _pick_elimination_loser(tied_ids, candidates, options_by_id, round_logs, rng
             return loser
 
     loser = rng.choice(sorted(tied_ids))
+    if lot_draws is not None:
+        lot_draws.append(
+            {
+                "kind": "elimination",
+                "round_number": round_number,
+                "candidates": sorted(tied_ids),
+                "selected": [loser],
+            }
+        )
     round_logs.append(
         f"Tie for elimination among {names} could not be resolved by prior tallies. "
         f"{options_by_id[loser].text} was selected by lot."
@@ -205,26 +328,81 @@ def _pick_elimination_loser(tied_ids, candidates, options_by_id, round_logs, rng
     return loser
 
 
-def count_stv(valid_ballot_preferences, num_seats, options_by_id, rng=None):
+def count_stv(
+    valid_ballot_preferences,
+    num_seats,
+    options_by_id,
+    rng=None,
+    quota_rule=QUOTA_DROOP,
+    transfer_rule=TRANSFER_WIG,
+    bulk_exclusion=False,
+):
+    profiler = active_profiler()
+    with profiler.phase("count_stv"):
+        try:
+            return _count_stv(
+                valid_ballot_preferences,
+                num_seats,
+                options_by_id,
+                rng,
+                quota_rule,
+                transfer_rule,
+                bulk_exclusion,
+                profiler,
+            )
+        finally:
+            profiler.close_round()
+
+
+def _count_stv(
+    valid_ballot_preferences,
+    num_seats,
+    options_by_id,
+    rng,
+    quota_rule,
+    transfer_rule,
+    bulk_exclusion,
+    profiler,
+):
     rng = rng or random.Random()
     round_logs = []
     rounds = []
+    lot_draws = []
+
+    if quota_rule not in QUOTA_RULES:
+        raise ValueError(f"Unknown quota rule: {quota_rule}")
+    if transfer_rule not in TRANSFER_RULES:
+        raise ValueError(f"Unknown transfer rule: {transfer_rule}")
 
     if num_seats < 1:
         num_seats = 1
 
     num_ballots = len(valid_ballot_preferences)
-    quota = _dropp_quota(num_ballots, num_seats) if num_ballots else 0
+    if not num_ballots:
+        quota = 0
+    elif quota_rule == QUOTA_HARE:
+        quota = _hare_quota(num_ballots, num_seats)
+    else:
+        quota = _dropp_quota(num_ballots, num_seats)
 
     candidates = {
         option_id: _CandidateState(option_id) for option_id in options_by_id
     }
-    ballots = [_STVBallot(preferences) for preferences in valid_ballot_preferences]
+    with profiler.phase("group_ballots"):
+        ballots = [
+            _STVBallot(list(preferences), weight)
+            for preferences, weight in group_ballots(valid_ballot_preferences)
+        ]
 
-    for ballot in ballots:
-        option_id = ballot.preferences[0]
-        ballot.active_preference = 1
-        candidates[option_id].pile.append(ballot)
+    with profiler.phase("first_preferences"):
+        for ballot in ballots:
+            candidate = candidates[ballot.preferences[0]]
+            ballot.active_preference = 1
+            candidate.pile.append(ballot)
+            candidate.tally += ballot.weight
+
+        for candidate in candidates.values():
+            candidate.last_parcel = list(candidate.pile)
 
     round_number = 0
     seats_filled = 0
@@ -237,17 +415,21 @@ def count_stv(valid_ballot_preferences, num_seats, options_by_id, rng=None):
             "rounds": rounds,
             "round_logs": round_logs,
             "seats_filled": 0,
+            "lot_draws": lot_draws,
         }
 
     round_logs.append(
         f"Valid ballots (N) = {num_ballots}. Seats to fill (n) = {num_seats}. "
-        f"Droop quota = floor({num_ballots} / {num_seats + 1}) + 1 = {quota}."
+        + _quota_log(quota_rule, num_ballots, num_seats, quota)
     )
 
     while True:
         round_number += 1
-        tallies = _compute_tallies(candidates)
-        rounds.append(_snapshot_round(candidates, options_by_id, round_number, quota))
+        profiler.enter_round(round_number)
+        with profiler.phase("compute_tallies"):
+            tallies = _compute_tallies(candidates, profiler)
+        with profiler.phase("snapshot_round"):
+            rounds.append(_snapshot_round(candidates, options_by_id, round_number, quota))
 
         if seats_filled == num_seats:
             round_logs.append("All seats filled. Count complete.")
@@ -289,6 +471,16 @@ def count_stv(valid_ballot_preferences, num_seats, options_by_id, rng=None):
                     options_by_id[item["candidate"].option_id].text for item in next_group
                 )
                 rng.shuffle(next_group)
+                lot_draws.append(
+                    {
+                        "kind": "surplus_order",
+                        "round_number": round_number,
+                        "candidates": sorted(
+                            item["candidate"].option_id for item in next_group
+                        ),
+                        "selected": [item["candidate"].option_id for item in next_group],
+                    }
+                )
                 round_logs.append(
                     f"Tie for surplus distribution order among {names}. Order determined by lot."
                 )
@@ -298,22 +490,35 @@ def count_stv(valid_ballot_preferences, num_seats, options_by_id, rng=None):
             candidate = item["candidate"]
             surplus = item["surplus"]
             tally = item["tally_at_election"]
-            ratio = surplus / tally
-            pile = list(candidate.pile)
-            candidate.pile.clear()
-
-            for ballot in pile:
-                ballot.transfer_value *= ratio
-                next_candidate = _next_continuing(ballot, candidates)
-                if next_candidate is None:
-                    ballot.exhausted = True
-                else:
-                    next_candidate.pile.append(ballot)
-
-            round_logs.append(
-                f"Surplus from {options_by_id[candidate.option_id].text} distributed "
-                f"at transfer ratio {format_tally(ratio)}."
-            )
+            if transfer_rule == TRANSFER_GREGORY:
+                # Only the last parcel received carries the surplus onwards.
+                transferable = list(candidate.last_parcel)
+                ratio = min(surplus / _pile_value(transferable), Fraction(1, 1))
+            else:
+                transferable = list(candidate.pile)
+                ratio = surplus / tally
+            _clear_pile(candidate)
+
+            with profiler.phase("transfer_surplus"):
+                new_values = {}
+                for ballot in transferable:
+                    value = ballot.transfer_value
+                    if value not in new_values:
+                        new_values[value] = value * ratio
+                        profiler.observe_fraction(new_values[value])
+                    ballot.transfer_value = new_values[value]
+                _distribute(transferable, candidates)
+
+            if transfer_rule == TRANSFER_GREGORY:
+                round_logs.append(
+                    f"Surplus from {options_by_id[candidate.option_id].text} distributed "
+                    f"from the last parcel received at transfer ratio {format_tally(ratio)}."
+                )
+            else:
+                round_logs.append(
+                    f"Surplus from {options_by_id[candidate.option_id].text} distributed "
+                    f"at transfer ratio {format_tally(ratio)}."
+                )
             continue
 
         newly_elected = [
@@ -335,7 +540,8 @@ def count_stv(valid_ballot_preferences, num_seats, options_by_id, rng=None):
                 surplus = tally - quota
                 round_logs.append(
                     f"{options_by_id[candidate.option_id].text} is elected with "
-                    f"tally {format_tally(tally)} (quota {quota}, surplus {format_tally(surplus)})."
+                    f"tally {format_tally(tally)} (quota {format_tally(quota)}, "
+                    f"surplus {format_tally(surplus)})."
                 )
                 if surplus > 0:
                     pending_surplus.append(
@@ -359,6 +565,40 @@ def count_stv(valid_ballot_preferences, num_seats, options_by_id, rng=None):
             round_logs.append("No continuing candidates remain. Count stopped.")
             break
 
+        if bulk_exclusion:
+            hopeless = _hopeless_candidates(continuing, tallies, unfilled_seats)
+            if len(hopeless) > 1:
+                pile = []
+                for candidate in hopeless:
+                    candidate.status = STATUS_ELIMINATED
+                    candidate.eliminated_round = round_number
+                    pile.extend(_clear_pile(candidate))
+
+                next_lowest = sorted(
+                    (
+                        candidate
+                        for candidate in continuing
+                        if candidate.status == STATUS_CONTINUING
+                    ),
+                    key=lambda candidate: (tallies[candidate.option_id], candidate.option_id),
+                )[0]
+                names = ", ".join(
+                    options_by_id[candidate.option_id].text for candidate in hopeless
+                )
+                combined = sum(
+                    (tallies[candidate.option_id] for candidate in hopeless),
+                    Fraction(0, 1),
+                )
+                round_logs.append(
+                    f"{names} are eliminated together: their combined tally "
+                    f"({format_tally(combined)}) cannot overtake "
+                    f"{options_by_id[next_lowest.option_id].text} "
+                    f"({format_tally(tallies[next_lowest.option_id])})."
+                )
+                with profiler.phase("exclude_candidates"):
+                    _distribute(pile, candidates)
+                continue
+
         min_tally = min(tallies[candidate.option_id] for candidate in continuing)
         lowest = [
             candidate
@@ -371,6 +611,8 @@ def count_stv(valid_ballot_preferences, num_seats, options_by_id, rng=None):
             options_by_id,
             round_logs,
             rng,
+            lot_draws,
+            round_number,
         )
         loser = candidates[loser_id]
         loser.status = STATUS_ELIMINATED
@@ -390,14 +632,8 @@ def count_stv(valid_ballot_preferences, num_seats, options_by_id, rng=None):
                 f"{options_by_id[loser_id].text} is eliminated."
             )
 
-        pile = list(loser.pile)
-        loser.pile.clear()
-        for ballot in pile:
-            next_candidate = _next_continuing(ballot, candidates)
-            if next_candidate is None:
-                ballot.exhausted = True
-            else:
-                next_candidate.pile.append(ballot)
+        with profiler.phase("exclude_candidates"):
+            _distribute(_clear_pile(loser), candidates)
 
     winner_ids = [
         candidate.option_id
@@ -418,11 +654,20 @@ def count_stv(valid_ballot_preferences, num_seats, options_by_id, rng=None):
         "rounds": rounds,
         "round_logs": round_logs,
         "seats_filled": seats_filled,
+        "lot_draws": lot_draws,
     }
 
 
-def tally_preference_stv(motion, rng=None):
-    valid_ballots, informal_ballots = parse_ballots_for_motion(motion)
+@timed_tally("stv")
+def tally_preference_stv(
+    motion,
+    rng=None,
+    quota_rule=QUOTA_DROOP,
+    transfer_rule=TRANSFER_WIG,
+    bulk_exclusion=False,
+):
+    with active_profiler().phase("parse_ballots"):
+        valid_ballots, informal_ballots = parse_ballots_for_motion(motion)
     options_by_id = {option.id: option for option in motion.options}
     num_seats = motion.num_winners or 1
 
@@ -430,7 +675,10 @@ def tally_preference_stv(motion, rng=None):
         [ballot["preferences"] for ballot in valid_ballots],
         num_seats,
         options_by_id,
-        rng=rng,
+        rng=rng or motion_rng(motion),
+        quota_rule=quota_rule,
+        transfer_rule=transfer_rule,
+        bulk_exclusion=bulk_exclusion,
     )
 
     return {
@@ -442,6 +690,8 @@ def tally_preference_stv(motion, rng=None):
         "round_logs": stv_result["round_logs"],
         "informal_ballots": informal_ballots,
         "seats_filled": stv_result["seats_filled"],
+        "tie_break_seed": motion.tally_seed,
+        "lot_draws": stv_result["lot_draws"],
     }
 
 
@@ -1,3 +1,7 @@
+from app.services.metrics import timed_tally
+
+
+@timed_tally("score")
 def tally_score_votes(motion):
     options_by_id = {option.id: option for option in motion.options}
     totals = {option_id: 0.0 for option_id in options_by_id}
@@ -0,0 +1,146 @@
+import random
+from types import SimpleNamespace
+
+PROFILES = ("zipf", "truncated", "duplicated", "ties")
+
+
+class _Vote:
+    __slots__ = ("voter_id", "voter", "motion_id", "option_id", "preference_rank", "score", "points")
+
+    def __init__(self, voter_id, voter, option_id, preference_rank=None, score=None, points=None):
+        self.voter_id = voter_id
+        self.voter = voter
+        self.motion_id = 1
+        self.option_id = option_id
+        self.preference_rank = preference_rank
+        self.score = score
+        self.points = points
+
+
+def make_options(num_candidates, labels=None):
+    labels = labels or [f"Candidate {index}" for index in range(1, num_candidates + 1)]
+    return [SimpleNamespace(id=index, text=text) for index, text in enumerate(labels, start=1)]
+
+
+def _zipf_weights(num_candidates, exponent=1.1):
+    return [1.0 / (rank ** exponent) for rank in range(1, num_candidates + 1)]
+
+
+def _ranking_after(first, option_ids, rng, length):
+    rest = [option_id for option_id in option_ids if option_id != first]
+    rng.shuffle(rest)
+    return [first] + rest[: max(length - 1, 0)]
+
+
+def preference_ballots(profile, num_ballots, num_candidates, seed=0):
+    if profile not in PROFILES:
+        raise ValueError(f"Unknown ballot profile: {profile}")
+
+    rng = random.Random(seed)
+    option_ids = list(range(1, num_candidates + 1))
+    weights = _zipf_weights(num_candidates)
+    ballots = []
+
+    if profile == "zipf":
+        firsts = rng.choices(option_ids, weights, k=num_ballots)
+        for first in firsts:
+            ballots.append(_ranking_after(first, option_ids, rng, num_candidates))
+    elif profile == "truncated":
+        firsts = rng.choices(option_ids, weights, k=num_ballots)
+        for first in firsts:
+            length = min(int(rng.expovariate(1 / 3)) + 1, num_candidates)
+            ballots.append(_ranking_after(first, option_ids, rng, length))
+    elif profile == "duplicated":
+        # Most voters copy one of a handful of slate tickets.
+        tickets = [
+            _ranking_after(first, option_ids, rng, rng.randint(2, num_candidates))
+            for first in rng.choices(option_ids, weights, k=8)
+        ]
+        for _ in range(num_ballots):
+            if rng.random() < 0.9:
+                ballots.append(list(rng.choice(tickets)))
+            else:
+                first = rng.choices(option_ids, weights)[0]
+                ballots.append(_ranking_after(first, option_ids, rng, rng.randint(1, num_candidates)))
+    else:
+        # Cyclic rotations in equal numbers leave every candidate level.
+        for index in range(num_ballots):
+            shift = index % num_candidates
+            ballots.append(option_ids[shift:] + option_ids[:shift])
+
+    return ballots
+
+
+def preference_motion(ballots, num_candidates, num_winners=1):
+    options = make_options(num_candidates)
+    votes = []
+    for voter_id, preferences in enumerate(ballots, start=1):
+        voter = SimpleNamespace(id=voter_id, name=f"Voter {voter_id}")
+        for rank, option_id in enumerate(preferences, start=1):
+            votes.append(_Vote(voter_id, voter, option_id, preference_rank=rank))
+    return SimpleNamespace(
+        options=options,
+        preference_votes=votes,
+        num_winners=num_winners,
+        tally_seed="benchmark",
+    )
+
+
+def _single_choice_votes(profile, num_ballots, options, rng):
+    option_ids = [option.id for option in options]
+    if profile == "ties":
+        choices = [option_ids[index % len(option_ids)] for index in range(num_ballots)]
+    else:
+        choices = rng.choices(option_ids, _zipf_weights(len(option_ids)), k=num_ballots)
+    return [_Vote(voter_id, None, option_id) for voter_id, option_id in enumerate(choices, start=1)]
+
+
+def candidate_motion(profile, num_ballots, num_candidates, seed=0):
+    rng = random.Random(seed)
+    options = make_options(num_candidates)
+    return SimpleNamespace(
+        options=options,
+        candidate_votes=_single_choice_votes(profile, num_ballots, options, rng),
+    )
+
+
+def yes_no_motion(profile, num_ballots, seed=0):
+    rng = random.Random(seed)
+    options = make_options(3, ["Yes", "No", "Abstain"])
+    return SimpleNamespace(
+        options=options,
+        yes_no_votes=_single_choice_votes(profile, num_ballots, options, rng),
+        approved_threshold_pct=50.0,
+    )
+
+
+def score_motion(profile, num_ballots, num_candidates, seed=0, score_max=10):
+    rng = random.Random(seed)
+    options = make_options(num_candidates)
+    votes = []
+    for voter_id in range(1, num_ballots + 1):
+        for option in options:
+            if profile == "ties":
+                score = float(score_max if option.id == (voter_id % num_candidates) + 1 else 0)
+            else:
+                score = float(min(score_max, int(rng.expovariate(option.id / score_max))))
+            votes.append(_Vote(voter_id, None, option.id, score=score))
+    return SimpleNamespace(options=options, score_votes=votes, score_max=score_max)
+
+
+def cumulative_motion(profile, num_ballots, num_candidates, seed=0, budget=10):
+    rng = random.Random(seed)
+    options = make_options(num_candidates)
+    option_ids = [option.id for option in options]
+    weights = _zipf_weights(num_candidates)
+    votes = []
+    for voter_id in range(1, num_ballots + 1):
+        points = dict.fromkeys(option_ids, 0)
+        if profile == "ties":
+            points[option_ids[voter_id % num_candidates]] = budget
+        else:
+            for option_id in rng.choices(option_ids, weights, k=budget):
+                points[option_id] += 1
+        for option_id, value in points.items():
+            votes.append(_Vote(voter_id, None, option_id, points=float(value)))
+    return SimpleNamespace(options=options, cumulative_votes=votes, budget_points=budget)
@@ -0,0 +1,132 @@
+import argparse
+import json
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+from app import create_app  # noqa: E402
+from app.extensions import db  # noqa: E402
+from app.models import Meeting, Voter  # noqa: E402
+from benchmarks.load_test import seed_meeting  # noqa: E402
+
+MODES = {
+    "before": {"COMPRESSION_ENABLED": False, "PUBLIC_PAGE_CACHE_ENABLED": False},
+    "after": {"COMPRESSION_ENABLED": True, "PUBLIC_PAGE_CACHE_ENABLED": True},
+}
+# (label, path, signed in as the meeting admin)
+PAGES = (
+    ("GET /", "/", False),
+    ("GET /voting-systems", "/voting-systems", False),
+    ("GET /robots.txt", "/robots.txt", False),
+    ("GET /sitemap.xml", "/sitemap.xml", False),
+    ("GET /admin/meetings", "/admin/meetings", True),
+    ("GET /admin/meetings/<id>", "/admin/meetings/{meeting_id}", True),
+    ("GET /api/vote/<code>/ballots", "/api/vote/{code}/ballots", False),
+)
+
+
+def build_app(mode, database_url):
+    app = create_app(
+        {
+            "SQLALCHEMY_DATABASE_URI": database_url,
+            "SQLALCHEMY_ENGINE_OPTIONS": {},
+            "MAIL_BACKGROUND_SENDER": False,
+            **MODES[mode],
+        }
+    )
+    join_token, _motions = seed_meeting(app, num_options=8)
+    with app.app_context():
+        meeting = Meeting.query.filter_by(join_token=join_token).one()
+        voter = Voter(meeting_id=meeting.id, student_id="BENCH", name="Bench Voter", code="BENCH001")
+        db.session.add(voter)
+        db.session.commit()
+        return app, {"meeting_id": meeting.id, "admin_id": meeting.admin_id, "code": voter.code}
+
+
+def measure(app, seeded, requests, revalidate):
+    anonymous = app.test_client()
+    admin = app.test_client()
+    with admin.session_transaction() as session:
+        session["_user_id"] = str(seeded["admin_id"])
+        session["_fresh"] = True
+
+    rows = []
+    for label, path, signed_in in PAGES:
+        client = admin if signed_in else anonymous
+        url = path.format(**seeded)
+        headers = {"Accept-Encoding": "gzip, deflate, br"}
+        client.get(url, headers=headers)  # warm up: first render, template compile
+
+        wire_bytes = 0
+        samples = []
+        statuses = set()
+        cpu_started = time.process_time()
+        for _ in range(requests):
+            started = time.perf_counter()
+            response = client.get(url, headers=headers)
+            samples.append(time.perf_counter() - started)
+            wire_bytes += len(response.get_data())
+            statuses.add(response.status_code)
+            # A browser revalidating a page it already holds.
+            if revalidate and response.headers.get("ETag"):
+                headers["If-None-Match"] = response.headers["ETag"]
+        cpu_seconds = time.process_time() - cpu_started
+
+        rows.append(
+            {
+                "endpoint": label,
+                "statuses": sorted(statuses),
+                "bytes_per_request": round(wire_bytes / requests),
+                "cpu_ms_per_request": round(cpu_seconds * 1000 / requests, 3),
+                "p50_ms": round(statistics.median(samples) * 1000, 3),
+            }
+        )
+    return rows
+
+
+def run(options):
+    results = {}
+    for mode in MODES:
+        database = Path(options.workdir) / f"http-bench-{mode}.sqlite3"
+        database.unlink(missing_ok=True)
+        app, seeded = build_app(mode, f"sqlite:///{database.resolve()}")
+        results[mode] = measure(app, seeded, options.requests, options.revalidate)
+    return results
+
+
+def print_results(results):
+    print(f"{'endpoint':32} {'bytes before':>13} {'bytes after':>12} {'cpu ms before':>14} {'cpu ms after':>13}")
+    for before, after in zip(results["before"], results["after"]):
+        print(
+            f"{before['endpoint']:32} {before['bytes_per_request']:>13} {after['bytes_per_request']:>12} "
+            f"{before['cpu_ms_per_request']:>14} {after['cpu_ms_per_request']:>13}"
+        )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Compare bytes on the wire and CPU per request with and without "
+        "response compression and the public page cache."
+    )
+    parser.add_argument("--requests", type=int, default=200, help="Requests per endpoint and mode.")
+    parser.add_argument("--revalidate", action="store_true",
+                        help="Send If-None-Match with the last ETag, like a returning browser.")
+    parser.add_argument("--workdir", default=tempfile.gettempdir())
+    parser.add_argument("--output", help="Write results as JSON to this path.")
+    options = parser.parse_args(argv)
+
+    results = run(options)
+    print_results(results)
+    if options.output:
+        Path(options.output).write_text(json.dumps(results, indent=2) + "\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,351 @@
+import argparse
+import http.cookiejar
+import json
+import random
+import sys
+import tempfile
+import threading
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+from sqlalchemy import event  # noqa: E402
+
+from app import create_app  # noqa: E402
+from app.extensions import db  # noqa: E402
+from app.models import Meeting, Motion, Option, User  # noqa: E402
+from app.services.security import generate_join_token, generate_tally_seed  # noqa: E402
+
+MOTION_TYPES = ("YES_NO", "FPTP", "PREFERENCE", "SCORE", "CUMULATIVE")
+PERCENTILES = (50, 95, 99)
+
+
+class InProcessClient:
+    def __init__(self, app):
+        self._client = app.test_client()
+
+    def request(self, method, path, data=None):
+        response = self._client.open(path, method=method, data=data)
+        status = response.status_code
+        location = response.headers.get("Location")
+        response.close()
+        return status, location
+
+
+class _NoRedirect(urllib.request.HTTPRedirectHandler):
+    def redirect_request(self, *args, **kwargs):
+        return None
+
+
+class HttpClient:
+    def __init__(self, base_url, timeout=30):
+        self._base_url = base_url.rstrip("/")
+        self._timeout = timeout
+        self._opener = urllib.request.build_opener(
+            urllib.request.HTTPCookieProcessor(http.cookiejar.CookieJar()),
+            _NoRedirect(),
+        )
+
+    def request(self, method, path, data=None):
+        body = urllib.parse.urlencode(data).encode() if data is not None else None
+        request = urllib.request.Request(self._base_url + path, data=body, method=method)
+        try:
+            with self._opener.open(request, timeout=self._timeout) as response:
+                response.read()
+                return response.status, response.headers.get("Location")
+        except urllib.error.HTTPError as exc:
+            exc.read()
+            return exc.code, exc.headers.get("Location")
+
+
+class StatementCounter:
+    def __init__(self, engine):
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self.counts = defaultdict(int)
+        event.listen(engine, "before_cursor_execute", self._on_execute)
+
+    def _on_execute(self, *args):
+        label = getattr(self._local, "label", None)
+        if label is None:
+            return
+        with self._lock:
+            self.counts[label] += 1
+
+    def set_label(self, label):
+        self._local.label = label
+
+
+class Recorder:
+    def __init__(self, counter=None):
+        self._lock = threading.Lock()
+        self._counter = counter
+        self.latencies = defaultdict(list)
+        self.errors = defaultdict(int)
+
+    def call(self, client, label, method, path, data=None, expected=(200, 302)):
+        if self._counter:
+            self._counter.set_label(label)
+        started = time.perf_counter()
+        try:
+            status, location = client.request(method, path, data)
+        except OSError:
+            status, location = None, None
+        elapsed = time.perf_counter() - started
+        if self._counter:
+            self._counter.set_label(None)
+        with self._lock:
+            self.latencies[label].append(elapsed)
+            if status not in expected:
+                self.errors[label] += 1
+        return status, location
+
+
+def seed_meeting(app, num_options, registration_open=True):
+    with app.app_context():
+        db.create_all()
+        admin = User(
+            username=f"loadtest-{generate_join_token()[:8]}",
+            email=f"{generate_join_token()[:12]}@loadtest.invalid",
+            password_hash="unused",
+        )
+        db.session.add(admin)
+        db.session.flush()
+        meeting = Meeting(
+            title="Load test meeting",
+            admin_id=admin.id,
+            join_token=generate_join_token(),
+            registration_open=registration_open,
+        )
+        db.session.add(meeting)
+        db.session.flush()
+
+        motions = []
+        for motion_type in MOTION_TYPES:
+            motion = Motion(
+                meeting_id=meeting.id,
+                title=f"{motion_type} motion",
+                type=motion_type,
+                status="OPEN",
+                num_winners=2 if motion_type == "PREFERENCE" else None,
+                approved_threshold_pct=50.0 if motion_type == "YES_NO" else None,
+                score_max=10 if motion_type == "SCORE" else None,
+                budget_points=10 if motion_type == "CUMULATIVE" else None,
+                tally_seed=generate_tally_seed(),
+            )
+            db.session.add(motion)
+            db.session.flush()
+            if motion_type == "YES_NO":
+                texts = ("Yes", "No", "Abstain")
+            else:
+                texts = [f"Candidate {index}" for index in range(1, num_options + 1)]
+            options = [Option(motion_id=motion.id, text=text) for text in texts]
+            db.session.add_all(options)
+            db.session.flush()
+            motions.append(
+                {
+                    "id": motion.id,
+                    "type": motion_type,
+                    "option_ids": [option.id for option in options],
+                    "budget": motion.budget_points,
+                    "score_max": motion.score_max,
+                }
+            )
+        db.session.commit()
+        return meeting.join_token, motions
+
+
+def ballot_form(motion, rng):
+    option_ids = motion["option_ids"]
+    if motion["type"] in ("YES_NO", "FPTP"):
+        return {"option": str(rng.choice(option_ids))}
+    if motion["type"] == "PREFERENCE":
+        ranked = rng.sample(option_ids, rng.randint(1, len(option_ids)))
+        return {f"opt_{option_id}_rank": str(rank) for rank, option_id in enumerate(ranked, start=1)}
+    if motion["type"] == "SCORE":
+        return {f"opt_{option_id}_score": str(rng.randint(0, motion["score_max"])) for option_id in option_ids}
+
+    points = dict.fromkeys(option_ids, 0)
+    for _ in range(motion["budget"]):
+        points[rng.choice(option_ids)] += 1
+    return {f"opt_{option_id}_points": str(value) for option_id, value in points.items()}
+
+
+def voter_journey(index, client, recorder, join_token, motions, seed):
+    rng = random.Random(seed * 1_000_003 + index)
+    join_path = f"/join/meeting/{join_token}"
+    recorder.call(client, "GET /join/meeting/<token>", "GET", join_path)
+    status, location = recorder.call(
+        client,
+        "POST /join/meeting/<token>",
+        "POST",
+        join_path,
+        {"student_id": f"S{index:07d}", "name": f"Load Voter {index}"},
+        expected=(302,),
+    )
+    if status != 302 or not location:
+        return 0
+    code = urllib.parse.urlparse(location).path.rstrip("/").rsplit("/", 1)[-1]
+
+    recorder.call(client, "GET /join", "GET", "/join")
+    recorder.call(client, "POST /join", "POST", "/join", {"voter_code": code}, expected=(302,))
+    recorder.call(client, "GET /vote/<code>", "GET", f"/vote/{code}")
+
+    submitted = 0
+    for motion in motions:
+        motion_path = f"/vote/{code}/motion/{motion['id']}"
+        recorder.call(client, "GET /vote/<code>/motion/<id>", "GET", motion_path)
+        status, _ = recorder.call(
+            client,
+            f"POST /vote/<code>/motion/<id> [{motion['type']}]",
+            "POST",
+            motion_path,
+            ballot_form(motion, rng),
+            expected=(302,),
+        )
+        if status == 302:
+            submitted += 1
+    return submitted
+
+
+def percentile(sorted_values, pct):
+    if not sorted_values:
+        return 0.0
+    rank = max(0, min(len(sorted_values) - 1, round(pct / 100 * len(sorted_values)) - 1))
+    return sorted_values[rank]
+
+
+def summarize(recorder, counter, elapsed, ballots):
+    endpoints = []
+    total_requests = 0
+    for label in sorted(recorder.latencies):
+        values = sorted(recorder.latencies[label])
+        total_requests += len(values)
+        row = {
+            "endpoint": label,
+            "requests": len(values),
+            "errors": recorder.errors.get(label, 0),
+            "throughput_rps": round(len(values) / elapsed, 2) if elapsed else None,
+        }
+        for pct in PERCENTILES:
+            row[f"p{pct}_ms"] = round(percentile(values, pct) * 1000, 2)
+        if counter is not None:
+            statements = counter.counts.get(label, 0)
+            row["db_statements"] = statements
+            row["db_statements_per_request"] = round(statements / len(values), 2)
+        endpoints.append(row)
+    return {
+        "elapsed_seconds": round(elapsed, 3),
+        "requests": total_requests,
+        "requests_per_second": round(total_requests / elapsed, 2) if elapsed else None,
+        "ballots": ballots,
+        "ballots_per_second": round(ballots / elapsed, 2) if elapsed else None,
+        "endpoints": endpoints,
+    }
+
+
+def print_summary(summary):
+    print(
+        f"{summary['requests']} requests, {summary['ballots']} ballots in "
+        f"{summary['elapsed_seconds']}s ({summary['requests_per_second']} req/s, "
+        f"{summary['ballots_per_second']} ballots/s)\n"
+    )
+    print(f"{'endpoint':48} {'reqs':>6} {'err':>5} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'stmts/req':>10}")
+    for row in summary["endpoints"]:
+        statements = row.get("db_statements_per_request")
+        print(
+            f"{row['endpoint']:48} {row['requests']:>6} {row['errors']:>5} "
+            f"{row['p50_ms']:>8} {row['p95_ms']:>8} {row['p99_ms']:>8} "
+            f"{statements if statements is not None else 'n/a':>10}"
+        )
+
+
+def run_load_test(options):
+    database_url = options.database_url or f"sqlite:///{Path(options.workdir).resolve() / 'loadtest.sqlite3'}"
+    engine_options = {}
+    if database_url.startswith("sqlite"):
+        engine_options = {"connect_args": {"timeout": 30, "check_same_thread": False}}
+    app = create_app(
+        {
+            "SQLALCHEMY_DATABASE_URI": database_url,
+            "SQLALCHEMY_ENGINE_OPTIONS": engine_options,
+            "WTF_CSRF_ENABLED": False,
+        }
+    )
+    # Only the harness's own SQLite file is ever dropped; a --database-url
+    # may well be a real development database.
+    if options.database_url is None and options.reset:
+        with app.app_context():
+            db.drop_all()
+
+    join_token, motions = seed_meeting(app, options.options)
+
+    counter = None
+    if options.base_url:
+        make_client = lambda: HttpClient(options.base_url)  # noqa: E731
+    else:
+        with app.app_context():
+            counter = StatementCounter(db.engine)
+        make_client = lambda: InProcessClient(app)  # noqa: E731
+    recorder = Recorder(counter)
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=options.concurrency) as pool:
+        futures = [
+            pool.submit(voter_journey, index, make_client(), recorder, join_token, motions, options.seed)
+            for index in range(options.voters)
+        ]
+        ballots = sum(future.result() for future in futures)
+    elapsed = time.perf_counter() - started
+
+    summary = summarize(recorder, counter, elapsed, ballots)
+    summary["meta"] = {
+        "voters": options.voters,
+        "concurrency": options.concurrency,
+        "motions": [motion["type"] for motion in motions],
+        "target": options.base_url or "in-process",
+        "database": database_url.split("://", 1)[0],
+    }
+    return summary
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Simulate the voting-hall peak against Votora.")
+    parser.add_argument("--voters", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--options", type=int, default=5, help="Options per candidate-style motion.")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--database-url",
+                        help="Database to seed (defaults to a fresh SQLite file in --workdir).")
+    parser.add_argument("--workdir", default=tempfile.gettempdir())
+    parser.add_argument("--no-reset", dest="reset", action="store_false",
+                        help="Keep existing tables in the default SQLite database.")
+    parser.add_argument("--base-url",
+                        help="Send requests to a running server that uses --database-url "
+                             "instead of the in-process app. DB statement counts are "
+                             "only collected in-process.")
+    parser.add_argument("--output", help="Write the summary as JSON to this path.")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    options = parse_args(argv)
+    summary = run_load_test(options)
+    print_summary(summary)
+    if options.output:
+        Path(options.output).write_text(json.dumps(summary, indent=2) + "\n")
+        print(f"\nWrote {options.output}")
+    failed = sum(row["errors"] for row in summary["endpoints"])
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
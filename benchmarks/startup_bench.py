@@ -0,0 +1,137 @@
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+
+SCENARIOS = {
+    "interpreter": [sys.executable, "-c", "pass"],
+    "import app": [sys.executable, "-c", "import app"],
+    "import app.services.voting": [sys.executable, "-c", "import app.services.voting"],
+    "worker boot (import wsgi)": [sys.executable, "-c", "import wsgi"],
+    "flask --app app routes": [sys.executable, "-m", "flask", "--app", "app", "routes"],
+    "pytest collection": [sys.executable, "-m", "pytest", "--collect-only", "-q", "-p", "no:cacheprovider"],
+}
+
+# Boots the app the way gunicorn does, then times the first and second
+# request to the largest admin page. Printed as JSON on the last line.
+FIRST_REQUEST_CODE = """
+import json, sys, time
+started = time.perf_counter()
+from app import create_app
+from app.extensions import db
+from app.models import Meeting, User
+from app.services.template_cache import precompile_templates
+app = create_app({"SQLALCHEMY_DATABASE_URI": "sqlite:///" + sys.argv[1], "SQLALCHEMY_ENGINE_OPTIONS": {},
+                  "MAIL_BACKGROUND_SENDER": False, "MIGRATIONS_ENABLED": False})
+if sys.argv[2] == "precompile":
+    precompile_templates(app)
+booted = time.perf_counter()
+with app.app_context():
+    db.create_all()
+    user = User(username="bench", email="bench@example.invalid", password_hash="unused")
+    db.session.add(user)
+    db.session.flush()
+    meeting = Meeting(title="Bench", admin_id=user.id)
+    db.session.add(meeting)
+    db.session.commit()
+    user_id, meeting_id = user.id, meeting.id
+client = app.test_client()
+with client.session_transaction() as session:
+    session["_user_id"] = str(user_id)
+    session["_fresh"] = True
+timings = []
+for _ in range(2):
+    request_started = time.perf_counter()
+    assert client.get(f"/admin/meetings/{meeting_id}").status_code == 200
+    timings.append(time.perf_counter() - request_started)
+print(json.dumps({"boot": booted - started, "first": timings[0], "second": timings[1]}))
+"""
+
+# name: (bytecode cache, precompile at boot, reuse the cache across runs)
+FIRST_REQUEST_SCENARIOS = {
+    "no template cache": (False, False, False),
+    "bytecode cache, empty": (True, False, False),
+    "bytecode cache, filled at deploy": (True, False, True),
+    "filled cache + precompile at boot": (True, True, True),
+}
+
+
+def first_request_latency(runs, env):
+    results = []
+    with tempfile.TemporaryDirectory() as workdir:
+        workdir = Path(workdir)
+        for name, (use_cache, precompile, reuse) in FIRST_REQUEST_SCENARIOS.items():
+            samples = []
+            for run in range(runs + 1):
+                cache_dir = workdir / ("shared-cache" if reuse else f"{len(results)}-{run}")
+                database = workdir / f"bench-{len(results)}-{run}.sqlite3"
+                scenario_env = dict(env, TEMPLATE_CACHE_DIR=str(cache_dir) if use_cache else "")
+                output = subprocess.run(
+                    [sys.executable, "-c", FIRST_REQUEST_CODE, str(database),
+                     "precompile" if precompile else "lazy"],
+                    cwd=ROOT_DIR, env=scenario_env, check=True, capture_output=True, text=True,
+                ).stdout
+                # The first pass only fills a shared cache, as a deploy would.
+                if run or not reuse:
+                    samples.append(json.loads(output.strip().splitlines()[-1]))
+            samples = samples[:runs]
+            row = {"scenario": name}
+            for key in ("boot", "first", "second"):
+                row[f"{key}_ms"] = round(statistics.median(sample[key] for sample in samples) * 1000, 1)
+            results.append(row)
+            print(f"{name:36} boot {row['boot_ms']:8.1f} ms   first request {row['first_ms']:8.1f} ms   "
+                  f"second {row['second_ms']:6.1f} ms")
+    return results
+
+
+def time_command(command, runs, env):
+    samples = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        subprocess.run(command, cwd=ROOT_DIR, env=env, check=True, capture_output=True)
+        samples.append(time.perf_counter() - started)
+    return statistics.median(samples), min(samples)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Measure Votora import and boot time.")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS),
+                        help="Comma-separated subset of: " + ", ".join(SCENARIOS))
+    parser.add_argument("--first-request", action="store_true",
+                        help="Measure cold-start first-request latency with and without the "
+                             "template bytecode cache instead.")
+    parser.add_argument("--output", help="Write results as JSON to this path.")
+    options = parser.parse_args(argv)
+
+    env = dict(os.environ)
+    env.setdefault("DATABASE_URL", "sqlite:///:memory:")
+
+    if options.first_request:
+        results = first_request_latency(options.runs, env)
+        if options.output:
+            Path(options.output).write_text(
+                json.dumps({"runs": options.runs, "first_request": results}, indent=2) + "\n"
+            )
+        return 0
+
+    results = []
+    for name in options.scenarios.split(","):
+        median, best = time_command(SCENARIOS[name], options.runs, env)
+        results.append({"scenario": name, "median_seconds": round(median, 4), "best_seconds": round(best, 4)})
+        print(f"{name:30} median {median * 1000:8.1f} ms   best {best * 1000:8.1f} ms")
+
+    if options.output:
+        Path(options.output).write_text(json.dumps({"runs": options.runs, "results": results}, indent=2) + "\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,234 @@
+import argparse
+import gc
+import json
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from pathlib import Path
+from types import SimpleNamespace
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+from benchmarks import generators  # noqa: E402
+from app.services.voting.candidate import tally_candidate_election  # noqa: E402
+from app.services.voting.condorcet import count_condorcet  # noqa: E402
+from app.services.voting.cumulative import tally_cumulative_votes  # noqa: E402
+from app.services.voting.meek import count_meek_stv  # noqa: E402
+from app.services.voting.preference import (  # noqa: E402
+    count_stv,
+    motion_rng,
+    parse_ballots_for_motion,
+)
+from app.services.voting.score import tally_score_votes  # noqa: E402
+from app.services.voting.yes_no import tally_yes_no_abstain  # noqa: E402
+
+DEFAULT_SIZES = (1_000, 10_000, 100_000)
+BENCHMARK_MOTION = SimpleNamespace(tally_seed="benchmark")
+
+
+def _options_by_id(num_candidates):
+    return {option.id: option for option in generators.make_options(num_candidates)}
+
+
+def _setup_parse(profile, size, options):
+    ballots = generators.preference_ballots(profile, size, options.candidates, options.seed)
+    return (generators.preference_motion(ballots, options.candidates, options.seats),)
+
+
+def _setup_count(profile, size, options):
+    ballots = generators.preference_ballots(profile, size, options.candidates, options.seed)
+    return ballots, options.seats, _options_by_id(options.candidates)
+
+
+ENGINES = {
+    "parse_ballots_for_motion": (
+        _setup_parse,
+        lambda motion: parse_ballots_for_motion(motion),
+    ),
+    "count_stv": (
+        _setup_count,
+        lambda ballots, seats, options_by_id: count_stv(
+            ballots, seats, options_by_id, rng=motion_rng(BENCHMARK_MOTION)
+        ),
+    ),
+    "count_meek_stv": (
+        _setup_count,
+        lambda ballots, seats, options_by_id: count_meek_stv(
+            ballots, seats, options_by_id, rng=motion_rng(BENCHMARK_MOTION)
+        ),
+    ),
+    "count_condorcet": (
+        _setup_count,
+        lambda ballots, seats, options_by_id: count_condorcet(ballots, seats, options_by_id),
+    ),
+    "tally_candidate_election": (
+        lambda profile, size, options: (
+            generators.candidate_motion(profile, size, options.candidates, options.seed),
+        ),
+        tally_candidate_election,
+    ),
+    "tally_yes_no_abstain": (
+        lambda profile, size, options: (generators.yes_no_motion(profile, size, options.seed),),
+        tally_yes_no_abstain,
+    ),
+    "tally_score_votes": (
+        lambda profile, size, options: (
+            generators.score_motion(profile, size, options.candidates, options.seed),
+        ),
+        tally_score_votes,
+    ),
+    "tally_cumulative_votes": (
+        lambda profile, size, options: (
+            generators.cumulative_motion(profile, size, options.candidates, options.seed),
+        ),
+        tally_cumulative_votes,
+    ),
+}
+
+
+def _git_revision():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=ROOT_DIR,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def measure(run, args, repeat, track_memory):
+    best = None
+    for _ in range(repeat):
+        gc.collect()
+        started = time.perf_counter()
+        run(*args)
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+
+    peak_bytes = None
+    if track_memory:
+        gc.collect()
+        tracemalloc.start()
+        try:
+            run(*args)
+            peak_bytes = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+
+    return best, peak_bytes
+
+
+def run_benchmarks(options):
+    results = []
+    for engine in options.engines:
+        setup, run = ENGINES[engine]
+        for profile in options.profiles:
+            for size in options.sizes:
+                args = setup(profile, size, options)
+                seconds, peak_bytes = measure(
+                    run,
+                    args,
+                    options.repeat if size < 1_000_000 else 1,
+                    not options.skip_memory,
+                )
+                row = {
+                    "engine": engine,
+                    "profile": profile,
+                    "size": size,
+                    "seconds": round(seconds, 6),
+                    "peak_bytes": peak_bytes,
+                }
+                results.append(row)
+                peak = f"{peak_bytes / 1_048_576:9.1f} MiB" if peak_bytes is not None else "        n/a"
+                print(f"{engine:26} {profile:11} {size:>9}  {seconds:9.4f}s  {peak}")
+                del args
+    return results
+
+
+def compare(results, baseline_path, threshold):
+    baseline = json.loads(Path(baseline_path).read_text())
+    previous = {
+        (row["engine"], row["profile"], row["size"]): row for row in baseline["results"]
+    }
+    regressions = []
+    print(f"\nCompared with {baseline_path} ({baseline['meta'].get('git_revision')}):")
+    for row in results:
+        old = previous.get((row["engine"], row["profile"], row["size"]))
+        if not old or not old["seconds"]:
+            continue
+        ratio = row["seconds"] / old["seconds"]
+        marker = "  REGRESSION" if ratio > threshold else ""
+        print(
+            f"{row['engine']:26} {row['profile']:11} {row['size']:>9}  "
+            f"{old['seconds']:9.4f}s -> {row['seconds']:9.4f}s  x{ratio:5.2f}{marker}"
+        )
+        if ratio > threshold:
+            regressions.append(row)
+    return regressions
+
+
+def _csv(value, cast=str):
+    return [cast(item) for item in value.split(",") if item]
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark Votora tally engines.")
+    parser.add_argument("--sizes", type=lambda v: _csv(v, int), default=list(DEFAULT_SIZES),
+                        help="Comma-separated ballot counts, e.g. 1000,10000,100000,1000000.")
+    parser.add_argument("--profiles", type=_csv, default=list(generators.PROFILES))
+    parser.add_argument("--engines", type=_csv, default=list(ENGINES))
+    parser.add_argument("--candidates", type=int, default=10)
+    parser.add_argument("--seats", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--skip-memory", action="store_true",
+                        help="Skip the tracemalloc pass used for peak memory.")
+    parser.add_argument("--output", help="Write results as JSON to this path.")
+    parser.add_argument("--compare", help="Baseline JSON from an earlier run.")
+    parser.add_argument("--threshold", type=float, default=1.2,
+                        help="Slowdown ratio reported as a regression.")
+    options = parser.parse_args(argv)
+
+    unknown = set(options.engines) - set(ENGINES)
+    if unknown:
+        parser.error(f"Unknown engines: {', '.join(sorted(unknown))}")
+    unknown = set(options.profiles) - set(generators.PROFILES)
+    if unknown:
+        parser.error(f"Unknown profiles: {', '.join(sorted(unknown))}")
+    return options
+
+
+def main(argv=None):
+    options = parse_args(argv)
+    results = run_benchmarks(options)
+    report = {
+        "meta": {
+            "git_revision": _git_revision(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "created_at": datetime.now(timezone.utc).isoformat(),
+            "candidates": options.candidates,
+            "seats": options.seats,
+            "seed": options.seed,
+        },
+        "results": results,
+    }
+    if options.output:
+        Path(options.output).write_text(json.dumps(report, indent=2) + "\n")
+        print(f"\nWrote {options.output}")
+
+    if options.compare:
+        return 1 if compare(results, options.compare, options.threshold) else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,5 +1,7 @@
-from app import app, db
+from app import create_app, db
+
+app = create_app()
 
 with app.app_context():
     db.create_all()
-    print("Database tables created.")
\ No newline at end of file
+    print("Database tables created.")
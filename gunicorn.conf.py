@@ -0,0 +1,88 @@
+import multiprocessing
+import os
+
+
+def _env_int(name, default):
+    value = os.getenv(name)
+    return int(value) if value and value.strip() else default
+
+
+cpu_count = multiprocessing.cpu_count()
+
+# "gthread" suits the app as shipped: requests spend most of their time
+# waiting on MySQL or Resend, and threads keep a worker responsive while one
+# request blocks. "gevent" needs `pip install gevent`; PyMySQL is pure Python
+# so it cooperates once gevent has patched sockets. "sync" restores the old
+# one-request-per-worker behaviour.
+worker_class = os.getenv("GUNICORN_WORKER_CLASS", "gthread")
+
+if worker_class == "sync":
+    workers = _env_int("WEB_CONCURRENCY", cpu_count * 2 + 1)
+    threads = 1
+elif worker_class == "gthread":
+    workers = _env_int("WEB_CONCURRENCY", cpu_count + 1)
+    threads = _env_int("GUNICORN_THREADS", 4)
+else:
+    workers = _env_int("WEB_CONCURRENCY", cpu_count)
+    threads = 1
+    worker_connections = _env_int("GUNICORN_WORKER_CONNECTIONS", 200)
+
+bind = os.getenv("GUNICORN_BIND", f"0.0.0.0:{os.getenv('PORT', '8000')}")
+timeout = _env_int("GUNICORN_TIMEOUT", 30)
+graceful_timeout = _env_int("GUNICORN_GRACEFUL_TIMEOUT", 20)
+keepalive = _env_int("GUNICORN_KEEPALIVE", 5)
+max_requests = _env_int("GUNICORN_MAX_REQUESTS", 2000)
+max_requests_jitter = _env_int("GUNICORN_MAX_REQUESTS_JITTER", 200)
+preload_app = os.getenv("GUNICORN_PRELOAD", "true").lower() in ("1", "true", "yes", "on")
+
+accesslog = os.getenv("GUNICORN_ACCESS_LOG", "-")
+errorlog = "-"
+loglevel = os.getenv("GUNICORN_LOG_LEVEL", "info")
+
+
+def on_starting(server):
+    # Worker metric snapshots from a previous run would otherwise be summed
+    # into this one's totals.
+    directory = os.getenv("METRICS_DIR")
+    if directory and os.path.isdir(directory):
+        for name in os.listdir(directory):
+            if name.endswith((".json", ".tmp")):
+                os.unlink(os.path.join(directory, name))
+
+
+def post_fork(server, worker):
+    # With preload_app the engine is built in the master; give each worker
+    # its own pool rather than sharing sockets inherited across fork().
+    from app.extensions import db
+
+    wsgi_app = server.app.wsgi()
+    with wsgi_app.app_context():
+        for engine in db.engines.values():
+            engine.dispose(close=False)
+
+
+def _precompile_templates(wsgi_app):
+    from app.services.template_cache import precompile_templates
+
+    if wsgi_app.config["TEMPLATE_PRECOMPILE"]:
+        precompile_templates(wsgi_app)
+
+
+def when_ready(server):
+    # Compiled once in the master so every forked worker starts with the
+    # templates already loaded.
+    if preload_app:
+        _precompile_templates(server.app.wsgi())
+
+
+def post_worker_init(worker):
+    if not preload_app:
+        _precompile_templates(worker.wsgi)
+
+    # Start delivering queued mail now rather than on the worker's first
+    # request.
+    from app.services.mail import mail_sender
+
+    wsgi_app = worker.wsgi
+    if wsgi_app.config["MAIL_BACKGROUND_SENDER"]:
+        mail_sender(wsgi_app).wake()
@@ -0,0 +1,26 @@
+"""add preference method to motions
+
+Revision ID: a4b5c6d7e8f9
+Revises: 1a2b3c4d5e6f
+Create Date: 2026-10-19 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "a4b5c6d7e8f9"
+down_revision = "1a2b3c4d5e6f"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column(
+        "motions", sa.Column("preference_method", sa.String(length=20), nullable=True)
+    )
+
+
+def downgrade():
+    op.drop_column("motions", "preference_method")
@@ -0,0 +1,38 @@
+"""add tally seed to motions
+
+Revision ID: b5c6d7e8f9a0
+Revises: a4b5c6d7e8f9
+Create Date: 2026-10-19 11:30:00.000000
+
+"""
+import uuid
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "b5c6d7e8f9a0"
+down_revision = "a4b5c6d7e8f9"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column("motions", sa.Column("tally_seed", sa.String(length=32), nullable=True))
+
+    # Existing motions get their seed here rather than on a later results
+    # view, so ties by lot replay identically from the start.
+    bind = op.get_bind()
+    motion_ids = bind.execute(
+        sa.text("SELECT id FROM motions WHERE tally_seed IS NULL")
+    ).scalars().all()
+    for motion_id in motion_ids:
+        bind.execute(
+            sa.text("UPDATE motions SET tally_seed = :seed WHERE id = :id"),
+            {"seed": uuid.uuid4().hex, "id": motion_id},
+        )
+
+
+def downgrade():
+    op.drop_column("motions", "tally_seed")
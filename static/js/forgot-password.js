@@ -0,0 +1,12 @@
+(function () {
+  'use strict'
+  const form = document.querySelector('.needs-validation')
+
+  form.addEventListener('submit', function (event) {
+    if (!form.checkValidity()) {
+      event.preventDefault()
+      event.stopPropagation()
+    }
+    form.classList.add('was-validated')
+  }, false)
+})()
@@ -0,0 +1,81 @@
+function showFlashModal(type, message, onClose) {
+  const existing = document.getElementById("flashBackdrop");
+  if (existing) existing.remove();
+
+  const bs = type || "info";
+  const backdrop = document.createElement("div");
+  backdrop.className = "vp-flash-backdrop vp-flash-hidden";
+  backdrop.id = "flashBackdrop";
+  backdrop.setAttribute("role", "dialog");
+  backdrop.setAttribute("aria-modal", "true");
+
+  const iconHtml = bs === "success"
+    ? '<i class="bi bi-check-circle-fill"></i>'
+    : bs === "danger"
+      ? '<i class="bi bi-x-circle-fill"></i>'
+      : bs === "warning"
+        ? '<i class="bi bi-exclamation-triangle-fill"></i>'
+        : '<i class="bi bi-info-circle-fill"></i>';
+
+  const titleText = bs === "danger" ? "Failed" : bs.toUpperCase();
+  backdrop.innerHTML = `
+    <div class="vp-flash-modal">
+      <div class="vp-flash-icon vp-${bs}">${iconHtml}</div>
+      <div class="vp-flash-title text-${bs}">${titleText}</div>
+      <div class="vp-flash-message">${message || ""}</div>
+      <button class="btn btn-primary px-4" id="flashOkBtn">OK</button>
+    </div>
+  `;
+  document.body.appendChild(backdrop);
+
+  const okBtn = backdrop.querySelector("#flashOkBtn");
+  if (okBtn) {
+    okBtn.addEventListener("click", () => {
+      backdrop.remove();
+      if (typeof onClose === "function") onClose();
+    });
+  }
+
+  requestAnimationFrame(() => {
+    backdrop.classList.remove("vp-flash-hidden");
+  });
+}
+
+const flashOkBtn = document.getElementById("flashOkBtn");
+if (flashOkBtn) {
+  flashOkBtn.addEventListener("click", () => {
+    const backdrop = document.getElementById("flashBackdrop");
+    if (backdrop) backdrop.remove();
+  });
+}
+const flashBackdrop = document.getElementById("flashBackdrop");
+if (flashBackdrop) {
+  requestAnimationFrame(() => {
+    flashBackdrop.classList.remove("vp-flash-hidden");
+  });
+}
+
+try {
+  const queued = sessionStorage.getItem("vpFlash");
+  if (queued) {
+    sessionStorage.removeItem("vpFlash");
+    const data = JSON.parse(queued);
+    showFlashModal(data.type || "info", data.message || "");
+  }
+} catch (e) { /* ignore */ }
+
+// Keep content offset matched to fixed navbar height.
+(function syncNavOffset() {
+  const nav = document.querySelector(".vp-navbar");
+  if (!nav) return;
+  const applyOffset = () => {
+    document.documentElement.style.setProperty("--vp-nav-offset", `${nav.offsetHeight + 16}px`);
+  };
+  applyOffset();
+  window.addEventListener("resize", applyOffset);
+  const navCollapse = document.getElementById("navbarNav");
+  if (navCollapse) {
+    navCollapse.addEventListener("shown.bs.collapse", applyOffset);
+    navCollapse.addEventListener("hidden.bs.collapse", applyOffset);
+  }
+})();
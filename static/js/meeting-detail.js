@@ -0,0 +1,469 @@
+window.addEventListener("DOMContentLoaded", function () {
+  // Motion modal handling
+  const motionModalEl = document.getElementById("addMotionModal");
+  const motionForm = document.getElementById("addMotionForm");
+  const motionSubmit = document.getElementById("addMotionSubmit");
+  const motionError = document.getElementById("addMotionError");
+  const motionModal = new bootstrap.Modal(motionModalEl);
+
+  const motionType = document.getElementById("motionType");
+  const candidatesGroup = document.getElementById("candidatesGroup");
+  const motionCandidates = document.getElementById("motionCandidates");
+  const numWinnersGroup = document.getElementById("numWinnersGroup");
+  const numWinnersInput = document.getElementById("motionNumWinners");
+  const preferenceMethodGroup = document.getElementById("preferenceMethodGroup");
+  const preferenceMethodInput = document.getElementById("motionPreferenceMethod");
+  const yesNoThresholdGroup = document.getElementById("yesNoThresholdGroup");
+  const yesNoThresholdInput = document.getElementById("motionApprovedThreshold");
+  const scoreMaxGroup = document.getElementById("scoreMaxGroup");
+  const scoreMaxInput = document.getElementById("motionScoreMax");
+  const budgetPointsGroup = document.getElementById("budgetPointsGroup");
+  const budgetPointsInput = document.getElementById("motionBudgetPoints");
+
+  function setMotionLoading(isLoading) {
+    motionSubmit.disabled = isLoading;
+    motionSubmit.innerHTML = isLoading
+      ? '<span class="spinner-border spinner-border-sm me-2" role="status" aria-hidden="true"></span>Saving...'
+      : "Add Motion";
+  }
+
+  function updateMotionVisibility() {
+    const t = motionType.value;
+    const needsCandidates = t !== "YES_NO";
+
+    candidatesGroup.style.display = needsCandidates ? "block" : "none";
+
+    motionCandidates.disabled = !needsCandidates;
+    motionCandidates.classList.toggle("bg-light", !needsCandidates);
+
+    const needsNumWinners = t === "PREFERENCE";
+    numWinnersGroup.style.display = needsNumWinners ? "block" : "none";
+    preferenceMethodGroup.style.display = needsNumWinners ? "block" : "none";
+    preferenceMethodInput.disabled = !needsNumWinners;
+    const needsThreshold = t === "YES_NO";
+    yesNoThresholdGroup.style.display = needsThreshold ? "block" : "none";
+    yesNoThresholdInput.disabled = !needsThreshold;
+    const needsScoreMax = t === "SCORE";
+    scoreMaxGroup.style.display = needsScoreMax ? "block" : "none";
+    scoreMaxInput.disabled = !needsScoreMax;
+    const needsBudgetPoints = t === "CUMULATIVE";
+    budgetPointsGroup.style.display = needsBudgetPoints ? "block" : "none";
+    budgetPointsInput.disabled = !needsBudgetPoints;
+
+    if (!needsCandidates) {
+      document.getElementById("motionCandidates").value = "";
+    }
+    if (!needsNumWinners) {
+      numWinnersInput.value = "";
+    }
+    if (!needsThreshold) {
+      yesNoThresholdInput.value = "";
+    } else if (!yesNoThresholdInput.value) {
+      yesNoThresholdInput.value = "50";
+    }
+    if (!needsScoreMax) {
+      scoreMaxInput.value = "";
+    } else if (!scoreMaxInput.value) {
+      scoreMaxInput.value = "10";
+    }
+    if (!needsBudgetPoints) {
+      budgetPointsInput.value = "";
+    } else if (!budgetPointsInput.value) {
+      budgetPointsInput.value = "10";
+    }
+  }
+
+  motionType.addEventListener("change", updateMotionVisibility);
+  updateMotionVisibility();
+
+  motionForm.addEventListener("submit", async (event) => {
+    event.preventDefault();
+    setMotionLoading(true);
+    motionError.classList.add("d-none");
+
+    const formData = new FormData(motionForm);
+    try {
+      const response = await fetch(motionForm.dataset.action, {
+        method: "POST",
+        body: formData,
+        headers: { "X-Requested-With": "XMLHttpRequest" },
+      });
+
+      if (!response.ok) {
+        let message = "Failed to add motion.";
+        try {
+          const data = await response.json();
+          if (data && data.error) message = data.error;
+        } catch (err) { /* ignore parse errors */ }
+        throw new Error(message);
+      }
+
+      motionModal.hide();
+      try {
+        sessionStorage.setItem("vpFlash", JSON.stringify({
+          type: "success",
+          message: "Motion added successfully."
+        }));
+      } catch (e) { /* ignore */ }
+      window.location.reload();
+    } catch (err) {
+      motionError.textContent = err.message;
+      motionError.classList.remove("d-none");
+    } finally {
+      setMotionLoading(false);
+    }
+  });
+
+  motionModalEl.addEventListener("hidden.bs.modal", () => {
+    motionForm.reset();
+    updateMotionVisibility();
+    motionError.classList.add("d-none");
+    setMotionLoading(false);
+  });
+
+  // Voter modal handling
+  const voterModalEl = document.getElementById("addVoterModal");
+  const voterForm = document.getElementById("addVoterForm");
+  const voterSubmit = document.getElementById("addVoterSubmit");
+  const voterError = document.getElementById("addVoterError");
+  const voterModal = new bootstrap.Modal(voterModalEl);
+  const qrModalEl = document.getElementById("meetingQrModal");
+  const qrModal = new bootstrap.Modal(qrModalEl);
+  const qrError = document.getElementById("meetingQrError");
+  const qrLoading = document.getElementById("meetingQrLoading");
+  const qrImage = document.getElementById("meetingQrImage");
+  const qrJoinUrlInput = document.getElementById("meetingQrJoinUrl");
+  const qrStatusBadge = document.getElementById("meetingQrStatusBadge");
+  const copyMeetingJoinUrlBtn = document.getElementById("copyMeetingJoinUrl");
+
+  function setQrState({ loading = false, error = "", joinUrl = "", registrationOpen = false } = {}) {
+    qrLoading.classList.toggle("d-none", !loading);
+    qrImage.classList.toggle("d-none", loading || !joinUrl);
+    qrError.classList.toggle("d-none", !error);
+    qrError.textContent = error;
+    qrJoinUrlInput.value = joinUrl;
+    qrStatusBadge.classList.toggle("d-none", !registrationOpen);
+  }
+
+  function buildQrImageUrl(joinUrl) {
+    return `https://api.qrserver.com/v1/create-qr-code/?size=280x280&data=${encodeURIComponent(joinUrl)}`;
+  }
+
+  async function openMeetingQrModal(meetingId) {
+    qrModal.show();
+    setQrState({ loading: true });
+
+    try {
+      const response = await fetch(`/admin/meetings/${meetingId}/join-token`, {
+        method: "POST",
+        headers: { "X-Requested-With": "XMLHttpRequest" },
+      });
+
+      if (!response.ok) {
+        let message = "Failed to generate the meeting QR code.";
+        try {
+          const data = await response.json();
+          if (data && data.error) message = data.error;
+        } catch (err) { /* ignore parse errors */ }
+        throw new Error(message);
+      }
+
+      const data = await response.json();
+      qrImage.src = buildQrImageUrl(data.join_url);
+      setQrState({
+        loading: false,
+        joinUrl: data.join_url,
+        registrationOpen: data.registration_open,
+      });
+    } catch (err) {
+      qrImage.removeAttribute("src");
+      setQrState({ loading: false, error: err.message });
+    }
+  }
+
+  function setVoterLoading(isLoading) {
+    voterSubmit.disabled = isLoading;
+    voterSubmit.innerHTML = isLoading
+      ? '<span class="spinner-border spinner-border-sm me-2" role="status" aria-hidden="true"></span>Saving...'
+      : "Add Voter";
+  }
+
+  voterForm.addEventListener("submit", async (event) => {
+    event.preventDefault();
+    setVoterLoading(true);
+
+    const formData = new FormData(voterForm);
+    try {
+      const response = await fetch(voterForm.dataset.action, {
+        method: "POST",
+        body: formData,
+        headers: { "X-Requested-With": "XMLHttpRequest" },
+      });
+
+      if (!response.ok) {
+        let message = "Failed to add voter.";
+        try {
+          const data = await response.json();
+          if (data && data.error) message = data.error;
+        } catch (err) { /* ignore parse errors */ }
+        throw new Error(message);
+      }
+
+      voterModal.hide();
+      try {
+        sessionStorage.setItem("vpFlash", JSON.stringify({
+          type: "success",
+          message: "Voter added successfully."
+        }));
+      } catch (e) { /* ignore */ }
+      window.location.reload();
+    } catch (err) {
+      voterError.classList.add("d-none");
+      if (typeof showFlashModal === "function") {
+        showFlashModal("danger", err.message);
+      } else {
+        alert(err.message);
+      }
+    } finally {
+      setVoterLoading(false);
+    }
+  });
+
+  voterModalEl.addEventListener("hidden.bs.modal", () => {
+    voterForm.reset();
+    voterError.classList.add("d-none");
+    setVoterLoading(false);
+  });
+
+  document.querySelectorAll(".generate-qr-btn").forEach(btn => {
+    btn.addEventListener("click", () => {
+      openMeetingQrModal(btn.dataset.meetingId);
+    });
+  });
+
+  copyMeetingJoinUrlBtn.addEventListener("click", async () => {
+    if (!qrJoinUrlInput.value) {
+      return;
+    }
+
+    try {
+      await navigator.clipboard.writeText(qrJoinUrlInput.value);
+      if (typeof showFlashModal === "function") {
+        showFlashModal("success", "Meeting join link copied.");
+      }
+    } catch (err) {
+      if (typeof showFlashModal === "function") {
+        showFlashModal("danger", "Failed to copy join link.");
+      }
+    }
+  });
+
+  qrModalEl.addEventListener("hidden.bs.modal", () => {
+    qrImage.removeAttribute("src");
+    setQrState();
+  });
+
+  // --- Edit and Delete Voter Logic ---
+  const editVoterModal = new bootstrap.Modal(document.getElementById('editVoterModal'));
+  const deleteVoterModal = new bootstrap.Modal(document.getElementById('deleteVoterModal'));
+  let currentVoterId = null;
+
+  // Open Edit Modal
+  document.querySelectorAll('.edit-voter-btn').forEach(btn => {
+    btn.addEventListener('click', () => {
+      currentVoterId = btn.dataset.voterId;
+      document.getElementById('editVoterStudentId').value = btn.dataset.voterStudentId;
+      document.getElementById('editVoterName').value = btn.dataset.voterName;
+      editVoterModal.show();
+    });
+  });
+
+  // Submit Edit
+  document.getElementById('editVoterForm').addEventListener('submit', async (e) => {
+    e.preventDefault();
+    const formData = new FormData(e.target);
+    const url = `/admin/voter/${currentVoterId}/update`; 
+
+    try {
+      const response = await fetch(url, {
+        method: 'POST',
+        body: formData,
+        headers: { "X-Requested-With": "XMLHttpRequest" }
+      });
+      if (response.ok) {
+        window.location.reload();
+        return;
+      }
+
+      let message = "Failed to update voter";
+      try {
+        const data = await response.json();
+        if (data && data.error) message = data.error;
+      } catch (err) { /* ignore parse errors */ }
+      alert(message);
+    } catch (err) { console.error(err); }
+  });
+
+  // Open Delete Modal
+  document.querySelectorAll('.delete-voter-btn').forEach(btn => {
+    btn.addEventListener('click', () => {
+      currentVoterId = btn.dataset.voterId;
+      document.getElementById('deleteVoterName').textContent = btn.dataset.voterName;
+      deleteVoterModal.show();
+    });
+  });
+
+  // Copy voter link
+  document.querySelectorAll('.copy-voter-link-btn').forEach(btn => {
+    btn.addEventListener('click', async () => {
+      const link = btn.dataset.voterLink;
+      try {
+        await navigator.clipboard.writeText(link);
+        if (typeof showFlashModal === "function") {
+          showFlashModal("success", "Voter link copied.");
+        }
+      } catch (err) {
+        if (typeof showFlashModal === "function") {
+          showFlashModal("danger", "Failed to copy link.");
+        }
+      }
+    });
+  });
+
+  // Confirm Delete
+  document.getElementById('confirmDeleteVoter').addEventListener('click', async () => {
+    // Assumes a route like /admin/voter/<id>/delete
+    const url = `/admin/voter/${currentVoterId}/delete`;
+
+    try {
+      const response = await fetch(url, { 
+        method: 'POST',
+        headers: { "X-Requested-With": "XMLHttpRequest" } 
+      });
+      if (response.ok) window.location.reload();
+      else alert("Failed to delete voter");
+    } catch (err) { console.error(err); }
+  });
+
+  // --- Edit and Delete Motion Logic ---
+  const editMotionModal = new bootstrap.Modal(document.getElementById('editMotionModal'));
+  const editTypeSelect = document.getElementById("editMotionType");
+  const editCandidatesGroup = document.getElementById("editCandidatesGroup");
+  const editOptionsText = document.getElementById("editMotionOptions");
+  const editWinnersGroup = document.getElementById("editNumWinnersGroup");
+  const editPreferenceMethodGroup = document.getElementById("editPreferenceMethodGroup");
+  const editPreferenceMethodInput = document.getElementById("editMotionPreferenceMethod");
+  const editThresholdGroup = document.getElementById("editYesNoThresholdGroup");
+  const editThresholdInput = document.getElementById("editMotionThreshold");
+  const editScoreMaxGroup = document.getElementById("editScoreMaxGroup");
+  const editScoreMaxInput = document.getElementById("editMotionScoreMax");
+  const editBudgetPointsGroup = document.getElementById("editBudgetPointsGroup");
+  const editBudgetPointsInput = document.getElementById("editMotionBudgetPoints");
+
+  const deleteMotionModal = new bootstrap.Modal(document.getElementById('deleteMotionModal'));
+  let currentMotionId = null;
+
+  function updateEditVisibility() {
+    const t = editTypeSelect.value;
+    const needsCandidates = t !== "YES_NO";
+
+    editCandidatesGroup.style.display = needsCandidates ? "block" : "none";
+
+    editOptionsText.disabled = !needsCandidates;
+    editOptionsText.classList.toggle("bg-light", !needsCandidates);
+    editWinnersGroup.style.display = (t === "PREFERENCE") ? "block" : "none";
+    editPreferenceMethodGroup.style.display = (t === "PREFERENCE") ? "block" : "none";
+    editPreferenceMethodInput.disabled = t !== "PREFERENCE";
+    editThresholdGroup.style.display = (t === "YES_NO") ? "block" : "none";
+    editThresholdInput.disabled = t !== "YES_NO";
+    editScoreMaxGroup.style.display = (t === "SCORE") ? "block" : "none";
+    editScoreMaxInput.disabled = t !== "SCORE";
+    editBudgetPointsGroup.style.display = (t === "CUMULATIVE") ? "block" : "none";
+    editBudgetPointsInput.disabled = t !== "CUMULATIVE";
+
+    if (t !== "YES_NO") {
+      editThresholdInput.value = "";
+    } else if (!editThresholdInput.value) {
+      editThresholdInput.value = "50";
+    }
+
+    if (t !== "SCORE") {
+      editScoreMaxInput.value = "";
+    } else if (!editScoreMaxInput.value) {
+      editScoreMaxInput.value = "10";
+    }
+
+    if (t !== "CUMULATIVE") {
+      editBudgetPointsInput.value = "";
+    } else if (!editBudgetPointsInput.value) {
+      editBudgetPointsInput.value = "10";
+    }
+  }
+
+  editTypeSelect.addEventListener("change", updateEditVisibility);
+
+  document.querySelectorAll('.edit-motion-btn').forEach(btn => {
+    btn.addEventListener('click', () => {
+      currentMotionId = btn.dataset.motionId;
+      document.getElementById('editMotionTitle').value = btn.dataset.motionTitle;
+      editTypeSelect.value = btn.dataset.motionType;
+      editOptionsText.value = btn.dataset.motionOptions;
+      // set status
+      var statusSelect = document.getElementById('editMotionStatus');
+      if (statusSelect && btn.dataset.motionStatus) {
+        statusSelect.value = btn.dataset.motionStatus;
+      }
+      document.getElementById('editMotionNumWinners').value = btn.dataset.motionWinners;
+      editPreferenceMethodInput.value = btn.dataset.motionPreferenceMethod || "STV";
+      editThresholdInput.value = btn.dataset.motionThreshold || "50";
+      editScoreMaxInput.value = btn.dataset.motionScoreMax || "10";
+      editBudgetPointsInput.value = btn.dataset.motionBudget || "10";
+
+      updateEditVisibility();
+      editMotionModal.show();
+    });
+  });
+
+  // Submit Edit Motion Form
+  document.getElementById('editMotionForm').addEventListener('submit', async (e) => {
+    e.preventDefault();
+    const formData = new FormData(e.target);
+    const url = `/admin/motion/${currentMotionId}/update`; 
+
+    try {
+      const response = await fetch(url, {
+        method: 'POST',
+        body: formData,
+        headers: { "X-Requested-With": "XMLHttpRequest" }
+      });
+      if (response.ok) window.location.reload();
+      else alert("Failed to update motion title.");
+    } catch (err) { console.error(err); }
+  });
+
+  // Open Delete Motion Modal
+  document.querySelectorAll('.delete-motion-btn').forEach(btn => {
+    btn.addEventListener('click', () => {
+      currentMotionId = btn.dataset.motionId;
+      document.getElementById('deleteMotionTitleDisplay').textContent = btn.dataset.motionTitle;
+      console.log(btn.dataset.motionTitle);
+      console.log(111111);
+      deleteMotionModal.show();
+      console.log(22222);
+    });
+  });
+
+  // Confirm Delete Motion
+  document.getElementById('confirmDeleteMotion').addEventListener('click', async () => {
+    const url = `/admin/motion/${currentMotionId}/delete`;
+
+    try {
+      const response = await fetch(url, { 
+        method: 'POST',
+        headers: { "X-Requested-With": "XMLHttpRequest" } 
+      });
+      if (response.ok) window.location.reload();
+      else alert("Failed to delete motion.");
+    } catch (err) { console.error(err); }
+  });
+});
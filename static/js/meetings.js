@@ -0,0 +1,168 @@
+// Search logic handles both Cards and Table rows
+document.getElementById("meetingSearch").addEventListener("input", function () {
+    const q = this.value.trim().toLowerCase();
+    const rows = document.querySelectorAll(".meeting-row");
+    let visibleCount = 0;
+
+    rows.forEach(row => {
+        const searchable = row.getAttribute("data-searchable").toLowerCase();
+        const match = searchable.includes(q);
+        row.classList.toggle("d-none", !match);
+        if (match) visibleCount++;
+    });
+    document.getElementById("noResults").classList.toggle("d-none", visibleCount !== 0);
+});
+
+document.addEventListener("DOMContentLoaded", function () {
+    const createMeetingModalEl = document.getElementById("createMeetingModal");
+    const createMeetingModal = new bootstrap.Modal(createMeetingModalEl);
+    const createMeetingForm = document.getElementById("createMeetingForm");
+    const createMeetingSubmit = document.getElementById("createMeetingSubmit");
+    const createMeetingError = document.getElementById("createMeetingError");
+
+    function setCreateMeetingLoading(isLoading) {
+        createMeetingSubmit.disabled = isLoading;
+        createMeetingSubmit.innerHTML = isLoading
+            ? '<span class="spinner-border spinner-border-sm me-2" role="status" aria-hidden="true"></span>Creating...'
+            : "Create Meeting";
+    }
+
+    createMeetingForm.addEventListener("submit", async (event) => {
+        event.preventDefault();
+        createMeetingError.classList.add("d-none");
+        setCreateMeetingLoading(true);
+
+        const formData = new FormData(createMeetingForm);
+        try {
+            const response = await fetch(createMeetingForm.dataset.action, {
+                method: "POST",
+                body: formData,
+                headers: { "X-Requested-With": "XMLHttpRequest" },
+            });
+
+            if (!response.ok) {
+                let message = "Failed to create meeting.";
+                try {
+                    const data = await response.json();
+                    if (data && data.error) message = data.error;
+                } catch (err) { /* ignore parse errors */ }
+                throw new Error(message);
+            }
+
+            createMeetingModal.hide();
+            try {
+                sessionStorage.setItem("vpFlash", JSON.stringify({
+                    type: "success",
+                    message: "Meeting created successfully."
+                }));
+            } catch (e) { /* ignore */ }
+            window.location.reload();
+        } catch (err) {
+            createMeetingError.textContent = err.message;
+            createMeetingError.classList.remove("d-none");
+        } finally {
+            setCreateMeetingLoading(false);
+        }
+    });
+
+    createMeetingModalEl.addEventListener("hidden.bs.modal", () => {
+        createMeetingForm.reset();
+        createMeetingError.classList.add("d-none");
+        setCreateMeetingLoading(false);
+    });
+
+    const deleteModalEl = document.getElementById('deleteConfirmModal');
+    const deleteModal = new bootstrap.Modal(deleteModalEl);
+    const confirmDeleteBtn = document.getElementById('confirmDeleteSubmit');
+    const deleteTargetTitle = document.getElementById('deleteTargetTitle');
+
+    let currentDeleteUrl = "";
+    let currentDeleteBtn = null;
+
+    // Triggered when any "Delete" button in the list is clicked
+    document.querySelectorAll(".delete-meeting-btn").forEach((btn) => {
+        btn.addEventListener("click", () => {
+            currentDeleteUrl = btn.dataset.url;
+            currentDeleteBtn = btn;
+            deleteTargetTitle.textContent = btn.dataset.title;
+            deleteModal.show(); // Show the Bootstrap Modal instead of confirm()
+        });
+    });
+
+    // Handle the final confirmation click inside the modal
+    confirmDeleteBtn.addEventListener("click", async () => {
+        confirmDeleteBtn.disabled = true;
+        confirmDeleteBtn.innerHTML = '<span class="spinner-border spinner-border-sm me-2"></span>Deleting...';
+
+        try {
+            const response = await fetch(currentDeleteUrl, {
+                method: "POST",
+                headers: { "X-Requested-With": "XMLHttpRequest" },
+            });
+
+            if (!response.ok) throw new Error("Failed to delete meeting.");
+
+            deleteModal.hide();
+            try {
+                sessionStorage.setItem("vpFlash", JSON.stringify({
+                    type: "success",
+                    message: "Meeting deleted successfully."
+                }));
+            } catch (e) { /* ignore */ }
+            window.location.reload(); // Refresh the list
+        } catch (err) {
+            alert(err.message);
+            confirmDeleteBtn.disabled = false;
+            confirmDeleteBtn.innerHTML = "Delete Meeting";
+        }
+    });
+
+    const editMeetingModalEl = document.getElementById("editMeetingModal");
+    const editMeetingModal = new bootstrap.Modal(editMeetingModalEl);
+    const editMeetingForm = document.getElementById("editMeetingForm");
+    const editMeetingError = document.getElementById("editMeetingError");
+
+    document.querySelectorAll(".edit-meeting-btn").forEach((btn) => {
+        btn.addEventListener("click", () => {
+            editMeetingForm.action = btn.dataset.url;
+            document.getElementById("editMeetingTitle").value = btn.dataset.title || "";
+            document.getElementById("editMeetingDescription").value = btn.dataset.description || "";
+            document.getElementById("editMeetingDate").value = btn.dataset.meetingDate || "";
+            document.getElementById("editStartTime").value = btn.dataset.startTime || "";
+            document.getElementById("editEndTime").value = btn.dataset.endTime || "";
+            editMeetingError.classList.add("d-none");
+            editMeetingModal.show();
+        });
+    });
+
+    editMeetingForm.addEventListener("submit", async (event) => {
+        event.preventDefault();
+        editMeetingError.classList.add("d-none");
+        const formData = new FormData(editMeetingForm);
+        try {
+            const response = await fetch(editMeetingForm.action, {
+                method: "POST",
+                body: formData,
+                headers: { "X-Requested-With": "XMLHttpRequest" },
+            });
+            if (!response.ok) {
+                let message = "Failed to update meeting.";
+                try {
+                    const data = await response.json();
+                    if (data && data.error) message = data.error;
+                } catch (err) { /* ignore */ }
+                throw new Error(message);
+            }
+            editMeetingModal.hide();
+            window.location.reload();
+        } catch (err) {
+            editMeetingError.textContent = err.message;
+            editMeetingError.classList.remove("d-none");
+            if (typeof showFlashModal === "function") {
+                showFlashModal("danger", err.message);
+            }
+        }
+    });
+});
+
+// Existing Fetch/Delete/Modal logic stays same as app.py uses standard routes
@@ -0,0 +1,29 @@
+(function () {
+  'use strict'
+  const form = document.querySelector('.needs-validation')
+  const password = document.getElementById('password')
+  const confirm = document.getElementById('confirm_password')
+
+  form.addEventListener('submit', function (event) {
+    if (password.value.length < 8) {
+      password.setCustomValidity('Invalid');
+    } else {
+      password.setCustomValidity('');
+    }
+
+    if (password.value !== confirm.value) {
+      confirm.setCustomValidity('Invalid');
+    } else {
+      confirm.setCustomValidity('');
+    }
+
+    if (!form.checkValidity()) {
+      event.preventDefault()
+      event.stopPropagation()
+    }
+    form.classList.add('was-validated')
+  }, false)
+
+  password.addEventListener('input', () => password.setCustomValidity(''));
+  confirm.addEventListener('input', () => confirm.setCustomValidity(''));
+})()
@@ -0,0 +1,54 @@
+(function () {
+  'use strict'
+
+  const form = document.querySelector('.needs-validation')
+  const usernameInput = document.getElementById('username')
+  const usernameFeedback = document.getElementById('username-feedback')
+
+  // Function to check username existence in DB
+  async function validateUsername() {
+    const username = usernameInput.value.trim();
+    if (username.length < 3) return;
+
+    try {
+      const response = await fetch(form.dataset.checkUrl, {
+        method: "POST",
+        headers: { "Content-Type": "application/json" },
+        body: JSON.stringify({ username: username })
+      });
+      const data = await response.json();
+
+      if (data.exists) {
+        // Manually set field as invalid if username exists in DB
+        usernameInput.setCustomValidity("Username already exists.");
+        usernameFeedback.textContent = "Username already exists.";
+      } else {
+        usernameInput.setCustomValidity("");
+        usernameFeedback.textContent = "Please choose a username.";
+      }
+    } catch (error) {
+      console.error("Error checking username:", error);
+    }
+  }
+
+  // Check username when user leaves the field or stops typing
+  usernameInput.addEventListener('blur', validateUsername);
+
+  form.addEventListener('submit', function (event) {
+    // Re-run the checks before final submission
+    const password = document.getElementById('password')
+    const confirm = document.getElementById('confirm_password')
+
+    if (password.value !== confirm.value) {
+      confirm.setCustomValidity('Passwords do not match')
+    } else {
+      confirm.setCustomValidity('')
+    }
+
+    if (!form.checkValidity()) {
+      event.preventDefault()
+      event.stopPropagation()
+    }
+    form.classList.add('was-validated')
+  }, false)
+})()
@@ -0,0 +1,32 @@
+(function initCumulativeBudget() {
+  const inputs = document.querySelectorAll(".cumulative-points-input");
+  if (!inputs.length) return;
+
+  const mobileValue = document.getElementById("totalPointsMobileValue");
+  const desktopValue = document.getElementById("totalPointsDesktopValue");
+
+  function readValue(input) {
+    const raw = (input.value || "").trim();
+    if (raw === "") return 0;
+    const num = Number(raw);
+    return Number.isFinite(num) ? num : 0;
+  }
+
+  function updateTotal() {
+    let total = 0;
+    inputs.forEach((input) => {
+      if (input.offsetParent === null) return;
+      total += readValue(input);
+    });
+    const display = Number.isFinite(total) ? total.toFixed(1) : "0.0";
+
+    if (mobileValue) mobileValue.textContent = display;
+    if (desktopValue) desktopValue.textContent = display;
+  }
+
+  inputs.forEach((input) => {
+    input.addEventListener("input", updateTotal);
+  });
+
+  updateTotal();
+})();
@@ -0,0 +1,79 @@
+// Service worker for the voter pages: keeps the motion list, ballot
+// definitions and static assets available when the connection drops.
+// Ballots themselves are queued by voter.js, not here.
+const CACHE = "votora-voter-v1";
+
+self.addEventListener("install", function () {
+  self.skipWaiting();
+});
+
+self.addEventListener("activate", function (event) {
+  event.waitUntil(
+    caches
+      .keys()
+      .then(function (names) {
+        return Promise.all(
+          names
+            .filter(function (name) {
+              return name.startsWith("votora-voter-") && name !== CACHE;
+            })
+            .map(function (name) {
+              return caches.delete(name);
+            })
+        );
+      })
+      .then(function () {
+        return self.clients.claim();
+      })
+  );
+});
+
+function networkFirst(request) {
+  return fetch(request)
+    .then(function (response) {
+      if (response.ok) {
+        const copy = response.clone();
+        caches.open(CACHE).then(function (cache) {
+          cache.put(request, copy);
+        });
+      }
+      return response;
+    })
+    .catch(function (error) {
+      return caches.match(request).then(function (cached) {
+        if (cached) return cached;
+        throw error;
+      });
+    });
+}
+
+function cacheFirst(request) {
+  return caches.match(request).then(function (cached) {
+    if (cached) return cached;
+    return fetch(request).then(function (response) {
+      if (response.ok) {
+        const copy = response.clone();
+        caches.open(CACHE).then(function (cache) {
+          cache.put(request, copy);
+        });
+      }
+      return response;
+    });
+  });
+}
+
+self.addEventListener("fetch", function (event) {
+  const request = event.request;
+  if (request.method !== "GET") return;
+
+  const url = new URL(request.url);
+  if (url.origin === self.location.origin) {
+    if (url.pathname.startsWith("/vote/") || url.pathname.startsWith("/api/vote/")) {
+      event.respondWith(networkFirst(request));
+    } else if (url.pathname.startsWith("/static/")) {
+      event.respondWith(cacheFirst(request));
+    }
+  } else if (url.hostname === "cdn.jsdelivr.net") {
+    event.respondWith(cacheFirst(request));
+  }
+});
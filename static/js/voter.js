@@ -0,0 +1,417 @@
+// Voter client: opens ballots in a modal and submits them to the JSON API,
+// so a vote is one small request and the motion list updates in place.
+// Ballot definitions are kept in localStorage and ballots cast while the
+// connection is down are queued there, then sent together in one batch
+// request once it returns. Without JavaScript the motion links fall back
+// to the form pages.
+(function () {
+  const root = document.querySelector("[data-ballot-url]");
+  const modalElement = document.getElementById("ballotModal");
+  if (!root || !modalElement || !window.fetch) return;
+
+  const ballotUrlTemplate = root.dataset.ballotUrl;
+  const ballotsUrl = root.dataset.ballotsUrl;
+  const storagePrefix = "votora:" + root.dataset.voterCode + ":";
+  const syncBanner = document.querySelector(".js-sync-banner");
+  const SYNC_INTERVAL_MS = 15000;
+  const MAX_RETRY_DELAY_MS = 5 * 60 * 1000;
+  const modal = bootstrap.Modal.getOrCreateInstance(modalElement);
+  const titleElement = modalElement.querySelector(".modal-title");
+  const bodyElement = modalElement.querySelector(".js-ballot-body");
+  const errorElement = modalElement.querySelector(".js-ballot-error");
+  const submitButton = modalElement.querySelector(".js-ballot-submit");
+  const form = modalElement.querySelector("form");
+
+  let current = null;
+  let syncing = false;
+  let serverFailures = 0;
+  let retryAt = 0;
+
+  function load(key, fallback) {
+    try {
+      return JSON.parse(localStorage.getItem(storagePrefix + key)) || fallback;
+    } catch (error) {
+      return fallback;
+    }
+  }
+
+  function save(key, value) {
+    try {
+      localStorage.setItem(storagePrefix + key, JSON.stringify(value));
+    } catch (error) {
+      // Private mode or a full quota: the client still works online.
+    }
+  }
+
+  function newToken() {
+    if (window.crypto && crypto.randomUUID) return crypto.randomUUID().replace(/-/g, "");
+    return Date.now().toString(16) + Math.random().toString(16).slice(2);
+  }
+
+  function cachedDefinition(motionId) {
+    const motion = load("motions", []).find(function (entry) {
+      return String(entry.id) === String(motionId);
+    });
+    if (!motion) return null;
+    const queued = load("queue", {})[motion.id];
+    return {
+      motion: motion,
+      choices: queued ? queued.choices : motion.choices,
+      token: newToken(),
+      version: queued ? queued.version : motion.version,
+    };
+  }
+
+  function cacheRecorded(motionId, choices, version) {
+    // Keep the offline copy in step with a ballot the server accepted, so a
+    // later offline edit is based on the version that ballot created.
+    const motions = load("motions", []);
+    motions.forEach(function (motion) {
+      if (String(motion.id) !== String(motionId)) return;
+      motion.choices = choices;
+      motion.version = (version || 0) + 1;
+    });
+    save("motions", motions);
+  }
+
+  function ballotUrl(motionId) {
+    return ballotUrlTemplate.replace("/motions/0/", "/motions/" + motionId + "/");
+  }
+
+  function showError(message) {
+    errorElement.textContent = message;
+    errorElement.classList.toggle("d-none", !message);
+  }
+
+  function el(tag, className, text) {
+    const node = document.createElement(tag);
+    if (className) node.className = className;
+    if (text !== undefined) node.textContent = text;
+    return node;
+  }
+
+  function numberRow(option, value, attrs) {
+    const row = el("div", "d-flex align-items-center justify-content-between gap-2 border rounded-3 p-2");
+    row.appendChild(el("div", "fw-medium", option[1]));
+    const input = el("input", "form-control form-control-sm text-center js-choice");
+    input.type = "number";
+    input.style.maxWidth = "6rem";
+    input.dataset.optionId = option[0];
+    Object.keys(attrs).forEach(function (name) {
+      input.setAttribute(name, attrs[name]);
+    });
+    if (value !== undefined && value !== null) input.value = value;
+    row.appendChild(input);
+    return row;
+  }
+
+  function renderBallot(motion, choices) {
+    const values = {};
+    choices.forEach(function (choice) {
+      values[choice[0]] = choice[1] === null ? true : choice[1];
+    });
+
+    bodyElement.replaceChildren();
+    const list = el("div", "d-grid gap-2");
+
+    if (motion.type === "YES_NO" || motion.type === "FPTP") {
+      list.appendChild(
+        el("p", "text-muted small mb-1", motion.type === "YES_NO" ? "Cast your vote" : "Select one candidate")
+      );
+      motion.options.forEach(function (option) {
+        const input = el("input", "btn-check js-choice");
+        input.type = "radio";
+        input.name = "option";
+        input.id = "ballot_opt_" + option[0];
+        input.value = option[0];
+        input.checked = values[option[0]] === true;
+        const label = el("label", "btn btn-outline-primary text-start p-3", option[1]);
+        label.htmlFor = input.id;
+        list.append(input, label);
+      });
+    } else if (motion.type === "PREFERENCE") {
+      list.appendChild(el("p", "text-muted small mb-1", "Enter numbers (1 = highest preference)."));
+      motion.options.forEach(function (option) {
+        list.appendChild(numberRow(option, values[option[0]], { min: 1, max: motion.options.length }));
+      });
+    } else if (motion.type === "SCORE") {
+      list.appendChild(el("p", "text-muted small mb-1", "Score each option from 0 to " + motion.score_max + "."));
+      motion.options.forEach(function (option) {
+        list.appendChild(numberRow(option, values[option[0]], { min: 0, max: motion.score_max, step: 0.1 }));
+      });
+    } else if (motion.type === "CUMULATIVE") {
+      list.appendChild(el("p", "text-muted small mb-1", "Allocate exactly " + motion.budget_points + " points."));
+      motion.options.forEach(function (option) {
+        list.appendChild(numberRow(option, values[option[0]], { min: 0, step: 0.1 }));
+      });
+      const total = el("div", "py-2 px-3 rounded-3 bg-info-subtle border border-info-subtle");
+      list.appendChild(total);
+      const updateTotal = function () {
+        let sum = 0;
+        list.querySelectorAll(".js-choice").forEach(function (input) {
+          sum += Number(input.value) || 0;
+        });
+        total.textContent = "Total allocated: " + sum.toFixed(1) + " / " + motion.budget_points + " points";
+      };
+      list.addEventListener("input", updateTotal);
+      updateTotal();
+    }
+
+    bodyElement.appendChild(list);
+  }
+
+  function readChoices(motion) {
+    const inputs = Array.from(bodyElement.querySelectorAll(".js-choice"));
+    if (motion.type === "YES_NO" || motion.type === "FPTP") {
+      const selected = inputs.find(function (input) {
+        return input.checked;
+      });
+      return selected ? [[Number(selected.value), null]] : [];
+    }
+    return inputs
+      .filter(function (input) {
+        return input.value.trim() !== "";
+      })
+      .map(function (input) {
+        return [Number(input.dataset.optionId), Number(input.value)];
+      });
+  }
+
+  function setVoteState(motionId, text, className, icon) {
+    document.querySelectorAll('[data-motion-id="' + motionId + '"] .js-vote-state').forEach(function (state) {
+      const badge = el("div", className + " d-flex align-items-center fw-medium small text-nowrap");
+      badge.append(el("i", "bi " + icon + " me-1"), el("span", "", text));
+      state.replaceChildren(badge);
+    });
+  }
+
+  function markVoted(motionId) {
+    document.querySelectorAll('[data-motion-id="' + motionId + '"]').forEach(function (link) {
+      const card = link.querySelector(".card");
+      if (card) {
+        card.classList.remove("border-primary");
+        card.classList.add("border-success", "bg-light-subtle");
+      }
+    });
+    setVoteState(motionId, "Voted", "text-success", "bi-check-circle-fill");
+  }
+
+  function showBanner(message, tone) {
+    if (!syncBanner) return;
+    syncBanner.textContent = message;
+    syncBanner.className = "alert small js-sync-banner alert-" + tone + (message ? "" : " d-none");
+  }
+
+  function refreshBanner() {
+    const count = Object.keys(load("queue", {})).length;
+    if (count) {
+      showBanner(
+        count + (count === 1 ? " vote is" : " votes are") + " saved on this device and will be sent when you are back online.",
+        "warning"
+      );
+    } else {
+      showBanner("", "warning");
+    }
+  }
+
+  function queueBallot(motion, choices, token, version) {
+    const queue = load("queue", {});
+    queue[motion.id] = { motion_id: motion.id, choices: choices, token: token, version: version };
+    save("queue", queue);
+    setVoteState(motion.id, "Queued", "text-warning", "bi-cloud-arrow-up");
+    refreshBanner();
+  }
+
+  function syncQueue() {
+    const queue = load("queue", {});
+    const ballots = Object.keys(queue).map(function (motionId) {
+      return queue[motionId];
+    });
+    if (!ballots.length || syncing || navigator.onLine === false || Date.now() < retryAt) return;
+
+    syncing = true;
+    fetch(ballotsUrl, {
+      method: "POST",
+      headers: { "Content-Type": "application/json", Accept: "application/json" },
+      body: JSON.stringify({ ballots: ballots }),
+    })
+      .then(function (response) {
+        const isJson = (response.headers.get("Content-Type") || "").indexOf("application/json") !== -1;
+        return (isJson ? response.json() : Promise.resolve(null))
+          .catch(function () {
+            return null;
+          })
+          .then(function (data) {
+            return { status: response.status, ok: response.ok, data: data };
+          });
+      })
+      .then(function (result) {
+        const data = result.data || {};
+        const rejected = result.status >= 400 && result.status < 500;
+        if (!rejected && !(result.ok && data.ok)) {
+          // The server is up but failing: keep the votes, back off and say so.
+          serverFailures += 1;
+          retryAt = Date.now() + Math.min(SYNC_INTERVAL_MS * Math.pow(2, serverFailures), MAX_RETRY_DELAY_MS);
+          showBanner(
+            "The server could not record your saved votes yet. They stay on this device and will be retried.",
+            "danger"
+          );
+          return;
+        }
+        serverFailures = 0;
+        retryAt = 0;
+
+        const latest = load("queue", {});
+        // Only drop what was sent: a ballot queued during the request stays.
+        const settle = function (motionId) {
+          if (latest[motionId] && queue[motionId] && latest[motionId].token === queue[motionId].token) {
+            delete latest[motionId];
+          }
+        };
+        if (data.ok) {
+          ballots.forEach(function (ballot) {
+            settle(ballot.motion_id);
+            cacheRecorded(ballot.motion_id, ballot.choices, ballot.version);
+            markVoted(ballot.motion_id);
+          });
+          save("queue", latest);
+          refreshBanner();
+          return;
+        }
+        // A 4xx is final. With per-ballot errors the batch is all or nothing:
+        // drop the rejected ballots and keep the rest for the next attempt.
+        // Without them (say, the voting link no longer works) resending
+        // cannot succeed, so the whole batch is dropped.
+        const errors = Array.isArray(data.errors) ? data.errors : null;
+        (errors || ballots).forEach(function (entry) {
+          settle(entry.motion_id);
+        });
+        save("queue", latest);
+        refreshBanner();
+        showBanner(
+          "Some saved votes could not be recorded: " +
+            (errors || [{ error: data.error || "The server rejected them." }])
+              .map(function (error) {
+                return error.error;
+              })
+              .join(" "),
+          "danger"
+        );
+      })
+      .catch(function () {
+        // Still offline; try again later.
+      })
+      .finally(function () {
+        syncing = false;
+      });
+  }
+
+  function cacheBallots() {
+    if (navigator.onLine === false) return;
+    fetch(ballotsUrl, { headers: { Accept: "application/json" } })
+      .then(function (response) {
+        return response.json();
+      })
+      .then(function (data) {
+        if (data.ok) save("motions", data.motions);
+      })
+      .catch(function () {});
+  }
+
+  function openBallot(link) {
+    const motionId = link.dataset.motionId;
+    showError("");
+    titleElement.textContent = "Loading...";
+    bodyElement.replaceChildren();
+    submitButton.disabled = true;
+    modal.show();
+
+    const show = function (data) {
+      current = data;
+      titleElement.textContent = data.motion.title;
+      renderBallot(data.motion, data.choices);
+      submitButton.disabled = false;
+    };
+
+    fetch(ballotUrl(motionId), { headers: { Accept: "application/json" } })
+      .then(function (response) {
+        return response.json();
+      })
+      .then(function (data) {
+        if (!data.ok) throw new Error(data.error);
+        show(data);
+      })
+      .catch(function (error) {
+        const cached = error instanceof TypeError ? cachedDefinition(motionId) : null;
+        if (cached) {
+          show(cached);
+        } else {
+          // Fall back to the form page if the API is unavailable.
+          window.location.href = link.href;
+        }
+      });
+  }
+
+  function submitBallot(event) {
+    event.preventDefault();
+    if (!current) return;
+
+    const motion = current.motion;
+    const token = current.token;
+    const version = current.version;
+    const choices = readChoices(motion);
+    if ((motion.type === "YES_NO" || motion.type === "FPTP") && !choices.length) {
+      showError("Please choose an option.");
+      return;
+    }
+
+    submitButton.disabled = true;
+    showError("");
+    fetch(ballotUrl(motion.id), {
+      method: "PUT",
+      headers: { "Content-Type": "application/json", Accept: "application/json" },
+      body: JSON.stringify({ choices: choices, token: token, version: version }),
+    })
+      .then(function (response) {
+        return response.json();
+      })
+      .then(function (data) {
+        if (!data.ok) throw new Error(data.error);
+        cacheRecorded(motion.id, choices, version);
+        markVoted(motion.id);
+        modal.hide();
+      })
+      .catch(function (error) {
+        if (error instanceof TypeError) {
+          queueBallot(motion, choices, token, version);
+          modal.hide();
+          return;
+        }
+        showError(error.message || "Could not submit your vote. Please try again.");
+      })
+      .finally(function () {
+        submitButton.disabled = false;
+      });
+  }
+
+  document.addEventListener("click", function (event) {
+    const link = event.target.closest("a[data-motion-id]");
+    if (!link || event.ctrlKey || event.metaKey || event.shiftKey) return;
+    event.preventDefault();
+    openBallot(link);
+  });
+  form.addEventListener("submit", submitBallot);
+
+  window.addEventListener("online", syncQueue);
+  setInterval(syncQueue, SYNC_INTERVAL_MS);
+  Object.keys(load("queue", {})).forEach(function (motionId) {
+    setVoteState(motionId, "Queued", "text-warning", "bi-cloud-arrow-up");
+  });
+  refreshBanner();
+  syncQueue();
+  cacheBallots();
+
+  if ("serviceWorker" in navigator && root.dataset.serviceWorker) {
+    navigator.serviceWorker.register(root.dataset.serviceWorker, { scope: "/vote/" }).catch(function () {});
+  }
+})();
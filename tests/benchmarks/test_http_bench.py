@@ -0,0 +1,17 @@
+import json
+
+from benchmarks import http_bench
+
+
+def test_http_bench_compares_both_modes(tmp_path):
+    output = tmp_path / "http.json"
+    assert http_bench.main(["--requests", "3", "--workdir", str(tmp_path), "--output", str(output)]) == 0
+
+    results = json.loads(output.read_text())
+    before = {row["endpoint"]: row for row in results["before"]}
+    after = {row["endpoint"]: row for row in results["after"]}
+    assert set(before) == set(after) == {label for label, _path, _signed_in in http_bench.PAGES}
+    for label, row in after.items():
+        assert row["statuses"] == [200], label
+    assert after["GET /"]["bytes_per_request"] < before["GET /"]["bytes_per_request"] / 2
+    assert after["GET /robots.txt"]["bytes_per_request"] == before["GET /robots.txt"]["bytes_per_request"]
@@ -0,0 +1,45 @@
+import json
+
+from app import create_app
+from app.extensions import db
+from app.models import User
+from benchmarks import load_test
+
+
+def test_load_test_seeds_meeting_and_reports_every_endpoint(tmp_path):
+    output = tmp_path / "load.json"
+    exit_code = load_test.main(
+        [
+            "--voters", "4",
+            "--concurrency", "2",
+            "--options", "3",
+            "--workdir", str(tmp_path),
+            "--output", str(output),
+        ]
+    )
+    assert exit_code == 0
+
+    summary = json.loads(output.read_text())
+    assert summary["ballots"] == 4 * len(load_test.MOTION_TYPES)
+    endpoints = {row["endpoint"]: row for row in summary["endpoints"]}
+    assert endpoints["POST /join/meeting/<token>"]["requests"] == 4
+    assert endpoints["GET /vote/<code>/motion/<id>"]["requests"] == 4 * len(load_test.MOTION_TYPES)
+    for motion_type in load_test.MOTION_TYPES:
+        row = endpoints[f"POST /vote/<code>/motion/<id> [{motion_type}]"]
+        assert row["errors"] == 0
+        assert row["db_statements"] > 0
+        assert row["p50_ms"] <= row["p99_ms"]
+
+
+def test_load_test_keeps_tables_of_a_supplied_database(tmp_path):
+    database_url = f"sqlite:///{tmp_path / 'dev.sqlite3'}"
+    app = create_app({"SQLALCHEMY_DATABASE_URI": database_url, "SQLALCHEMY_ENGINE_OPTIONS": {}})
+    with app.app_context():
+        db.create_all()
+        db.session.add(User(username="dev", email="dev@example.com", password_hash="x"))
+        db.session.commit()
+
+    load_test.main(["--voters", "1", "--concurrency", "1", "--database-url", database_url])
+
+    with app.app_context():
+        assert User.query.filter_by(username="dev").count() == 1
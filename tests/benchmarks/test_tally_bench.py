@@ -0,0 +1,47 @@
+import json
+
+from benchmarks import generators, tally_bench
+
+
+def test_preference_generators_are_deterministic():
+    for profile in generators.PROFILES:
+        first = generators.preference_ballots(profile, 50, 6, seed=3)
+        second = generators.preference_ballots(profile, 50, 6, seed=3)
+        assert first == second
+        assert len(first) == 50
+
+
+def test_runner_writes_report_and_flags_regressions(tmp_path, capsys):
+    output = tmp_path / "baseline.json"
+    exit_code = tally_bench.main(
+        [
+            "--sizes", "40",
+            "--profiles", "zipf",
+            "--engines", "count_stv,tally_score_votes",
+            "--candidates", "4",
+            "--repeat", "1",
+            "--output", str(output),
+        ]
+    )
+    assert exit_code == 0
+
+    report = json.loads(output.read_text())
+    assert {row["engine"] for row in report["results"]} == {"count_stv", "tally_score_votes"}
+    assert all(row["peak_bytes"] is not None for row in report["results"])
+
+    for row in report["results"]:
+        row["seconds"] = 1e-9
+    output.write_text(json.dumps(report))
+    exit_code = tally_bench.main(
+        [
+            "--sizes", "40",
+            "--profiles", "zipf",
+            "--engines", "count_stv",
+            "--candidates", "4",
+            "--repeat", "1",
+            "--skip-memory",
+            "--compare", str(output),
+        ]
+    )
+    assert exit_code == 1
+    assert "REGRESSION" in capsys.readouterr().out
@@ -0,0 +1,116 @@
+from app.models import Meeting, Motion, Option, PreferenceVote, Voter
+
+
+def _seed_preference_motion(db_session):
+    meeting = Meeting(title="Recount Meeting")
+    db_session.add(meeting)
+    db_session.flush()
+
+    motion = Motion(
+        meeting_id=meeting.id,
+        title="Committee Election",
+        type="PREFERENCE",
+        num_winners=1,
+    )
+    db_session.add(motion)
+    db_session.flush()
+
+    option_a = Option(motion_id=motion.id, text="Alice")
+    option_b = Option(motion_id=motion.id, text="Bob")
+    db_session.add_all([option_a, option_b])
+    db_session.flush()
+
+    rankings = [[option_a.id, option_b.id]] * 2 + [[option_b.id, option_a.id]]
+    for index, ranking in enumerate(rankings, start=1):
+        voter = Voter(
+            meeting_id=meeting.id,
+            student_id=f"54000000{index}",
+            name=f"V{index}",
+            code=f"RECOUNT{index}",
+        )
+        db_session.add(voter)
+        db_session.flush()
+        for rank, option_id in enumerate(ranking, start=1):
+            db_session.add(
+                PreferenceVote(
+                    voter_id=voter.id,
+                    motion_id=motion.id,
+                    option_id=option_id,
+                    preference_rank=rank,
+                )
+            )
+    db_session.commit()
+    return meeting, motion
+
+
+def test_recount_meeting_reports_winner(app, db_session):
+    meeting, _motion = _seed_preference_motion(db_session)
+
+    result = app.test_cli_runner().invoke(
+        args=["votora", "recount", "--meeting", str(meeting.id), "--show-log"]
+    )
+
+    assert result.exit_code == 0, result.output
+    assert "== Committee Election" in result.output
+    assert "Valid ballots: 3" in result.output
+    assert "Elected: Alice" in result.output
+    assert "Droop quota" in result.output
+
+
+def test_export_and_recount_ballot_file(app, db_session, tmp_path):
+    _meeting, motion = _seed_preference_motion(db_session)
+    ballot_file = tmp_path / "ballots.blt"
+    runner = app.test_cli_runner()
+
+    exported = runner.invoke(
+        args=["votora", "export-ballots", str(motion.id), str(ballot_file)]
+    )
+    assert exported.exit_code == 0, exported.output
+    assert ballot_file.read_text().splitlines()[:4] == ["2 1", "2 1 2 0", "1 2 1 0", "0"]
+
+    result = runner.invoke(
+        args=[
+            "votora",
+            "recount",
+            "--ballot-file",
+            str(ballot_file),
+            "--quota",
+            "hare",
+            "--seats",
+            "2",
+        ]
+    )
+    assert result.exit_code == 0, result.output
+    assert "Quota: 1.5" in result.output
+    assert "Elected: Alice, Bob" in result.output
+
+
+def test_recount_requires_single_source(app):
+    result = app.test_cli_runner().invoke(args=["votora", "recount"])
+    assert result.exit_code != 0
+    assert "exactly one of" in result.output
+
+
+def test_recount_with_meek_transfer(app, db_session):
+    _meeting, motion = _seed_preference_motion(db_session)
+
+    result = app.test_cli_runner().invoke(
+        args=["votora", "recount", "--motion", str(motion.id), "--transfer", "meek", "--show-log"]
+    )
+
+    assert result.exit_code == 0, result.output
+    assert "Meek quota" in result.output
+    assert "Elected: Alice" in result.output
+
+
+def test_recount_writes_folded_profile(app, db_session, tmp_path):
+    meeting, _motion = _seed_preference_motion(db_session)
+    profile_path = tmp_path / "count.folded"
+
+    result = app.test_cli_runner().invoke(
+        args=["votora", "recount", "--meeting", str(meeting.id), "--profile", str(profile_path)]
+    )
+
+    assert result.exit_code == 0, result.output
+    assert "Profile written to" in result.output
+    assert profile_path.read_text().startswith("count_stv")
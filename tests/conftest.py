@@ -1,6 +1,5 @@
 from pathlib import Path
 import sys
-import os
 
 import pytest
 
@@ -8,9 +7,6 @@ ROOT_DIR = Path(__file__).resolve().parents[1]
 if str(ROOT_DIR) not in sys.path:
     sys.path.insert(0, str(ROOT_DIR))
 
-# Safety default for any module-level app creation during test imports.
-os.environ.setdefault("DATABASE_URL", "sqlite:///:memory:")
-
 from app import create_app
 from app.extensions import db
 from app.models import User
@@ -25,6 +21,7 @@ def app(tmp_path: Path):
             "SQLALCHEMY_DATABASE_URI": f"sqlite:///{db_file}",
             "SQLALCHEMY_ENGINE_OPTIONS": {},
             "WTF_CSRF_ENABLED": False,
+            "MAIL_BACKGROUND_SENDER": False,
         }
     )
 
@@ -0,0 +1,27 @@
+import runpy
+from pathlib import Path
+
+CONF_PATH = Path(__file__).resolve().parents[2] / "gunicorn.conf.py"
+
+
+def test_gthread_profile_reads_workers_and_threads(monkeypatch):
+    monkeypatch.setenv("GUNICORN_WORKER_CLASS", "gthread")
+    monkeypatch.setenv("WEB_CONCURRENCY", "3")
+    monkeypatch.setenv("GUNICORN_THREADS", "8")
+
+    conf = runpy.run_path(str(CONF_PATH))
+
+    assert conf["worker_class"] == "gthread"
+    assert conf["workers"] == 3
+    assert conf["threads"] == 8
+    assert conf["preload_app"] is True
+
+
+def test_sync_profile_derives_workers_from_cpu_count(monkeypatch):
+    monkeypatch.setenv("GUNICORN_WORKER_CLASS", "sync")
+    monkeypatch.delenv("WEB_CONCURRENCY", raising=False)
+
+    conf = runpy.run_path(str(CONF_PATH))
+
+    assert conf["threads"] == 1
+    assert conf["workers"] == conf["cpu_count"] * 2 + 1
@@ -0,0 +1,28 @@
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parents[2]
+
+
+def test_importing_app_does_not_build_app_or_load_optional_modules():
+    code = (
+        "import sys, app, wsgi\n"
+        "assert not hasattr(app, 'app')\n"
+        "assert 'migrate' not in wsgi.app.extensions\n"
+        "for name in ('resend', 'alembic', 'numpy'):\n"
+        "    assert name not in sys.modules, name\n"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=ROOT_DIR,
+        env={"DATABASE_URL": "sqlite:///:memory:", "PATH": ""},
+        capture_output=True,
+        text=True,
+    )
+
+    assert result.returncode == 0, result.stderr
+
+
+def test_factory_registers_migrate_for_flask_db_commands(app):
+    assert "migrate" in app.extensions
@@ -0,0 +1,49 @@
+import runpy
+from pathlib import Path
+from types import SimpleNamespace
+
+from app import create_app
+from app.services.template_cache import precompile_templates
+
+CONF_PATH = Path(__file__).resolve().parents[2] / "gunicorn.conf.py"
+
+
+def _app(cache_dir):
+    return create_app(
+        {
+            "TESTING": True,
+            "SQLALCHEMY_DATABASE_URI": "sqlite://",
+            "SQLALCHEMY_ENGINE_OPTIONS": {},
+            "MIGRATIONS_ENABLED": False,
+            "TEMPLATE_CACHE_DIR": str(cache_dir),
+        }
+    )
+
+
+def test_templates_do_not_auto_reload_outside_debug(app):
+    assert app.jinja_env.auto_reload is False
+
+
+def test_new_worker_loads_compiled_templates_from_the_cache(tmp_path):
+    names = precompile_templates(_app(tmp_path))
+    assert "admin/meeting_detail.html" in names
+    assert len(list(tmp_path.iterdir())) == len(names)
+
+    fresh = _app(tmp_path)
+
+    def no_compiling(*args, **kwargs):
+        raise AssertionError("template was compiled instead of loaded from the cache")
+
+    fresh.jinja_env.compile = no_compiling
+    assert precompile_templates(fresh) == names
+
+
+def test_gunicorn_precompiles_in_the_master_when_preloading(tmp_path, monkeypatch):
+    monkeypatch.setenv("GUNICORN_PRELOAD", "true")
+    conf = runpy.run_path(str(CONF_PATH))
+    app = _app(tmp_path)
+
+    conf["when_ready"](SimpleNamespace(app=SimpleNamespace(wsgi=lambda: app)))
+    conf["post_worker_init"](SimpleNamespace(wsgi=app))
+
+    assert len(app.jinja_env.cache) == len(list(tmp_path.iterdir()))
@@ -0,0 +1,150 @@
+from app.models import Meeting, Motion, Option, PreferenceVote, Voter
+
+
+def test_create_preference_motion_stores_counting_method(db_session, auth_client, admin_user):
+    meeting = Meeting(title="Method Meeting", admin_id=admin_user.id)
+    db_session.add(meeting)
+    db_session.commit()
+
+    response = auth_client.post(
+        f"/admin/meetings/{meeting.id}/motions/new",
+        data={
+            "title": "Chair",
+            "type": "PREFERENCE",
+            "candidates": "Alice\nBob",
+            "num_winners": "1",
+            "preference_method": "ranked_pairs",
+        },
+        headers={"X-Requested-With": "XMLHttpRequest"},
+    )
+
+    assert response.status_code == 200
+    assert response.get_json()["motion"]["preference_method"] == "RANKED_PAIRS"
+
+
+def test_results_page_shows_pairwise_matrix_for_schulze_motion(
+    db_session, auth_client, admin_user
+):
+    meeting = Meeting(title="Condorcet Meeting", admin_id=admin_user.id)
+    db_session.add(meeting)
+    db_session.flush()
+
+    motion = Motion(
+        meeting_id=meeting.id,
+        title="Chair Election",
+        type="PREFERENCE",
+        num_winners=1,
+        preference_method="SCHULZE",
+    )
+    db_session.add(motion)
+    db_session.flush()
+
+    option_a = Option(motion_id=motion.id, text="Alice")
+    option_b = Option(motion_id=motion.id, text="Bob")
+    voter = Voter(meeting_id=meeting.id, student_id="570000001", name="V1", code="RESULT01")
+    db_session.add_all([option_a, option_b, voter])
+    db_session.flush()
+
+    db_session.add_all(
+        [
+            PreferenceVote(
+                voter_id=voter.id,
+                motion_id=motion.id,
+                option_id=option_a.id,
+                preference_rank=1,
+            ),
+            PreferenceVote(
+                voter_id=voter.id,
+                motion_id=motion.id,
+                option_id=option_b.id,
+                preference_rank=2,
+            ),
+        ]
+    )
+    db_session.commit()
+
+    response = auth_client.get(f"/admin/meetings/{meeting.id}/results")
+
+    assert response.status_code == 200
+    html = response.get_data(as_text=True)
+    assert "Pairwise preferences (row over column)" in html
+    assert "Alice is the Condorcet winner" in html
+    assert "STV count detail" not in html
+
+
+def test_results_page_is_read_only_and_close_fixes_seed(db_session, auth_client, admin_user):
+    meeting = Meeting(title="Seedless Meeting", admin_id=admin_user.id)
+    db_session.add(meeting)
+    db_session.flush()
+
+    motion = Motion(
+        meeting_id=meeting.id,
+        title="Legacy Preference",
+        type="PREFERENCE",
+        num_winners=1,
+        status="OPEN",
+    )
+    db_session.add(motion)
+    db_session.commit()
+
+    response = auth_client.get(f"/admin/meetings/{meeting.id}/results")
+
+    assert response.status_code == 200
+    db_session.refresh(motion)
+    assert motion.tally_seed is None
+
+    auth_client.post(f"/update_motion_status/{motion.id}", data={"status": "CLOSED"})
+    db_session.refresh(motion)
+    seed = motion.tally_seed
+    assert seed
+
+    auth_client.get(f"/admin/meetings/{meeting.id}/results")
+    db_session.refresh(motion)
+    assert motion.tally_seed == seed
+
+
+def test_results_profile_shows_phases_and_exports_folded_stacks(
+    db_session, auth_client, admin_user
+):
+    meeting = Meeting(title="Profiled Meeting", admin_id=admin_user.id)
+    db_session.add(meeting)
+    db_session.flush()
+
+    motion = Motion(
+        meeting_id=meeting.id,
+        title="Committee",
+        type="PREFERENCE",
+        num_winners=1,
+        tally_seed="profile-seed",
+    )
+    db_session.add(motion)
+    db_session.flush()
+
+    option_a = Option(motion_id=motion.id, text="Alice")
+    option_b = Option(motion_id=motion.id, text="Bob")
+    voter = Voter(meeting_id=meeting.id, student_id="570000002", name="V2", code="PROFILE1")
+    db_session.add_all([option_a, option_b, voter])
+    db_session.flush()
+    db_session.add(
+        PreferenceVote(
+            voter_id=voter.id,
+            motion_id=motion.id,
+            option_id=option_b.id,
+            preference_rank=1,
+        )
+    )
+    db_session.commit()
+
+    response = auth_client.get(f"/admin/meetings/{meeting.id}/results?profile=1")
+
+    assert response.status_code == 200
+    html = response.get_data(as_text=True)
+    assert "Count profile" in html
+    assert "compute_tallies" in html
+
+    response = auth_client.get(f"/admin/meetings/{meeting.id}/results?profile=folded")
+
+    assert response.status_code == 200
+    assert "attachment" in response.headers["Content-Disposition"]
+    body = response.get_data(as_text=True)
+    assert f"stv[motion={motion.id}];parse_ballots " in body
@@ -0,0 +1,91 @@
+from app.models import BallotReceipt, Meeting, Motion, Option, PreferenceVote, Voter
+
+
+def _seed(db_session):
+    meeting = Meeting(title="Retry Meeting")
+    db_session.add(meeting)
+    db_session.flush()
+    motion = Motion(meeting_id=meeting.id, title="Rank", type="PREFERENCE", num_winners=1, status="OPEN")
+    db_session.add(motion)
+    db_session.flush()
+    options = [Option(motion_id=motion.id, text=text) for text in ("A", "B")]
+    voter = Voter(meeting_id=meeting.id, student_id="S1", name="Robin", code="RETRY001")
+    db_session.add_all(options + [voter])
+    db_session.commit()
+    return motion, options, voter
+
+
+def _ranks(options, first, second):
+    return {f"opt_{options[0].id}_rank": str(first), f"opt_{options[1].id}_rank": str(second)}
+
+
+def test_vote_page_issues_ballot_token(client, db_session):
+    motion, _options, voter = _seed(db_session)
+    html = client.get(f"/vote/{voter.code}/motion/{motion.id}").get_data(as_text=True)
+    assert html.count('name="ballot_token"') == 2
+
+
+def test_repeated_submission_is_a_no_op(client, db_session):
+    motion, options, voter = _seed(db_session)
+    url = f"/vote/{voter.code}/motion/{motion.id}"
+
+    for _attempt in range(3):
+        response = client.post(url, data={**_ranks(options, 1, 2), "ballot_token": "tok-1"})
+        assert response.status_code == 302
+
+    votes = PreferenceVote.query.filter_by(voter_id=voter.id).order_by(PreferenceVote.option_id).all()
+    assert [(vote.option_id, vote.preference_rank) for vote in votes] == [
+        (options[0].id, 1),
+        (options[1].id, 2),
+    ]
+    receipt = BallotReceipt.query.filter_by(voter_id=voter.id, motion_id=motion.id).one()
+    assert receipt.version == 1
+
+
+def test_edited_ballot_under_stale_token_is_written(client, db_session):
+    motion, options, voter = _seed(db_session)
+    url = f"/vote/{voter.code}/motion/{motion.id}"
+
+    client.post(url, data={**_ranks(options, 1, 2), "ballot_token": "tok-1"})
+    client.post(url, data={**_ranks(options, 2, 1), "ballot_token": "tok-1"})
+
+    votes = PreferenceVote.query.filter_by(voter_id=voter.id).order_by(PreferenceVote.option_id).all()
+    assert [vote.preference_rank for vote in votes] == [2, 1]
+    receipt = BallotReceipt.query.filter_by(voter_id=voter.id, motion_id=motion.id).one()
+    assert receipt.version == 2
+
+
+def test_new_token_replaces_ballot_and_bumps_version(client, db_session):
+    motion, options, voter = _seed(db_session)
+    url = f"/vote/{voter.code}/motion/{motion.id}"
+
+    client.post(url, data={**_ranks(options, 1, 2), "ballot_token": "tok-1"})
+    client.post(url, data={**_ranks(options, 2, 1), "ballot_token": "tok-2"})
+    client.post(url, data=_ranks(options, 1, 2))
+
+    assert PreferenceVote.query.filter_by(voter_id=voter.id).count() == 2
+    receipt = BallotReceipt.query.filter_by(voter_id=voter.id, motion_id=motion.id).one()
+    assert receipt.version == 3
+
+
+def test_late_retry_of_older_token_keeps_newer_ballot(client, db_session):
+    motion, options, voter = _seed(db_session)
+    url = f"/vote/{voter.code}/motion/{motion.id}"
+
+    client.post(url, data={**_ranks(options, 1, 2), "ballot_token": "tok-1", "ballot_version": "0"})
+    client.post(url, data={**_ranks(options, 2, 1), "ballot_token": "tok-2", "ballot_version": "1"})
+    client.post(url, data={**_ranks(options, 1, 2), "ballot_token": "tok-1", "ballot_version": "0"})
+
+    votes = PreferenceVote.query.filter_by(voter_id=voter.id).order_by(PreferenceVote.option_id).all()
+    assert [vote.preference_rank for vote in votes] == [2, 1]
+    receipt = BallotReceipt.query.filter_by(voter_id=voter.id, motion_id=motion.id).one()
+    assert receipt.version == 2
+
+
+def test_vote_page_sends_receipt_version(client, db_session):
+    motion, options, voter = _seed(db_session)
+    url = f"/vote/{voter.code}/motion/{motion.id}"
+    client.post(url, data={**_ranks(options, 1, 2), "ballot_token": "tok-1", "ballot_version": "0"})
+
+    html = client.get(url).get_data(as_text=True)
+    assert 'name="ballot_version" value="1"' in html
@@ -0,0 +1,148 @@
+from app.models import (
+    BallotReceipt,
+    CandidateVote,
+    CumulativeVote,
+    Meeting,
+    Motion,
+    Option,
+    PreferenceVote,
+    ScoreVote,
+    Voter,
+    YesNoVote,
+)
+
+
+def _seed(db_session, count=20):
+    meeting = Meeting(title="AGM")
+    db_session.add(meeting)
+    db_session.flush()
+    motions = [
+        Motion(meeting_id=meeting.id, title=f"Resolution {index}", type="YES_NO", status="OPEN")
+        for index in range(count)
+    ]
+    budget = Motion(
+        meeting_id=meeting.id, title="Split", type="CUMULATIVE", budget_points=10, status="OPEN"
+    )
+    draft = Motion(meeting_id=meeting.id, title="Later", type="YES_NO", status="DRAFT")
+    db_session.add_all(motions + [budget, draft])
+    db_session.flush()
+    for motion in motions + [draft]:
+        db_session.add_all(Option(motion_id=motion.id, text=text) for text in ("Yes", "No", "Abstain"))
+    db_session.add_all(Option(motion_id=budget.id, text=text) for text in ("A", "B"))
+    voter = Voter(meeting_id=meeting.id, student_id="S1", name="Alex", code="SHEET001")
+    db_session.add(voter)
+    db_session.commit()
+    return motions, budget, draft, voter
+
+
+def _sheet(motions, budget, choose):
+    form = {"ballot_token": "sheet-token", "motion_id": [str(m.id) for m in motions + [budget]]}
+    for motion in motions:
+        form[f"m{motion.id}-option"] = str(motion.options[choose].id)
+    a_id, b_id = (option.id for option in budget.options)
+    form[f"m{budget.id}-opt_{a_id}_points"] = "6"
+    form[f"m{budget.id}-opt_{b_id}_points"] = "4"
+    return form
+
+
+def test_sheet_lists_only_open_motions(client, db_session):
+    motions, budget, draft, voter = _seed(db_session, count=2)
+    html = client.get(f"/vote/{voter.code}/sheet").get_data(as_text=True)
+    assert f'name="m{motions[0].id}-option"' in html
+    assert f'name="m{budget.id}-opt_{budget.options[0].id}_points"' in html
+    assert f"m{draft.id}-option" not in html
+    assert f'href="/vote/{voter.code}/sheet"' in client.get(f"/vote/{voter.code}").get_data(as_text=True)
+
+
+def test_sheet_records_every_motion_in_one_transaction(app, client, db_session):
+    app.config["QUERY_STATS_HEADER"] = True
+    motions, budget, _draft, voter = _seed(db_session)
+    client.get(f"/vote/{voter.code}/sheet")
+
+    response = client.post(f"/vote/{voter.code}/sheet", data=_sheet(motions, budget, 0))
+
+    assert response.status_code == 302
+    assert YesNoVote.query.filter_by(voter_id=voter.id).count() == 20
+    assert CumulativeVote.query.filter_by(voter_id=voter.id).count() == 2
+    assert BallotReceipt.query.filter_by(voter_id=voter.id).count() == 21
+    # A status check, one insert, read and update of receipts, and a delete
+    # and insert per motion type, however many motions are on the sheet.
+    assert int(response.headers["X-DB-Statements"]) <= 12
+
+    # Resubmitting the same sheet is a no-op; changing answers rewrites them.
+    client.post(f"/vote/{voter.code}/sheet", data=_sheet(motions, budget, 0))
+    assert {receipt.version for receipt in BallotReceipt.query} == {1}
+    client.post(f"/vote/{voter.code}/sheet", data=_sheet(motions, budget, 1))
+    assert {vote.option_id for vote in YesNoVote.query} == {motion.options[1].id for motion in motions}
+
+
+def test_sheet_over_some_existing_receipts(client, db_session):
+    motions, budget, _draft, voter = _seed(db_session, count=3)
+    client.post(
+        f"/vote/{voter.code}/motion/{motions[0].id}",
+        data={"option": str(motions[0].options[2].id), "ballot_token": "single"},
+    )
+
+    response = client.post(f"/vote/{voter.code}/sheet", data=_sheet(motions, budget, 0))
+
+    assert response.status_code == 302
+    assert {vote.option_id for vote in YesNoVote.query} == {motion.options[0].id for motion in motions}
+    versions = {receipt.motion_id: receipt.version for receipt in BallotReceipt.query}
+    assert versions == {motions[0].id: 2, motions[1].id: 1, motions[2].id: 1, budget.id: 1}
+
+
+def test_sheet_with_an_invalid_motion_writes_nothing(client, db_session):
+    motions, budget, draft, voter = _seed(db_session, count=3)
+    form = _sheet(motions, budget, 0)
+    form[f"m{budget.id}-opt_{budget.options[0].id}_points"] = "9"
+
+    response = client.post(f"/vote/{voter.code}/sheet", data=form)
+    assert response.status_code == 200
+    assert "You must allocate exactly 10 points" in response.get_data(as_text=True)
+    assert YesNoVote.query.count() == 0
+
+    form = _sheet(motions, budget, 0)
+    form["motion_id"].append(str(draft.id))
+    client.post(f"/vote/{voter.code}/sheet", data=form)
+    assert YesNoVote.query.count() == 0
+
+
+def test_blank_motions_keep_the_current_vote(client, db_session):
+    motions, budget, _draft, voter = _seed(db_session, count=1)
+    meeting_id = motions[0].meeting_id
+    ranked = Motion(meeting_id=meeting_id, title="Rank", type="PREFERENCE", status="OPEN")
+    scored = Motion(meeting_id=meeting_id, title="Score", type="SCORE", score_max=10, status="OPEN")
+    picked = Motion(meeting_id=meeting_id, title="Pick", type="FPTP", status="OPEN")
+    db_session.add_all([ranked, scored, picked])
+    db_session.flush()
+    for motion in (ranked, scored, picked):
+        db_session.add_all(Option(motion_id=motion.id, text=text) for text in ("A", "B"))
+    db_session.commit()
+    url = f"/vote/{voter.code}/sheet"
+
+    first = {
+        "ballot_token": "first",
+        f"m{ranked.id}-opt_{ranked.options[0].id}_rank": "1",
+        f"m{scored.id}-opt_{scored.options[0].id}_score": "7",
+        f"m{picked.id}-option": str(picked.options[1].id),
+        f"m{budget.id}-opt_{budget.options[0].id}_points": "10",
+    }
+    assert client.post(url, data=first).status_code == 302
+
+    # Only the YES_NO motion is answered; every other type is left blank,
+    # including the cumulative budget inputs.
+    second = {
+        "ballot_token": "second",
+        f"m{motions[0].id}-option": str(motions[0].options[0].id),
+        f"m{ranked.id}-opt_{ranked.options[0].id}_rank": "",
+        f"m{scored.id}-opt_{scored.options[0].id}_score": "",
+        f"m{budget.id}-opt_{budget.options[0].id}_points": "",
+        f"m{budget.id}-opt_{budget.options[1].id}_points": "",
+    }
+    assert client.post(url, data=second).status_code == 302
+
+    assert YesNoVote.query.filter_by(voter_id=voter.id).count() == 1
+    assert PreferenceVote.query.filter_by(voter_id=voter.id).count() == 1
+    assert ScoreVote.query.filter_by(voter_id=voter.id).count() == 1
+    assert CandidateVote.query.filter_by(voter_id=voter.id).one().option_id == picked.options[1].id
+    assert CumulativeVote.query.filter_by(voter_id=voter.id).count() == 2
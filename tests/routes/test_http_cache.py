@@ -0,0 +1,44 @@
+import gzip
+
+
+def test_public_page_is_rendered_once_and_revalidated(app, client):
+    first = client.get("/")
+    assert first.status_code == 200
+    assert first.headers["Cache-Control"] == "public, max-age=300"
+    assert "Cookie" in first.headers["Vary"]
+    assert len(app.extensions["page_cache"]._entries) == 1
+
+    etag = first.headers["ETag"]
+    assert client.get("/").headers["ETag"] == etag
+    revalidated = client.get("/", headers={"If-None-Match": etag})
+    assert revalidated.status_code == 304
+    assert revalidated.get_data() == b""
+
+
+def test_public_page_is_served_gzipped_from_the_cache(client):
+    plain = client.get("/voting-systems")
+    compressed = client.get("/voting-systems", headers={"Accept-Encoding": "gzip"})
+    assert compressed.headers["Content-Encoding"] == "gzip"
+    assert gzip.decompress(compressed.get_data()) == plain.get_data()
+    assert len(compressed.get_data()) < len(plain.get_data())
+
+    robots = client.get("/robots.txt", headers={"Accept-Encoding": "gzip"})
+    assert "Content-Encoding" not in robots.headers
+    assert b"Disallow: /admin/" in robots.get_data()
+
+
+def test_signed_in_visitors_get_their_own_page(app, auth_client, admin_user):
+    response = auth_client.get("/")
+    assert "private" in response.headers["Cache-Control"]
+    assert admin_user.username in response.get_data(as_text=True)
+    assert len(app.extensions["page_cache"]._entries) == 0
+
+
+def test_large_dynamic_pages_are_compressed(auth_client):
+    response = auth_client.get("/admin/meetings", headers={"Accept-Encoding": "gzip, br"})
+    assert response.status_code == 200
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert "Accept-Encoding" in response.headers["Vary"]
+    assert b"</html>" in gzip.decompress(response.get_data())
+
+    assert "Content-Encoding" not in auth_client.get("/admin/meetings").headers
@@ -0,0 +1,159 @@
+import json
+import time
+
+from app.models import Meeting, Motion, Option, Voter
+from app.services.metrics import (
+    BALLOT_SUBMISSIONS,
+    DB_POOL_CHECKOUT_SECONDS,
+    JOIN_ATTEMPTS,
+    TALLY_SECONDS,
+    VOTE_WRITE_SECONDS,
+    MetricsRegistry,
+)
+
+
+def _seed_yes_no_motion(db_session):
+    meeting = Meeting(title="Metrics Meeting", join_token="metrics-join", registration_open=True)
+    db_session.add(meeting)
+    db_session.flush()
+    motion = Motion(meeting_id=meeting.id, title="Budget", type="YES_NO", status="OPEN")
+    db_session.add(motion)
+    db_session.flush()
+    yes = Option(motion_id=motion.id, text="Yes")
+    db_session.add_all([yes, Option(motion_id=motion.id, text="No")])
+    voter = Voter(meeting_id=meeting.id, student_id="S1", name="Sam", code="PROM0001")
+    db_session.add(voter)
+    db_session.commit()
+    return motion, yes
+
+
+def test_metrics_endpoint_exports_votes_and_joins(app, client, db_session):
+    app.config["METRICS_PUBLIC"] = True
+    motion, yes = _seed_yes_no_motion(db_session)
+    submissions_before = BALLOT_SUBMISSIONS.value(motion_type="YES_NO")
+    writes_before = VOTE_WRITE_SECONDS.count(motion_type="YES_NO")
+    invalid_before = JOIN_ATTEMPTS.value(route="code", outcome="invalid")
+
+    client.post(f"/vote/PROM0001/motion/{motion.id}", data={"option": str(yes.id)})
+    client.post("/join", data={"voter_code": "NOPE0000"})
+
+    assert BALLOT_SUBMISSIONS.value(motion_type="YES_NO") == submissions_before + 1
+    assert VOTE_WRITE_SECONDS.count(motion_type="YES_NO") == writes_before + 1
+    assert JOIN_ATTEMPTS.value(route="code", outcome="invalid") == invalid_before + 1
+
+    response = client.get("/metrics")
+
+    assert response.status_code == 200
+    assert response.content_type.startswith("text/plain; version=0.0.4")
+    body = response.get_data(as_text=True)
+    assert "# TYPE votora_ballot_submissions_total counter" in body
+    assert 'votora_ballot_submissions_total{motion_type="YES_NO"}' in body
+    assert 'votora_vote_write_seconds_bucket{motion_type="YES_NO",le="+Inf"}' in body
+    assert "votora_db_pool_checkout_seconds_count" in body
+    assert "# TYPE votora_db_pool_connections gauge" in body
+
+
+def test_pool_checkout_is_timed_after_engine_dispose(app):
+    from app.extensions import db
+
+    with app.app_context():
+        # What gunicorn's post_fork does in each worker.
+        db.engine.dispose(close=False)
+        before = DB_POOL_CHECKOUT_SECONDS.count()
+        with db.engine.connect():
+            pass
+
+    assert DB_POOL_CHECKOUT_SECONDS.count() == before + 1
+
+
+def test_results_page_records_tally_duration(auth_client, admin_user, db_session):
+    motion, _ = _seed_yes_no_motion(db_session)
+    motion.meeting.admin_id = admin_user.id
+    db_session.commit()
+    before = TALLY_SECONDS.count(engine="yes_no", ballots="<100")
+
+    response = auth_client.get(f"/admin/meetings/{motion.meeting_id}/results")
+
+    assert response.status_code == 200
+    assert TALLY_SECONDS.count(engine="yes_no", ballots="<100") == before + 1
+
+
+def test_metrics_endpoint_is_hidden_without_token_or_opt_in(client):
+    assert client.get("/metrics").status_code == 404
+
+
+def test_metrics_endpoint_requires_token_when_configured(app, client):
+    app.config["METRICS_TOKEN"] = "scrape-secret"
+
+    assert client.get("/metrics").status_code == 401
+    response = client.get("/metrics", headers={"Authorization": "Bearer scrape-secret"})
+    assert response.status_code == 200
+
+
+def test_histogram_exposition_is_cumulative():
+    registry = MetricsRegistry()
+    histogram = registry.histogram("demo_seconds", "Demo.", ("kind",), buckets=(0.1, 1))
+    histogram.observe(0.05, kind="a")
+    histogram.observe(0.5, kind="a")
+    histogram.observe(3, kind="a")
+
+    lines = registry.render().splitlines()
+
+    assert 'demo_seconds_bucket{kind="a",le="0.1"} 1' in lines
+    assert 'demo_seconds_bucket{kind="a",le="1"} 2' in lines
+    assert 'demo_seconds_bucket{kind="a",le="+Inf"} 3' in lines
+    assert 'demo_seconds_sum{kind="a"} 3.55' in lines
+    assert 'demo_seconds_count{kind="a"} 3' in lines
+
+
+def _worker_registry():
+    registry = MetricsRegistry()
+    counter = registry.counter("demo_total", "Demo.", ("kind",))
+    histogram = registry.histogram("demo_seconds", "Demo.", buckets=(0.1, 1))
+    registry.gauge("demo_connections", "Demo.", ("state",), callback=lambda: {"idle": 2})
+    return registry, counter, histogram
+
+
+def test_snapshots_from_two_workers_are_summed():
+    first, first_counter, first_histogram = _worker_registry()
+    second, second_counter, second_histogram = _worker_registry()
+    first_counter.inc(kind="a")
+    second_counter.inc(2, kind="a")
+    second_counter.inc(kind="b")
+    first_histogram.observe(0.05)
+    second_histogram.observe(0.5)
+
+    lines = first.render({"101": first.snapshot(), "102": second.snapshot()}).splitlines()
+
+    assert 'demo_total{kind="a"} 3' in lines
+    assert 'demo_total{kind="b"} 1' in lines
+    assert 'demo_seconds_bucket{le="0.1"} 1' in lines
+    assert 'demo_seconds_bucket{le="1"} 2' in lines
+    assert "demo_seconds_count 2" in lines
+    assert 'demo_connections{worker="101",state="idle"} 2' in lines
+    assert 'demo_connections{worker="102",state="idle"} 2' in lines
+
+    stale = second.snapshot()
+    stale["written_at"] -= 60
+    lines = first.render({"101": first.snapshot(), "102": stale}, max_age=15).splitlines()
+    assert 'demo_total{kind="a"} 3' in lines
+    assert not any('worker="102"' in line for line in lines)
+
+
+def test_metrics_endpoint_sums_worker_snapshots(app, client, tmp_path):
+    app.config.update(METRICS_PUBLIC=True, METRICS_DIR=str(tmp_path))
+    # Another worker's snapshot.
+    (tmp_path / "999999.json").write_text(
+        json.dumps(
+            {
+                "written_at": time.time(),
+                "metrics": {"votora_ballot_submissions_total": [[["YES_NO"], 5]]},
+            }
+        )
+    )
+    local = BALLOT_SUBMISSIONS.value(motion_type="YES_NO")
+
+    body = client.get("/metrics").get_data(as_text=True)
+
+    assert f'votora_ballot_submissions_total{{motion_type="YES_NO"}} {local + 5}' in body
+    assert len(list(tmp_path.glob("*.json"))) == 2
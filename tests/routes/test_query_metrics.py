@@ -0,0 +1,62 @@
+from app.models import Meeting, Voter
+
+
+def _seed_voter(db_session):
+    meeting = Meeting(title="Metrics Meeting", join_token="metrics-token")
+    db_session.add(meeting)
+    db_session.flush()
+    voter = Voter(meeting_id=meeting.id, student_id="S1", name="Sam", code="METRIC01")
+    db_session.add(voter)
+    db_session.commit()
+    return voter
+
+
+def test_query_stats_header_reports_statement_count(app, client, db_session):
+    app.config["QUERY_STATS_HEADER"] = True
+    _seed_voter(db_session)
+
+    response = client.get("/vote/METRIC01")
+
+    assert response.status_code == 200
+    assert int(response.headers["X-DB-Statements"]) >= 2
+    assert float(response.headers["X-DB-Time-Ms"]) >= 0
+
+
+def test_query_stats_header_hidden_outside_debug(client, db_session):
+    _seed_voter(db_session)
+
+    response = client.get("/vote/METRIC01")
+
+    assert "X-DB-Statements" not in response.headers
+
+
+def test_query_metrics_page_lists_endpoints_for_admins(app, client, auth_client, admin_user, db_session):
+    app.config["QUERY_METRICS_ADMINS"] = [admin_user.username]
+    _seed_voter(db_session)
+    client.get("/vote/METRIC01")
+    client.get("/vote/METRIC01")
+
+    response = auth_client.get("/admin/metrics/queries")
+
+    assert response.status_code == 200
+    html = response.get_data(as_text=True)
+    assert "voter_dashboard" in html
+    assert "Statements / request" in html
+
+    response = auth_client.post("/admin/metrics/queries/reset")
+    assert response.status_code == 302
+    assert "voter_dashboard" not in auth_client.get("/admin/metrics/queries").get_data(as_text=True)
+
+
+def test_query_metrics_page_requires_login(client):
+    response = client.get("/admin/metrics/queries")
+
+    assert response.status_code == 302
+    assert "/login" in response.headers["Location"]
+
+
+def test_query_metrics_are_forbidden_to_ordinary_users(app, auth_client, other_admin_user):
+    app.config["QUERY_METRICS_ADMINS"] = [other_admin_user.username]
+
+    assert auth_client.get("/admin/metrics/queries").status_code == 403
+    assert auth_client.post("/admin/metrics/queries/reset").status_code == 403
@@ -0,0 +1,147 @@
+from app.models import CumulativeVote, Meeting, Motion, Option, Voter, YesNoVote
+
+
+def _seed(db_session):
+    meeting = Meeting(title="API Meeting")
+    db_session.add(meeting)
+    db_session.flush()
+    yes_no = Motion(meeting_id=meeting.id, title="Approve", type="YES_NO", status="OPEN")
+    budget = Motion(
+        meeting_id=meeting.id, title="Split", type="CUMULATIVE", budget_points=10, status="OPEN"
+    )
+    draft = Motion(meeting_id=meeting.id, title="Later", type="YES_NO", status="DRAFT")
+    db_session.add_all([yes_no, budget, draft])
+    db_session.flush()
+    db_session.add_all(
+        [Option(motion_id=yes_no.id, text=text) for text in ("Yes", "No", "Abstain")]
+        + [Option(motion_id=budget.id, text=text) for text in ("A", "B")]
+    )
+    voter = Voter(meeting_id=meeting.id, student_id="S1", name="Alex", code="API00001")
+    db_session.add(voter)
+    db_session.commit()
+    return yes_no, budget, draft, voter
+
+
+def test_motion_list_reports_voted_state(client, db_session):
+    yes_no, _budget, _draft, voter = _seed(db_session)
+    client.put(
+        f"/api/vote/{voter.code}/motions/{yes_no.id}/ballot",
+        json={"choices": [[yes_no.options[0].id, None]]},
+    )
+
+    data = client.get(f"/api/vote/{voter.code}/motions").get_json()
+    assert data["meeting"] == "API Meeting"
+    assert [(motion["title"], motion["voted"]) for motion in data["motions"]] == [
+        ("Approve", True),
+        ("Split", False),
+        ("Later", False),
+    ]
+    assert client.get("/api/vote/NOPE0000/motions").status_code == 404
+
+
+def test_ballot_definition_and_put_round_trip(client, db_session):
+    yes_no, _budget, _draft, voter = _seed(db_session)
+    url = f"/api/vote/{voter.code}/motions/{yes_no.id}/ballot"
+
+    definition = client.get(url).get_json()
+    assert definition["motion"]["options"] == [[option.id, option.text] for option in yes_no.options]
+    assert definition["choices"] == []
+    assert definition["token"]
+    assert definition["version"] == 0
+
+    no_id = yes_no.options[1].id
+    response = client.put(
+        url, json={"choices": [[no_id, None]], "token": definition["token"], "version": 0}
+    )
+    assert response.get_json() == {"ok": True, "motion_id": yes_no.id, "recorded": True}
+    assert client.get(url).get_json()["choices"] == [[no_id, None]]
+    assert client.get(url).get_json()["version"] == 1
+    assert YesNoVote.query.filter_by(voter_id=voter.id).count() == 1
+
+    # A ballot based on version 0 from another page is now stale.
+    yes_id = yes_no.options[0].id
+    client.put(url, json={"choices": [[yes_id, None]], "token": "other-page", "version": 0})
+    assert client.get(url).get_json()["choices"] == [[no_id, None]]
+
+
+def test_put_uses_form_validation(client, db_session):
+    _yes_no, budget, _draft, voter = _seed(db_session)
+    url = f"/api/vote/{voter.code}/motions/{budget.id}/ballot"
+    a_id, b_id = (option.id for option in budget.options)
+
+    response = client.put(url, json={"choices": [[a_id, 4], [b_id, 4]]})
+    assert response.status_code == 400
+    assert "exactly 10 points" in response.get_json()["error"]
+
+    response = client.put(url, json={"choices": [[a_id, -1], [b_id, 11]]})
+    assert response.get_json()["error"] == "Points cannot be negative."
+
+    assert client.put(url, json={"choices": "all"}).status_code == 400
+    assert client.put(url, data="not json").status_code == 400
+    assert CumulativeVote.query.count() == 0
+
+    assert client.put(url, json={"choices": [[a_id, 6.5], [b_id, 3.5]]}).status_code == 200
+    assert client.get(url).get_json()["choices"] == [[a_id, 6.5], [b_id, 3.5]]
+
+
+def test_put_rejects_motion_that_is_not_open(client, db_session):
+    _yes_no, _budget, draft, voter = _seed(db_session)
+    response = client.put(
+        f"/api/vote/{voter.code}/motions/{draft.id}/ballot", json={"choices": []}
+    )
+    assert response.status_code == 409
+    assert response.get_json()["ok"] is False
+
+
+def test_dashboard_wires_the_voter_client(client, db_session):
+    yes_no, _budget, _draft, voter = _seed(db_session)
+    html = client.get(f"/vote/{voter.code}").get_data(as_text=True)
+    assert f'data-ballot-url="/api/vote/{voter.code}/motions/0/ballot"' in html
+    assert f'data-motion-id="{yes_no.id}"' in html
+    assert "js/voter.js" in html
+    assert f'data-ballots-url="/api/vote/{voter.code}/ballots"' in html
+
+
+def test_ballot_sheet_lists_open_motions_with_choices(client, db_session):
+    yes_no, budget, _draft, voter = _seed(db_session)
+    yes_id = yes_no.options[0].id
+    client.put(f"/api/vote/{voter.code}/motions/{yes_no.id}/ballot", json={"choices": [[yes_id, None]]})
+
+    data = client.get(f"/api/vote/{voter.code}/ballots").get_json()
+    assert [(motion["id"], motion["choices"]) for motion in data["motions"]] == [
+        (yes_no.id, [[yes_id, None]]),
+        (budget.id, []),
+    ]
+
+
+def test_batch_is_rejected_as_a_whole(client, db_session):
+    yes_no, budget, draft, voter = _seed(db_session)
+    url = f"/api/vote/{voter.code}/ballots"
+    a_id, b_id = (option.id for option in budget.options)
+    ballots = [
+        {"motion_id": yes_no.id, "choices": [[yes_no.options[0].id, None]], "token": "t1"},
+        {"motion_id": budget.id, "choices": [[a_id, 4], [b_id, 4]], "token": "t2"},
+        {"motion_id": draft.id, "choices": [], "token": "t3"},
+    ]
+
+    response = client.post(url, json={"ballots": ballots})
+    assert response.status_code == 400
+    assert [error["motion_id"] for error in response.get_json()["errors"]] == [budget.id, draft.id]
+    assert YesNoVote.query.count() == 0
+
+    ballots[1]["choices"] = [[a_id, 7], [b_id, 3]]
+    response = client.post(url, json={"ballots": ballots[:2]})
+    assert response.get_json() == {"ok": True, "recorded": [yes_no.id, budget.id]}
+    assert YesNoVote.query.filter_by(voter_id=voter.id).count() == 1
+    assert CumulativeVote.query.filter_by(voter_id=voter.id).count() == 2
+
+    # A replayed batch (same tokens and choices) writes nothing new.
+    assert client.post(url, json={"ballots": ballots[:2]}).status_code == 200
+    assert CumulativeVote.query.filter_by(voter_id=voter.id).count() == 2
+
+
+def test_service_worker_is_served_from_the_root(client):
+    response = client.get("/voter-sw.js")
+    assert response.status_code == 200
+    assert response.mimetype == "text/javascript"
+    assert response.headers["Cache-Control"] == "no-cache"
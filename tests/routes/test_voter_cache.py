@@ -0,0 +1,162 @@
+from app.models import Meeting, Motion, Option, Voter, YesNoVote
+from app.services.metadata_cache import MetadataCache
+from app.services.voter_cache import TTLCache, current_motions, lookup_voter, voted_motion_ids
+
+
+def _seed(db_session, admin_user):
+    meeting = Meeting(title="Cached Meeting", admin_id=admin_user.id)
+    db_session.add(meeting)
+    db_session.flush()
+    motion = Motion(meeting_id=meeting.id, title="First Motion", type="YES_NO", status="OPEN")
+    db_session.add(motion)
+    db_session.flush()
+    db_session.add(Option(motion_id=motion.id, text="Yes"))
+    voter = Voter(meeting_id=meeting.id, student_id="S1", name="Casey", code="CACHE001")
+    db_session.add(voter)
+    db_session.commit()
+    return meeting, motion, voter
+
+
+def test_ttl_cache_evicts_least_recently_used_and_expired():
+    cache = TTLCache(max_size=2, ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1
+    cache.set("c", 3)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+
+    expired = TTLCache(max_size=2, ttl=0)
+    expired.set("a", 1)
+    assert expired.get("a") is None
+    assert len(expired) == 0
+
+
+def test_lookup_voter_is_cached_until_motion_changes(auth_client, db_session, admin_user):
+    meeting, motion, voter = _seed(db_session, admin_user)
+
+    first = lookup_voter("CACHE001")
+    assert first.meeting.title == "Cached Meeting"
+    assert [cached.title for cached in first.motions] == ["First Motion"]
+    assert lookup_voter("CACHE001") is first
+    assert lookup_voter("MISSING1") is None
+
+    response = auth_client.post(
+        f"/update_motion_status/{motion.id}", data={"status": "CLOSED"}
+    )
+    assert response.status_code == 302
+
+    refreshed = lookup_voter("CACHE001")
+    assert refreshed is not first
+    assert current_motions(refreshed)[0].status == "CLOSED"
+
+
+def test_deleted_voter_code_stops_working(auth_client, client, db_session, admin_user):
+    _meeting, _motion, voter = _seed(db_session, admin_user)
+
+    assert "Casey" in client.get("/vote/CACHE001").get_data(as_text=True)
+
+    response = auth_client.post(f"/admin/voter/{voter.id}/delete")
+    assert response.status_code == 200
+
+    html = client.get("/vote/CACHE001").get_data(as_text=True).lower()
+    assert "invalid voting link" in html
+
+
+def test_renamed_voter_shows_new_name(auth_client, db_session, admin_user):
+    _meeting, _motion, voter = _seed(db_session, admin_user)
+
+    assert "Casey" in auth_client.get("/vote/CACHE001").get_data(as_text=True)
+
+    response = auth_client.post(
+        f"/admin/voter/{voter.id}/update", data={"student_id": "S1", "name": "Jordan"}
+    )
+    assert response.status_code == 200
+
+    assert "Jordan" in auth_client.get("/vote/CACHE001").get_data(as_text=True)
+
+
+def test_voted_motion_ids_spans_vote_tables(db_session, admin_user):
+    _meeting, motion, voter = _seed(db_session, admin_user)
+    assert voted_motion_ids(voter.id) == set()
+
+    db_session.add(YesNoVote(voter_id=voter.id, motion_id=motion.id, option_id=motion.options[0].id))
+    db_session.commit()
+
+    assert voted_motion_ids(voter.id) == {motion.id}
+
+
+def test_vote_rejected_once_motion_is_closed(auth_client, client, db_session, admin_user):
+    _meeting, motion, voter = _seed(db_session, admin_user)
+    url = f"/vote/{voter.code}/motion/{motion.id}"
+    option_id = str(motion.options[0].id)
+
+    assert client.post(url, data={"option": option_id}).status_code == 302
+    assert YesNoVote.query.filter_by(motion_id=motion.id).count() == 1
+
+    auth_client.post(f"/update_motion_status/{motion.id}", data={"status": "CLOSED"})
+    YesNoVote.query.filter_by(motion_id=motion.id).delete()
+    db_session.commit()
+
+    response = client.post(url, data={"option": option_id})
+    assert response.status_code == 302
+    assert response.headers["Location"].endswith(f"/vote/{voter.code}")
+    assert YesNoVote.query.filter_by(motion_id=motion.id).count() == 0
+    assert client.get(url).status_code == 302
+
+
+def test_status_gate_rechecks_status_without_shared_tier(db_session, admin_user):
+    meeting, motion, _voter = _seed(db_session, admin_user)
+    cache = MetadataCache(ttl=60, status_ttl=0)
+    assert cache.get_motion(motion.id, meeting.id).status == "OPEN"
+
+    # Another worker closes the motion; this one has no shared tier to tell it.
+    motion.status = "CLOSED"
+    db_session.commit()
+
+    assert cache.get_motion(motion.id, meeting.id).status == "CLOSED"
+    assert cache.version(meeting.id) == 1
+
+
+def test_vote_rejected_when_cached_status_is_stale(app, client, db_session, admin_user):
+    app.config["METADATA_CACHE_STATUS_TTL"] = 60
+    _meeting, motion, voter = _seed(db_session, admin_user)
+    url = f"/vote/{voter.code}/motion/{motion.id}"
+    client.get(url)
+
+    # Closed by another worker; this worker's cache still says OPEN.
+    motion.status = "CLOSED"
+    db_session.commit()
+
+    response = client.post(url, data={"option": str(motion.options[0].id)})
+    assert response.status_code == 302
+    assert YesNoVote.query.filter_by(motion_id=motion.id).count() == 0
+    response = client.post(
+        f"/api/vote/{voter.code}/ballots",
+        json={"ballots": [{"motion_id": motion.id, "option_id": motion.options[0].id}]},
+    )
+    assert response.status_code == 400
+    assert response.get_json()["errors"][0]["motion_id"] == motion.id
+    assert YesNoVote.query.filter_by(motion_id=motion.id).count() == 0
+
+
+def test_motion_opened_elsewhere_is_votable_while_voter_is_cached(app, client, db_session, admin_user):
+    app.config.update(VOTER_CACHE_TTL=60, METADATA_CACHE_STATUS_TTL=0)
+    _meeting, motion, voter = _seed(db_session, admin_user)
+    motion.status = "DRAFT"
+    db_session.commit()
+    assert f"m{motion.id}-option" not in client.get(f"/vote/{voter.code}/sheet").get_data(as_text=True)
+
+    # Opened by another worker: this worker's voter session is still cached.
+    motion.status = "OPEN"
+    db_session.commit()
+
+    assert f"m{motion.id}-option" in client.get(f"/vote/{voter.code}/sheet").get_data(as_text=True)
+    response = client.post(
+        f"/vote/{voter.code}/sheet",
+        data={"motion_id": str(motion.id), f"m{motion.id}-option": str(motion.options[0].id)},
+    )
+    assert response.status_code == 302
+    assert YesNoVote.query.filter_by(motion_id=motion.id).count() == 1
+    api = client.get(f"/api/vote/{voter.code}/ballots").get_json()
+    assert [entry["id"] for entry in api["motions"]] == [motion.id]
@@ -0,0 +1,80 @@
+import gzip
+
+from flask import Flask, url_for
+
+from app.services.assets import build_assets, init_assets, minify_js
+
+
+def _static_tree(root):
+    (root / "js").mkdir(parents=True)
+    (root / "css").mkdir()
+    (root / "js" / "app.js").write_text(
+        "// Greeting\nfunction greet() {\n    const html = `\n    <b>hi</b>\n    `;\n\n    return html;\n}\n" * 20
+    )
+    (root / "js" / "voter-sw.js").write_text("self.addEventListener('fetch', () => {});\n")
+    (root / "css" / "site.css").write_text("/* theme */\nbody {\n    color: red;\n}\n" * 20)
+    (root / "logo.png").write_bytes(b"\x89PNG not really")
+
+
+def _app(static_folder):
+    app = Flask(__name__, static_folder=str(static_folder), static_url_path="/static")
+    app.config.update(ASSET_MANIFEST_ENABLED=True, ASSET_MAX_AGE=3600)
+    init_assets(app)
+    return app
+
+
+def test_minify_js_keeps_template_literals():
+    source = "function f() {\n    // note\n    return `\n    keep  me\n`;\n}\n"
+    assert minify_js(source) == "function f() {\nreturn `\n    keep  me\n`;\n}\n"
+
+
+def test_build_writes_hashed_minified_and_compressed_copies(tmp_path):
+    _static_tree(tmp_path)
+    manifest = build_assets(tmp_path)
+
+    assets = manifest["assets"]
+    assert set(assets) == {"js/app.js", "css/site.css", "logo.png"}
+    hashed_js = tmp_path / assets["js/app.js"]
+    assert hashed_js.name.startswith("app.") and hashed_js.suffix == ".js"
+    assert "// Greeting" not in hashed_js.read_text()
+    assert gzip.decompress(hashed_js.with_name(hashed_js.name + ".gz").read_bytes()) == hashed_js.read_bytes()
+    assert "gzip" in manifest["encoded"][assets["js/app.js"]]
+    assert assets["logo.png"] not in manifest["encoded"]
+
+    # Unchanged content keeps its name across builds.
+    assert build_assets(tmp_path)["assets"] == assets
+
+
+def test_url_for_points_at_hashed_copy_served_immutable(tmp_path):
+    _static_tree(tmp_path)
+    assets = build_assets(tmp_path)["assets"]
+    app = _app(tmp_path)
+
+    with app.test_request_context():
+        url = url_for("static", filename="js/app.js")
+        assert url == f"/static/{assets['js/app.js']}"
+        assert url_for("static", filename="js/voter-sw.js") == "/static/js/voter-sw.js"
+
+    client = app.test_client()
+    response = client.get(url, headers={"Accept-Encoding": "gzip, deflate"})
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert response.mimetype == "text/javascript"
+    assert "immutable" in response.headers["Cache-Control"]
+    assert "max-age=3600" in response.headers["Cache-Control"]
+    assert "Accept-Encoding" in response.headers["Vary"]
+    assert gzip.decompress(response.get_data()) == (tmp_path / assets["js/app.js"]).read_bytes()
+
+    plain = client.get(url, headers={"Accept-Encoding": "identity"})
+    assert "Content-Encoding" not in plain.headers
+    assert plain.get_data() == (tmp_path / assets["js/app.js"]).read_bytes()
+
+    unversioned = client.get("/static/js/voter-sw.js")
+    assert unversioned.status_code == 200
+    assert "immutable" not in unversioned.headers.get("Cache-Control", "")
+
+
+def test_without_a_build_static_urls_are_unchanged(tmp_path):
+    _static_tree(tmp_path)
+    app = _app(tmp_path)
+    with app.test_request_context():
+        assert url_for("static", filename="js/app.js") == "/static/js/app.js"
@@ -0,0 +1,163 @@
+from app.models import Meeting, Motion, Option, PreferenceVote, Voter, YesNoVote
+from app.services.ballot_wal import BallotLog, ballot_writer, replay_logs
+
+
+def _seed(db_session):
+    meeting = Meeting(title="Burst Meeting")
+    db_session.add(meeting)
+    db_session.flush()
+    motion = Motion(meeting_id=meeting.id, title="Approve", type="YES_NO", status="OPEN")
+    ranked = Motion(meeting_id=meeting.id, title="Rank", type="PREFERENCE", status="OPEN")
+    db_session.add_all([motion, ranked])
+    db_session.flush()
+    db_session.add_all(
+        [Option(motion_id=motion.id, text=text) for text in ("Yes", "No", "Abstain")]
+        + [Option(motion_id=ranked.id, text=text) for text in ("A", "B")]
+    )
+    voters = [
+        Voter(meeting_id=meeting.id, student_id=f"S{index}", name=f"V{index}", code=f"WAL{index:05d}")
+        for index in range(3)
+    ]
+    db_session.add_all(voters)
+    db_session.commit()
+    return motion, ranked, voters
+
+
+def test_log_survives_restart_and_ignores_torn_tail(tmp_path):
+    log = BallotLog(tmp_path)
+    first = log.append({"voter_id": 1, "motion_id": 2, "motion_type": "YES_NO", "choices": [[5, None]]})
+    second = log.append({"voter_id": 2, "motion_id": 2, "motion_type": "YES_NO", "choices": [[6, None]]})
+    log.checkpoint(first)
+    log._file.write(b'0000beef {"voter_id": 3')
+    log.close()
+
+    reopened = BallotLog(tmp_path)
+    assert [record["seq"] for record in reopened.unapplied()] == [second]
+    assert reopened.append({"voter_id": 4, "motion_id": 2, "motion_type": "YES_NO", "choices": []}) == 3
+
+
+def test_replay_applies_unflushed_ballots(app, db_session, tmp_path):
+    motion, ranked, voters = _seed(db_session)
+    yes, no = motion.options[0].id, motion.options[1].id
+    log = BallotLog(tmp_path / "slot-0")
+    log.append({"voter_id": voters[0].id, "motion_id": motion.id, "motion_type": "YES_NO", "choices": [[yes, None]]})
+    log.append({"voter_id": voters[0].id, "motion_id": motion.id, "motion_type": "YES_NO", "choices": [[no, None]]})
+    log.append(
+        {
+            "voter_id": voters[1].id,
+            "motion_id": ranked.id,
+            "motion_type": "PREFERENCE",
+            "choices": [[ranked.options[1].id, 1], [ranked.options[0].id, 2]],
+        }
+    )
+    log.close()
+
+    assert replay_logs(tmp_path) == (1, 3, 0)
+    assert [vote.option_id for vote in YesNoVote.query.all()] == [no]
+    assert {vote.option_id: vote.preference_rank for vote in PreferenceVote.query.all()} == {
+        ranked.options[1].id: 1,
+        ranked.options[0].id: 2,
+    }
+    assert replay_logs(tmp_path) == (1, 0, 0)
+
+
+def test_vote_route_writes_behind_through_the_log(app, client, db_session, tmp_path):
+    motion, _ranked, voters = _seed(db_session)
+    app.config.update(BALLOT_WAL_ENABLED=True, BALLOT_WAL_DIR=str(tmp_path))
+
+    for voter in voters:
+        response = client.post(
+            f"/vote/{voter.code}/motion/{motion.id}", data={"option": str(motion.options[0].id)}
+        )
+        assert response.status_code == 302
+
+    writer = ballot_writer()
+    assert writer.drain(timeout=5)
+    db_session.expire_all()
+    assert YesNoVote.query.filter_by(motion_id=motion.id).count() == 3
+    assert writer.log.applied_seq == 3
+
+
+def test_batch_is_logged_as_one_record(app, client, db_session, tmp_path):
+    motion, ranked, voters = _seed(db_session)
+    app.config.update(BALLOT_WAL_ENABLED=True, BALLOT_WAL_DIR=str(tmp_path))
+
+    response = client.post(
+        f"/api/vote/{voters[0].code}/ballots",
+        json={
+            "ballots": [
+                {"motion_id": motion.id, "choices": [[motion.options[1].id, None]]},
+                {"motion_id": ranked.id, "choices": [[ranked.options[0].id, 1]]},
+            ]
+        },
+    )
+    assert response.get_json()["ok"] is True
+
+    writer = ballot_writer()
+    assert writer.drain(timeout=5)
+    db_session.expire_all()
+    assert writer.log.applied_seq == 1
+    assert YesNoVote.query.filter_by(voter_id=voters[0].id).count() == 1
+    assert PreferenceVote.query.filter_by(voter_id=voters[0].id).count() == 1
+
+
+def test_torn_first_record_does_not_hide_later_ballots(tmp_path):
+    # Crash while writing the first record of a fresh segment...
+    log = BallotLog(tmp_path)
+    log._file.write(b'0000beef {"voter_id": 1')
+    log.close()
+
+    # ...then acknowledge ballots after restart and crash again.
+    log = BallotLog(tmp_path)
+    acknowledged = [
+        log.append({"voter_id": voter_id, "motion_id": 2, "motion_type": "YES_NO", "choices": []})
+        for voter_id in (2, 3)
+    ]
+    log._file.write(b'0000beef {"voter_id": 4')
+    log.close()
+
+    reopened = BallotLog(tmp_path)
+    assert [record["seq"] for record in reopened.unapplied()] == acknowledged
+    assert [record["voter_id"] for record in reopened.unapplied()] == [2, 3]
+    assert reopened.append({"voter_id": 5, "motion_id": 2, "motion_type": "YES_NO", "choices": []}) == 3
+
+
+def test_replay_counts_ballots_confirmed_before_close(app, db_session, tmp_path):
+    motion, ranked, voters = _seed(db_session)
+    log = BallotLog(tmp_path / "slot-0")
+    log.append(
+        {"voter_id": voters[0].id, "motion_id": motion.id, "motion_type": "YES_NO", "choices": [[motion.options[0].id, None]]}
+    )
+    log.append(
+        {
+            "voter_id": voters[1].id,
+            "motion_id": ranked.id,
+            "motion_type": "PREFERENCE",
+            "choices": [[ranked.options[0].id, 1]],
+        }
+    )
+    log.close()
+    # Closed after the ballot was confirmed but before it was applied.
+    motion.status = "CLOSED"
+    db_session.commit()
+
+    assert replay_logs(tmp_path) == (1, 2, 0)
+    assert YesNoVote.query.count() == 1
+    assert PreferenceVote.query.count() == 1
+
+
+def test_closed_motion_is_refused_before_the_log_append(app, client, db_session, tmp_path):
+    motion, _ranked, voters = _seed(db_session)
+    app.config.update(
+        BALLOT_WAL_ENABLED=True, BALLOT_WAL_DIR=str(tmp_path), METADATA_CACHE_STATUS_TTL=60
+    )
+    url = f"/vote/{voters[0].code}/motion/{motion.id}"
+    client.get(url)
+    # Closed by another worker; this worker's cache still says OPEN.
+    motion.status = "CLOSED"
+    db_session.commit()
+
+    response = client.post(url, data={"option": str(motion.options[0].id)})
+
+    assert response.status_code == 302
+    assert ballot_writer().log.unapplied() == []
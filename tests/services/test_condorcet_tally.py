@@ -0,0 +1,150 @@
+import pytest
+
+from app.models import Meeting, Motion, Option, PreferenceVote, User, Voter
+from app.services.voting import condorcet
+from app.services.voting import tally_preference_condorcet
+from app.services.voting.condorcet import build_pairwise_matrix, count_condorcet
+
+
+def _options(*names):
+    return {
+        option_id: type("Option", (), {"id": option_id, "text": text})()
+        for option_id, text in enumerate(names, start=1)
+    }
+
+
+def _schulze_example_ballots():
+    # A=1, B=2, C=3, D=4, E=5 (the 45-voter example from Schulze's paper).
+    return (
+        [[1, 3, 2, 5, 4]] * 5
+        + [[1, 4, 5, 3, 2]] * 5
+        + [[2, 5, 4, 1, 3]] * 8
+        + [[3, 1, 2, 5, 4]] * 3
+        + [[3, 1, 5, 2, 4]] * 7
+        + [[3, 2, 1, 4, 5]] * 2
+        + [[4, 3, 5, 2, 1]] * 7
+        + [[5, 2, 1, 4, 3]] * 8
+    )
+
+
+@pytest.fixture(params=["numpy", "python"])
+def matrix_backend(request, monkeypatch):
+    if request.param == "numpy":
+        pytest.importorskip("numpy")
+    else:
+        monkeypatch.setattr(condorcet, "np", None)
+    return request.param
+
+
+def test_pairwise_matrix_counts_unranked_as_last(matrix_backend):
+    matrix = build_pairwise_matrix([[1, 2], [3], [2, 1, 3]], [1, 2, 3])
+
+    assert matrix == [
+        [0, 1, 2],
+        [1, 0, 2],
+        [1, 1, 0],
+    ]
+
+
+def test_schulze_example_elects_e(matrix_backend):
+    options_by_id = _options("A", "B", "C", "D", "E")
+
+    result = count_condorcet(
+        _schulze_example_ballots(), 1, options_by_id, method="SCHULZE"
+    )
+
+    assert [winner.text for winner in result["winners"]] == ["E"]
+    assert [row["option"].text for row in result["ranking"]] == ["E", "A", "C", "B", "D"]
+    assert result["condorcet_winner"] is None
+    assert result["matrix"][0][1] == 20
+    assert result["matrix"][1][0] == 25
+
+
+def test_ranked_pairs_tennessee_example(matrix_backend):
+    options_by_id = _options("Memphis", "Nashville", "Chattanooga", "Knoxville")
+    ballots = (
+        [[1, 2, 3, 4]] * 42
+        + [[2, 3, 4, 1]] * 26
+        + [[3, 4, 2, 1]] * 15
+        + [[4, 3, 2, 1]] * 17
+    )
+
+    result = count_condorcet(ballots, 1, options_by_id, method="RANKED_PAIRS")
+
+    assert [winner.text for winner in result["winners"]] == ["Nashville"]
+    assert result["condorcet_winner"].text == "Nashville"
+    assert [row["option"].text for row in result["ranking"]] == [
+        "Nashville",
+        "Chattanooga",
+        "Knoxville",
+        "Memphis",
+    ]
+
+
+def test_multi_seat_takes_top_of_ranking_and_flags_ties():
+    options_by_id = _options("A", "B", "C")
+    ballots = [[1, 2, 3], [1, 3, 2]]
+
+    result = count_condorcet(ballots, 2, options_by_id, method="SCHULZE")
+
+    assert [winner.text for winner in result["winners"]] == ["A", "B", "C"]
+    assert result["is_tie"] is True
+
+
+def test_unknown_condorcet_method_is_rejected():
+    with pytest.raises(ValueError, match="Borda"):
+        count_condorcet([[1]], 1, _options("A"), method="Borda")
+
+
+def test_tally_preference_condorcet_reports_matrix_rows(db_session):
+    admin = User(
+        username="svc_admin",
+        email="svc_admin@example.com",
+        password_hash="hashed-password",
+    )
+    db_session.add(admin)
+    db_session.flush()
+
+    meeting = Meeting(title="Svc Meeting", admin_id=admin.id)
+    db_session.add(meeting)
+    db_session.flush()
+
+    motion = Motion(
+        meeting_id=meeting.id,
+        title="Preference Vote",
+        type="PREFERENCE",
+        num_winners=1,
+        preference_method="SCHULZE",
+    )
+    db_session.add(motion)
+    db_session.flush()
+
+    option_a = Option(motion_id=motion.id, text="Alice")
+    option_b = Option(motion_id=motion.id, text="Bob")
+    db_session.add_all([option_a, option_b])
+    db_session.flush()
+
+    voter = Voter(meeting_id=meeting.id, student_id="560000001", name="V1", code="COND0001")
+    db_session.add(voter)
+    db_session.flush()
+    db_session.add(
+        PreferenceVote(
+            voter_id=voter.id,
+            motion_id=motion.id,
+            option_id=option_b.id,
+            preference_rank=1,
+        )
+    )
+    db_session.commit()
+
+    result = tally_preference_condorcet(motion, method="SCHULZE")
+
+    assert result["total_ballots"] == 1
+    assert [winner.id for winner in result["winners"]] == [option_b.id]
+    assert [row["option"].id for row in result["matrix_rows"]] == [option_a.id, option_b.id]
+    assert result["matrix_rows"][1]["cells"][0] == {
+        "option": option_a,
+        "count": 1,
+        "is_self": False,
+        "wins": True,
+    }
@@ -0,0 +1,44 @@
+from sqlalchemy.exc import OperationalError
+
+from app.config import build_engine_options
+from app.extensions import db
+from app.services.db_pool import pool_statistics
+
+
+def test_mysql_engine_options_size_the_pool():
+    options = build_engine_options("mysql+pymysql://user:pw@db/voting")
+
+    assert options["pool_size"] >= 1
+    assert options["max_overflow"] >= 0
+    assert 0 < options["pool_recycle"] < 28800
+    assert "pool_pre_ping" in options
+
+
+def test_sqlite_engine_options_skip_queue_pool_sizing():
+    options = build_engine_options("sqlite:///:memory:")
+
+    assert "pool_size" not in options
+    assert "max_overflow" not in options
+
+
+def test_pool_statistics_reports_checked_out_connections(app):
+    with db.engine.connect():
+        stats = pool_statistics(db.engine)
+
+    assert stats["checkedout"] == 1
+    assert stats["overflow"] >= 0
+
+
+def test_lost_connection_on_get_is_retried(app, client):
+    @app.route("/flaky-db", methods=["GET", "POST"])
+    def flaky_db():
+        raise OperationalError("SELECT 1", {}, Exception("gone away"), connection_invalidated=True)
+
+    response = client.get("/flaky-db?page=2")
+
+    assert response.status_code == 307
+    assert response.headers["Location"].endswith("/flaky-db?page=2")
+
+    response = client.post("/flaky-db")
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "1"
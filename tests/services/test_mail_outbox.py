@@ -0,0 +1,94 @@
+import time
+
+from app import create_app
+from app.extensions import db
+from app.models import OutboundEmail
+from app.models.base import utcnow
+from app.services.mail import deliver_pending, queue_email
+
+
+class _FailingTransport:
+    def send(self, email):
+        raise RuntimeError("provider timeout")
+
+
+def test_forgot_password_queues_email_without_sending(client, db_session, admin_user):
+    response = client.post("/forgot-password", data={"email": "admin1@example.com"})
+
+    assert response.status_code == 302
+    email = OutboundEmail.query.one()
+    assert email.to_email == "admin1@example.com"
+    assert email.status == "PENDING"
+    assert "/reset-password/" in email.body
+
+
+def test_file_transport_delivers_pending_email(app, db_session, tmp_path):
+    app.config.update(MAIL_TRANSPORT="file", MAIL_FILE_DIR=str(tmp_path))
+    queue_email("voter@example.com", "Hello", "Body text")
+
+    sent, failed = deliver_pending()
+
+    assert (sent, failed) == (1, 0)
+    email = OutboundEmail.query.one()
+    assert email.status == "SENT"
+    assert email.attempts == 1
+    files = list(tmp_path.glob("*.eml"))
+    assert len(files) == 1
+    assert "Subject: Hello" in files[0].read_text()
+
+    assert deliver_pending() == (0, 0)
+
+
+def test_failed_email_is_retried_then_abandoned(app, db_session):
+    app.config["MAIL_MAX_ATTEMPTS"] = 2
+    queue_email("voter@example.com", "Hello", "Body text")
+
+    assert deliver_pending(transport=_FailingTransport()) == (0, 0)
+    email = OutboundEmail.query.one()
+    assert email.status == "PENDING"
+    assert email.last_error == "provider timeout"
+    assert email.next_attempt_at > utcnow()
+
+    assert deliver_pending(transport=_FailingTransport()) == (0, 0)
+
+    email.next_attempt_at = utcnow()
+    db_session.commit()
+    assert deliver_pending(transport=_FailingTransport()) == (0, 1)
+    db_session.refresh(email)
+    assert email.status == "FAILED"
+    assert email.attempts == 2
+
+
+def test_send_mail_cli_runs_one_pass(app, db_session):
+    app.config["MAIL_TRANSPORT"] = "console"
+    queue_email("voter@example.com", "Hello", "Body text")
+
+    result = app.test_cli_runner().invoke(args=["votora", "send-mail"])
+
+    assert result.exit_code == 0, result.output
+    assert "Sent 1 emails, 0 failed permanently." in result.output
+
+
+def test_worker_sends_mail_left_pending_by_its_predecessor(tmp_path):
+    app = create_app(
+        {
+            "TESTING": True,
+            "SQLALCHEMY_DATABASE_URI": f"sqlite:///{tmp_path / 'mail.sqlite3'}",
+            "SQLALCHEMY_ENGINE_OPTIONS": {},
+            "MAIL_BACKGROUND_SENDER": True,
+            "MAIL_TRANSPORT": "file",
+            "MAIL_FILE_DIR": str(tmp_path / "mail"),
+        }
+    )
+    with app.app_context():
+        db.create_all()
+        # Queued before a restart; nothing new is queued afterwards.
+        db.session.add(OutboundEmail(to_email="voter@example.com", subject="Hello", body="Body"))
+        db.session.commit()
+
+    app.test_client().get("/robots.txt")
+
+    deadline = time.monotonic() + 5
+    while not list((tmp_path / "mail").glob("*.eml")) and time.monotonic() < deadline:
+        time.sleep(0.05)
+    assert len(list((tmp_path / "mail").glob("*.eml"))) == 1
@@ -0,0 +1,152 @@
+import random
+
+import pytest
+
+from app.models import Meeting, Motion, Option, PreferenceVote, User, Voter
+from app.services.profiling import profile_tally
+from app.services.voting import meek, tally_preference_meek
+from app.services.voting.meek import count_meek_stv
+from app.services.voting.preference import count_stv
+
+
+def _options(*names):
+    return {
+        option_id: type("Option", (), {"id": option_id, "text": text})()
+        for option_id, text in enumerate(names, start=1)
+    }
+
+
+def test_meek_matches_gregory_on_guide_example():
+    options_by_id = _options("A", "B", "C", "D", "E")
+    ballots = (
+        [[1, 2, 3, 4]] * 30
+        + [[1, 3, 2, 4]] * 20
+        + [[1]] * 10
+        + [[2, 3, 4, 5]] * 20
+        + [[3, 4, 5, 2]] * 10
+        + [[4, 5, 2, 3]] * 6
+        + [[5, 4, 3, 2]] * 4
+    )
+
+    meek = count_meek_stv(ballots, 2, options_by_id, rng=random.Random(0))
+    gregory = count_stv(ballots, 2, options_by_id, rng=random.Random(0))
+
+    assert [winner.text for winner in meek["winners"]] == ["A", "B"]
+    assert [winner.text for winner in gregory["winners"]] == ["A", "B"]
+    assert meek["seats_filled"] == 2
+
+
+def test_meek_quota_shrinks_as_ballots_exhaust():
+    options_by_id = _options("A", "B", "C")
+    ballots = [[1]] * 6 + [[2]] * 4 + [[3, 2]] * 2
+
+    result = count_meek_stv(ballots, 2, options_by_id, rng=random.Random(0))
+
+    assert [winner.text for winner in result["winners"]] == ["A", "B"]
+    first_quota = result["rounds"][0]["quota"]
+    assert first_quota == pytest.approx(4)
+    assert result["quota"] < first_quota
+
+
+def test_meek_rounds_share_snapshot_shape():
+    options_by_id = _options("A", "B", "C")
+    ballots = [[1, 2]] * 5 + [[2, 3]] * 3 + [[3, 1]] * 2
+
+    result = count_meek_stv(ballots, 1, options_by_id, rng=random.Random(0))
+
+    first_round = result["rounds"][0]
+    assert first_round["round_number"] == 1
+    assert [row["count"] for row in first_round["counts"]] == ["5", "3", "2"]
+    assert {row["status"] for row in first_round["counts"]} == {"continuing"}
+    assert "C is eliminated with the lowest tally (2)." in result["round_logs"]
+
+
+def test_meek_flags_rounds_that_hit_the_iteration_limit(monkeypatch):
+    options_by_id = _options("A", "B", "C")
+    ballots = [[1, 2]] * 6 + [[2]] * 2 + [[3]] * 3
+
+    assert count_meek_stv(ballots, 2, options_by_id, rng=random.Random(0))["converged"]
+
+    monkeypatch.setattr(meek, "MAX_ITERATIONS", 1)
+    result = count_meek_stv(ballots, 2, options_by_id, rng=random.Random(0))
+
+    assert result["converged"] is False
+    assert any("did not converge" in line for line in result["round_logs"])
+
+
+def test_meek_closes_profiled_round_when_count_fails(monkeypatch):
+    def fail(*_args):
+        raise RuntimeError("boom")
+
+    monkeypatch.setattr(meek, "_converge", fail)
+    with profile_tally() as profiler:
+        with pytest.raises(RuntimeError):
+            count_meek_stv([[1, 2]] * 3, 1, _options("A", "B"))
+        assert profiler.rounds and "started" not in profiler.rounds[-1]
+
+
+def test_meek_tie_uses_lot_when_history_identical():
+    options_by_id = _options("Alpha", "Beta", "Gamma")
+    ballots = [[1, 2, 3], [2, 3, 1], [3, 1, 2], [1, 3, 2]]
+
+    result = count_meek_stv(ballots, 1, options_by_id, rng=random.Random(0))
+    assert len(result["winners"]) == 1
+    assert any("selected by lot" in line for line in result["round_logs"])
+
+
+def test_tally_preference_meek_uses_motion_ballots(db_session):
+    admin = User(
+        username="svc_admin",
+        email="svc_admin@example.com",
+        password_hash="hashed-password",
+    )
+    db_session.add(admin)
+    db_session.flush()
+
+    meeting = Meeting(title="Svc Meeting", admin_id=admin.id)
+    db_session.add(meeting)
+    db_session.flush()
+
+    motion = Motion(
+        meeting_id=meeting.id,
+        title="Preference Vote",
+        type="PREFERENCE",
+        num_winners=1,
+    )
+    db_session.add(motion)
+    db_session.flush()
+
+    option_a = Option(motion_id=motion.id, text="Alice")
+    option_b = Option(motion_id=motion.id, text="Bob")
+    db_session.add_all([option_a, option_b])
+    db_session.flush()
+
+    voters = [
+        Voter(meeting_id=meeting.id, student_id="550000001", name="V1", code="MEEK0001"),
+        Voter(meeting_id=meeting.id, student_id="550000002", name="V2", code="MEEK0002"),
+        Voter(meeting_id=meeting.id, student_id="550000003", name="V3", code="MEEK0003"),
+    ]
+    db_session.add_all(voters)
+    db_session.flush()
+
+    rankings = [
+        [option_a.id, option_b.id],
+        [option_a.id, option_b.id],
+        [option_b.id, option_a.id],
+    ]
+    for voter, ranking in zip(voters, rankings):
+        for rank, option_id in enumerate(ranking, start=1):
+            db_session.add(
+                PreferenceVote(
+                    voter_id=voter.id,
+                    motion_id=motion.id,
+                    option_id=option_id,
+                    preference_rank=rank,
+                )
+            )
+    db_session.commit()
+
+    result = tally_preference_meek(motion)
+    assert result["total_ballots"] == 3
+    assert [winner.id for winner in result["winners"]] == [option_a.id]
+    assert result["informal_ballots"] == []
@@ -0,0 +1,73 @@
+from app.models import Meeting, Motion, Option
+from app.services.metadata_cache import MetadataCache, SQLiteSharedTier, get_motion_detail
+
+
+def _seed(db_session, admin_user):
+    meeting = Meeting(title="Metadata Meeting", admin_id=admin_user.id)
+    db_session.add(meeting)
+    db_session.flush()
+    motion = Motion(
+        meeting_id=meeting.id, title="Pick one", type="FPTP", num_winners=1, status="OPEN"
+    )
+    db_session.add(motion)
+    db_session.flush()
+    db_session.add_all([Option(motion_id=motion.id, text=text) for text in ("Ada", "Grace")])
+    db_session.commit()
+    return meeting, motion
+
+
+def test_motion_detail_is_served_from_cache_until_meeting_version_changes(
+    db_session, admin_user
+):
+    meeting, motion = _seed(db_session, admin_user)
+    cache = MetadataCache(ttl=60)
+
+    detail = cache.get_motion(motion.id, meeting.id)
+    assert [option.text for option in detail.options] == ["Ada", "Grace"]
+    assert cache.get_motion(motion.id, meeting.id) is detail
+    assert cache.get_motion(motion.id, meeting.id + 1) is None
+
+    motion.title = "Pick again"
+    db_session.commit()
+    assert cache.get_motion(motion.id, meeting.id).title == "Pick one"
+
+    cache.bump(meeting.id)
+    assert cache.get_motion(motion.id, meeting.id).title == "Pick again"
+
+
+def test_shared_tier_propagates_bumps_between_workers(db_session, admin_user, tmp_path):
+    meeting, motion = _seed(db_session, admin_user)
+    path = str(tmp_path / "metadata.sqlite3")
+    worker_a = MetadataCache(ttl=60, shared=SQLiteSharedTier(path))
+    worker_b = MetadataCache(ttl=60, shared=SQLiteSharedTier(path))
+
+    assert worker_a.get_motion(motion.id, meeting.id).status == "OPEN"
+    assert worker_b.get_motion(motion.id, meeting.id).status == "OPEN"
+
+    motion.status = "CLOSED"
+    db_session.commit()
+    worker_a.bump(meeting.id)
+
+    assert worker_b.version(meeting.id) == 1
+    assert worker_b.get_motion(motion.id, meeting.id).status == "CLOSED"
+
+    # The entry worker_b rebuilt is now in the shared tier for worker_a.
+    Option.query.filter_by(motion_id=motion.id).delete()
+    db_session.commit()
+    assert len(worker_a.get_motion(motion.id, meeting.id).options) == 2
+
+
+def test_update_motion_refreshes_vote_page_options(
+    auth_client, db_session, admin_user
+):
+    meeting, motion = _seed(db_session, admin_user)
+    assert len(get_motion_detail(motion.id, meeting.id).options) == 2
+
+    response = auth_client.post(
+        f"/admin/motion/{motion.id}/update",
+        data={"title": "Pick one", "type": "FPTP", "options": "Ada\nGrace\nKatherine"},
+    )
+    assert response.status_code == 200
+
+    detail = get_motion_detail(motion.id, meeting.id)
+    assert [option.text for option in detail.options] == ["Ada", "Grace", "Katherine"]
@@ -1,5 +1,7 @@
 import random
 
+import pytest
+
 from app.models import Meeting, Motion, Option, PreferenceVote, User, Voter
 from app.services.voting import tally_preference_stv
 from app.services.voting.preference import count_stv, parse_ballots_for_motion
@@ -409,3 +411,170 @@ def test_example_1():
 
     result = count_stv(ballots, 2, options_by_id, rng=random.Random(0))
     assert [winner.text for winner in result["winners"]] == ["A", "C"]
+
+
+def test_hare_quota_is_logged_and_used():
+    options_by_id = {
+        1: type("Option", (), {"id": 1, "text": "A"})(),
+        2: type("Option", (), {"id": 2, "text": "B"})(),
+        3: type("Option", (), {"id": 3, "text": "C"})(),
+    }
+    ballots = [[1, 2, 3]] * 5 + [[2, 3, 1]] * 3 + [[3, 2, 1]] * 2
+
+    result = count_stv(
+        ballots, 2, options_by_id, rng=random.Random(0), quota_rule="hare"
+    )
+    assert result["quota"] == 5
+    assert "Hare quota = 10 / 2 = 5." in result["round_logs"][0]
+    assert [winner.text for winner in result["winners"]] == ["A", "B"]
+
+
+def test_fractional_quota_is_formatted_in_election_log():
+    options_by_id = {
+        1: type("Option", (), {"id": 1, "text": "A"})(),
+        2: type("Option", (), {"id": 2, "text": "B"})(),
+        3: type("Option", (), {"id": 3, "text": "C"})(),
+        4: type("Option", (), {"id": 4, "text": "D"})(),
+    }
+    ballots = [[1, 2, 3]] * 5 + [[2, 3, 1]] * 3 + [[3, 2, 1]] * 2 + [[4]]
+
+    result = count_stv(
+        ballots, 3, options_by_id, rng=random.Random(0), quota_rule="hare"
+    )
+    assert (
+        "A is elected with tally 5 (quota 3.666667, surplus 1.333333)."
+        in result["round_logs"]
+    )
+
+
+def test_gregory_transfers_only_last_parcel():
+    options_by_id = {
+        1: type("Option", (), {"id": 1, "text": "A"})(),
+        2: type("Option", (), {"id": 2, "text": "B"})(),
+        3: type("Option", (), {"id": 3, "text": "C"})(),
+        4: type("Option", (), {"id": 4, "text": "D"})(),
+    }
+    ballots = (
+        [[1, 2]] * 3
+        + [[4, 1, 3]] * 2
+        + [[2]] * 3
+        + [[3]] * 3
+    )
+
+    wig = count_stv(ballots, 2, options_by_id, rng=random.Random(0))
+    gregory = count_stv(
+        ballots, 2, options_by_id, rng=random.Random(0), transfer_rule="gregory"
+    )
+
+    assert [winner.text for winner in wig["winners"]] == ["A", "B"]
+    assert [winner.text for winner in gregory["winners"]] == ["A", "C"]
+    assert any("from the last parcel received" in line for line in gregory["round_logs"])
+
+
+def test_unknown_rule_is_rejected():
+    options_by_id = {1: type("Option", (), {"id": 1, "text": "A"})()}
+    with pytest.raises(ValueError, match="imperiali"):
+        count_stv([[1]], 1, options_by_id, quota_rule="imperiali")
+
+
+def test_bulk_exclusion_eliminates_hopeless_candidates_together():
+    options_by_id = {
+        option_id: type("Option", (), {"id": option_id, "text": text})()
+        for option_id, text in enumerate(["A", "B", "C", "D", "E"], start=1)
+    }
+    ballots = (
+        [[1, 2]] * 10
+        + [[2, 1]] * 8
+        + [[3, 1]] * 2
+        + [[4, 2]] * 1
+        + [[5, 1]] * 1
+    )
+
+    single = count_stv(ballots, 1, options_by_id, rng=random.Random(0))
+    bulk = count_stv(
+        ballots, 1, options_by_id, rng=random.Random(0), bulk_exclusion=True
+    )
+
+    assert [winner.text for winner in bulk["winners"]] == ["A"]
+    assert [winner.text for winner in single["winners"]] == ["A"]
+    assert len(bulk["rounds"]) < len(single["rounds"])
+    assert (
+        "D, E, C are eliminated together: their combined tally (4) "
+        "cannot overtake B (8)."
+    ) in bulk["round_logs"]
+    statuses = {row["option"].text: row["status"] for row in bulk["rounds"][1]["counts"]}
+    assert statuses["C"] == statuses["D"] == statuses["E"] == "eliminated"
+
+
+def test_bulk_exclusion_keeps_enough_candidates_for_open_seats():
+    options_by_id = {
+        option_id: type("Option", (), {"id": option_id, "text": text})()
+        for option_id, text in enumerate(["A", "B", "C", "D"], start=1)
+    }
+    ballots = [[1]] * 20 + [[2]] * 2 + [[3]] * 1 + [[4]] * 1
+
+    result = count_stv(
+        ballots, 3, options_by_id, rng=random.Random(0), bulk_exclusion=True
+    )
+    assert len(result["winners"]) == 3
+    assert not any("eliminated together" in line for line in result["round_logs"])
+
+
+def test_lot_draws_replay_from_persisted_seed(db_session):
+    meeting = Meeting(title="Seed Meeting")
+    db_session.add(meeting)
+    db_session.flush()
+
+    motion = Motion(
+        meeting_id=meeting.id,
+        title="Preference Vote",
+        type="PREFERENCE",
+        num_winners=1,
+        tally_seed="f00dfeedcafe",
+    )
+    db_session.add(motion)
+    db_session.flush()
+
+    options = [Option(motion_id=motion.id, text=text) for text in ("Alpha", "Beta", "Gamma")]
+    db_session.add_all(options)
+    db_session.flush()
+
+    rankings = [[0, 1, 2], [1, 2, 0], [2, 0, 1], [0, 2, 1]]
+    for index, ranking in enumerate(rankings, start=1):
+        voter = Voter(
+            meeting_id=meeting.id,
+            student_id=f"58000000{index}",
+            name=f"V{index}",
+            code=f"SEED000{index}",
+        )
+        db_session.add(voter)
+        db_session.flush()
+        for rank, option_index in enumerate(ranking, start=1):
+            db_session.add(
+                PreferenceVote(
+                    voter_id=voter.id,
+                    motion_id=motion.id,
+                    option_id=options[option_index].id,
+                    preference_rank=rank,
+                )
+            )
+    db_session.commit()
+
+    first = tally_preference_stv(motion)
+    second = tally_preference_stv(motion)
+
+    assert first["tie_break_seed"] == "f00dfeedcafe"
+    assert first["lot_draws"]
+    assert first["lot_draws"] == second["lot_draws"]
+    assert first["lot_draws"][0]["kind"] == "elimination"
+    assert first["lot_draws"][0]["candidates"] == [options[1].id, options[2].id]
+    assert first["round_logs"] == second["round_logs"]
+
+    options_by_id = {option.id: option for option in options}
+    offline = count_stv(
+        [[options[i].id for i in ranking] for ranking in rankings],
+        1,
+        options_by_id,
+        rng=random.Random("f00dfeedcafe"),
+    )
+    assert offline["lot_draws"] == first["lot_draws"]
@@ -0,0 +1,40 @@
+from app.services.profiling import NULL_PROFILER, active_profiler, profile_tally
+from app.services.voting.preference import count_stv
+
+
+def _options(count):
+    return {
+        option_id: type("Option", (), {"id": option_id, "text": f"C{option_id}"})()
+        for option_id in range(1, count + 1)
+    }
+
+
+def test_profile_records_rounds_moves_and_fraction_sizes():
+    ballots = [[1, 2]] * 6 + [[2, 3]] * 2 + [[3, 2]] * 3 + [[4, 3]] * 1
+
+    with profile_tally() as profiler:
+        result = count_stv(ballots, 2, _options(4))
+
+    assert active_profiler() is NULL_PROFILER
+    assert len(profiler.rounds) == len({row["round_number"] for row in result["rounds"]})
+    assert all(entry["seconds"] >= 0 for entry in profiler.rounds)
+    assert profiler.counters["ballot_papers_moved"] >= 6
+    assert profiler.counters["max_fraction_bits"] > 2
+
+    paths = {" › ".join(path) for path in profiler.frames}
+    assert "count_stv › group_ballots" in paths
+    assert "count_stv › compute_tallies" in paths
+    assert "count_stv › transfer_surplus › distribute" in paths
+
+
+def test_folded_export_uses_collapsed_stack_format():
+    with profile_tally() as profiler:
+        count_stv([[1, 2], [2, 1], [1, 3]] * 50, 1, _options(3))
+
+    lines = profiler.to_folded().strip().splitlines()
+
+    assert lines
+    for line in lines:
+        stack, weight = line.rsplit(" ", 1)
+        assert stack.startswith("count_stv")
+        assert int(weight) > 0
@@ -1 +1,3 @@
-from app import app
\ No newline at end of file
+from app import create_app
+
+app = create_app({"MIGRATIONS_ENABLED": False})